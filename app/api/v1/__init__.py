@@ -6,6 +6,8 @@ from .units import router as units_router
 from .assignments import router as assignments_router
 from .payments import router as payments_router
 from .maintenance import router as maintenance_router
+from .landlord import router as landlord_router
+from .search import router as search_router
 
 api_router = APIRouter()
 
@@ -14,4 +16,6 @@ api_router.include_router(properties_router, prefix="/properties", tags=["Proper
 api_router.include_router(units_router, prefix="", tags=["Units"])  # Combined with properties
 api_router.include_router(assignments_router, prefix="/assignments", tags=["Assignments"])
 api_router.include_router(payments_router, prefix="/payments", tags=["Payments"])
-api_router.include_router(maintenance_router, prefix="/maintenance", tags=["Maintenance"])
\ No newline at end of file
+api_router.include_router(maintenance_router, prefix="/maintenance", tags=["Maintenance"])
+api_router.include_router(landlord_router, prefix="/landlord", tags=["Landlord"])
+api_router.include_router(search_router, prefix="/search", tags=["Search"])
\ No newline at end of file
@@ -1,23 +1,37 @@
 # app/api/v1/assignments.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from ...core.database import get_db
+from ...core.database import get_async_db
 from ...core.security import get_current_user
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...core.responses import page_response
+from ...core.response_cache import response_cache, tag
+from ...core.export import EXPORT_FORMAT_PATTERN, export_response
+from ...core.metrics import query_budget
 from ...models.user import User, UserRole
-from ...schemas.assignment import AssignmentCreate, AssignmentResponse
-from ...services.assignment_service import create_assignment, get_assignments_by_tenant, get_assignments_by_landlord
-from ...services.unit_service import get_unit_by_id
-from ...services.property_service import get_property_by_id
+from ...schemas.assignment import AssignmentCreate, AssignmentResponse, AssignmentBalanceResponse, ArrearsReport
+from ...schemas.pagination import Page
+from ...services.assignment_service import (
+    create_assignment_async,
+    get_assignment_by_id_async,
+    get_assignments_by_tenant_async,
+    get_assignments_by_landlord_async
+)
+from ...services.ledger_service import get_arrears_report_async, get_balance_async
+from ...services.unit_service import get_unit_by_id_async, get_unit_landlords_async
+from ...services.property_service import get_property_by_id_async
+from ...services.export_service import assignments_export_query
 
 router = APIRouter()
 
 @router.post("/units/{unit_id}/assign", response_model=AssignmentResponse)
-def assign_tenant_to_unit(
+@query_budget(15)
+async def assign_tenant_to_unit(
     unit_id: int,
     assignment: AssignmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -27,7 +41,7 @@ def assign_tenant_to_unit(
         )
     
     # Check if unit exists
-    unit = get_unit_by_id(db, unit_id)
+    unit = await get_unit_by_id_async(db, unit_id)
     if not unit:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -36,7 +50,7 @@ def assign_tenant_to_unit(
     
     # Check if landlord owns the property
     if current_user.role == UserRole.LANDLORD:
-        property = get_property_by_id(db, unit.property_id)
+        property = await get_property_by_id_async(db, unit.property_id)
         if property.landlord_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -44,16 +58,19 @@ def assign_tenant_to_unit(
             )
     
     try:
-        return create_assignment(db, assignment, unit_id)
+        return await create_assignment_async(db, assignment, unit_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
 
-@router.get("/tenant/assignments", response_model=List[AssignmentResponse])
-def get_tenant_assignments(
-    db: Session = Depends(get_db),
+@router.get("/tenant/assignments", response_model=Page[AssignmentResponse])
+@query_budget(2)
+async def get_tenant_assignments(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != UserRole.TENANT:
@@ -62,11 +79,29 @@ def get_tenant_assignments(
             detail="Only tenants can access this endpoint"
         )
     
-    return get_assignments_by_tenant(db, current_user.id)
+    cached = response_cache.lookup(current_user.id, "assignments:tenant", cursor, limit)
+    if cached.hit:
+        return cached.response()
+    
+    try:
+        assignments, next_cursor = await get_assignments_by_tenant_async(db, current_user.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return cached.store(
+        page_response(assignments, next_cursor),
+        [tag("assignments"), tag("assignments", "tenant", current_user.id)]
+    )
 
-@router.get("/landlord/assignments", response_model=List[AssignmentResponse])
-def get_landlord_assignments(
-    db: Session = Depends(get_db),
+@router.get("/landlord/assignments", response_model=Page[AssignmentResponse])
+@query_budget(2)
+async def get_landlord_assignments(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -75,4 +110,91 @@ def get_landlord_assignments(
             detail="Only landlords and admins can access this endpoint"
         )
     
-    return get_assignments_by_landlord(db, current_user.id)
\ No newline at end of file
+    cached = response_cache.lookup(current_user.id, "assignments:landlord", cursor, limit)
+    if cached.hit:
+        return cached.response()
+    
+    try:
+        assignments, next_cursor = await get_assignments_by_landlord_async(db, current_user.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return cached.store(
+        page_response(assignments, next_cursor),
+        [tag("assignments"), tag("assignments", "landlord", current_user.id)]
+    )
+
+@router.get("/{assignment_id}/balance", response_model=AssignmentBalanceResponse)
+@query_budget(3)
+async def get_assignment_balance(
+    assignment_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    assignment = await get_assignment_by_id_async(db, assignment_id)
+    if not assignment:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Assignment not found"
+        )
+    
+    # Tenants see their own lease, landlords the leases on their properties
+    if current_user.role == UserRole.TENANT and assignment.tenant_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this balance"
+        )
+    if current_user.role == UserRole.LANDLORD:
+        unit_landlords = await get_unit_landlords_async(db, [assignment.unit_id])
+        if unit_landlords.get(assignment.unit_id) != current_user.id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not authorized to view this balance"
+            )
+    
+    return await get_balance_async(db, assignment_id)
+
+@router.get("/landlord/arrears", response_model=ArrearsReport)
+@query_budget(3)
+async def get_landlord_arrears(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can access this endpoint"
+        )
+    
+    return await get_arrears_report_async(db, current_user.id, limit)
+
+@router.get("/landlord/export")
+@query_budget(2)
+async def export_landlord_assignments(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    property_id: Optional[int] = None,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can export assignments"
+        )
+    
+    # Streamed from its own session on a worker thread; nothing is loaded up front
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    try:
+        statement = assignments_export_query(landlord_id, property_id, from_month, to_month)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return export_response(statement, format, "assignments")
\ No newline at end of file
@@ -1,33 +1,52 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from ...core.database import get_db
-from ...core.security import create_access_token, get_current_user
+from ...core.database import get_async_db
+from ...core.security import (
+    create_access_token,
+    get_current_user,
+    get_password_hash_async,
+    password_hash_slot,
+    verify_and_update_password_async
+)
 from ...core.config import settings
+from ...core.metrics import query_budget
 from ...schemas.user import UserCreate, UserLogin, UserResponse, Token
-from ...services.user_service import create_user, authenticate_user, get_user_by_email, get_user_by_id_number
+from ...services.user_service import (
+    create_user_async,
+    get_user_by_email_async,
+    get_user_by_id_async,
+    get_user_by_id_number_async,
+    update_user_async
+)
 
 router = APIRouter()
 
 @router.post("/register", response_model=Token)
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    # Check if user already exists
-    if get_user_by_email(db, user.email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    if get_user_by_id_number(db, user.id_number):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="ID number already registered"
-        )
-    
-    # Create user
-    db_user = create_user(db, user)
+@query_budget(4)
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    # Hashing slots are limited; a full queue answers 503 before any work
+    async with password_hash_slot():
+        # Check if user already exists
+        if await get_user_by_email_async(db, user.email):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Email already registered"
+            )
+        
+        if await get_user_by_id_number_async(db, user.id_number):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="ID number already registered"
+            )
+        
+        # Create user, hashing on the password worker pool. Ending the read
+        # transaction first returns the connection to the pool while bcrypt runs
+        await db.commit()
+        hashed_password = await get_password_hash_async(user.password)
+        db_user = await create_user_async(db, user, hashed_password)
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -42,15 +61,26 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     }
 
 @router.post("/login", response_model=Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
-    if not user:
+@query_budget(2)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    async with password_hash_slot():
+        user = await get_user_by_email_async(db, form_data.username)
+        verified, new_hash = False, None
+        if user:
+            await db.commit()
+            verified, new_hash = await verify_and_update_password_async(form_data.password, user.hashed_password)
+    
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently upgrade hashes made under a different bcrypt cost
+    if new_hash:
+        user = await update_user_async(db, user.id, {"hashed_password": new_hash})
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         subject=user.id, expires_delta=access_token_expires
@@ -63,5 +93,10 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     }
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user = Depends(get_current_user)):
-    return current_user
\ No newline at end of file
+@query_budget(2)
+async def get_current_user_info(current_user = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
+    # The cached principal holds only what authorisation needs; read the profile
+    user = await get_user_by_id_async(db, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
\ No newline at end of file
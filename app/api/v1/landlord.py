@@ -0,0 +1,26 @@
+# app/api/v1/landlord.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_async_db
+from ...core.security import get_current_user
+from ...core.metrics import query_budget
+from ...models.user import User, UserRole
+from ...schemas.dashboard import LandlordDashboard
+from ...services.dashboard_service import get_landlord_dashboard_async
+
+router = APIRouter()
+
+@router.get("/dashboard", response_model=LandlordDashboard)
+@query_budget(6)
+async def get_dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can access this endpoint"
+        )
+    
+    return await get_landlord_dashboard_async(db, current_user.id)
@@ -1,32 +1,48 @@
 # app/api/v1/maintenance.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
 
-from ...core.database import get_db
+from ...core.database import get_async_db
 from ...core.security import get_current_user
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...core.responses import list_response, page_response
+from ...core.response_cache import response_cache, tag
+from ...core.export import EXPORT_FORMAT_PATTERN, export_response
+from ...core.batch import MAX_BATCH_SIZE, batch_result, validate_items
+from ...core.metrics import query_budget
 from ...models.user import User, UserRole
 from ...models.maintenance import MaintenanceStatus
 from ...schemas.maintenance import MaintenanceRequestCreate, MaintenanceRequestResponse
+from ...schemas.pagination import Page
+from ...schemas.batch import BatchResult
 from ...services.maintenance_service import (
-    create_maintenance_request, 
-    get_maintenance_requests_by_tenant, 
-    get_maintenance_requests_by_landlord,
-    update_maintenance_status
+    create_maintenance_request_async, 
+    create_maintenance_requests_async,
+    get_maintenance_requests_by_tenant_async, 
+    get_maintenance_requests_by_landlord_async,
+    update_maintenance_status_async,
+    get_maintenance_queue_async,
+    claim_maintenance_requests_async,
+    DEFAULT_QUEUE_SIZE,
+    MAX_QUEUE_SIZE
 )
-from ...services.unit_service import get_unit_by_id
-from ...services.property_service import get_property_by_id
+from ...services.unit_service import get_unit_by_id_async, get_unit_landlords_async
+from ...services.assignment_service import get_active_assignment_for_unit_async, get_active_assignments_for_units_async
+from ...services.property_service import get_property_by_id_async
+from ...services.export_service import maintenance_export_query
 
 router = APIRouter()
 
 @router.post("/", response_model=MaintenanceRequestResponse)
-def create_maintenance(
+@query_budget(8)
+async def create_maintenance(
     request: MaintenanceRequestCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     # Verify unit exists
-    unit = get_unit_by_id(db, request.unit_id)
+    unit = await get_unit_by_id_async(db, request.unit_id)
     if not unit:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -36,26 +52,63 @@ def create_maintenance(
     # Check authorization (tenant must be assigned to unit or landlord must own property)
     if current_user.role == UserRole.TENANT:
         # Check if tenant is assigned to this unit
-        from ...services.assignment_service import get_assignments_by_tenant
-        tenant_assignments = get_assignments_by_tenant(db, current_user.id)
-        if not any(assignment.unit_id == request.unit_id and assignment.is_active for assignment in tenant_assignments):
+        active_assignment = await get_active_assignment_for_unit_async(db, request.unit_id)
+        if not active_assignment or active_assignment.tenant_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to create maintenance request for this unit"
             )
     elif current_user.role == UserRole.LANDLORD:
-        property = get_property_by_id(db, unit.property_id)
+        property = await get_property_by_id_async(db, unit.property_id)
         if property.landlord_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to create maintenance request for this unit"
             )
     
-    return create_maintenance_request(db, request, current_user.id)
+    return await create_maintenance_request_async(db, request, current_user.id)
 
-@router.get("/tenant/requests", response_model=List[MaintenanceRequestResponse])
-def get_tenant_maintenance_requests(
-    db: Session = Depends(get_db),
+@router.post("/batch", response_model=BatchResult[MaintenanceRequestResponse])
+@query_budget(7)
+async def create_maintenance_batch(
+    requests: List[Dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    valid, errors = validate_items(MaintenanceRequestCreate, requests)
+    
+    # Resolve ownership for every referenced unit up front, then apply the
+    # same rules as create_maintenance per item
+    unit_ids = list({request.unit_id for _, request in valid})
+    unit_landlords = await get_unit_landlords_async(db, unit_ids)
+    tenant_units = set()
+    if current_user.role == UserRole.TENANT:
+        tenant_units = {
+            assignment.unit_id
+            for assignment in await get_active_assignments_for_units_async(db, unit_ids)
+            if assignment.tenant_id == current_user.id
+        }
+    
+    accepted = []
+    for index, request in valid:
+        if request.unit_id not in unit_landlords:
+            errors.append((index, "Unit not found"))
+        elif current_user.role == UserRole.TENANT and request.unit_id not in tenant_units:
+            errors.append((index, "Not authorized to create maintenance request for this unit"))
+        elif current_user.role == UserRole.LANDLORD and unit_landlords[request.unit_id] != current_user.id:
+            errors.append((index, "Not authorized to create maintenance request for this unit"))
+        else:
+            accepted.append((index, request))
+    
+    created = await create_maintenance_requests_async(db, [request for _, request in accepted], current_user.id)
+    return batch_result(list(zip([index for index, _ in accepted], created)), errors)
+
+@router.get("/tenant/requests", response_model=Page[MaintenanceRequestResponse])
+@query_budget(2)
+async def get_tenant_maintenance_requests(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role != UserRole.TENANT:
@@ -64,11 +117,29 @@ def get_tenant_maintenance_requests(
             detail="Only tenants can access this endpoint"
         )
     
-    return get_maintenance_requests_by_tenant(db, current_user.id)
+    cached = response_cache.lookup(current_user.id, "maintenance:tenant", cursor, limit)
+    if cached.hit:
+        return cached.response()
+    
+    try:
+        requests, next_cursor = await get_maintenance_requests_by_tenant_async(db, current_user.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return cached.store(
+        page_response(requests, next_cursor),
+        [tag("maintenance"), tag("maintenance", "tenant", current_user.id)]
+    )
 
-@router.get("/landlord/requests", response_model=List[MaintenanceRequestResponse])
-def get_landlord_maintenance_requests(
-    db: Session = Depends(get_db),
+@router.get("/landlord/requests", response_model=Page[MaintenanceRequestResponse])
+@query_budget(2)
+async def get_landlord_maintenance_requests(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -77,13 +148,91 @@ def get_landlord_maintenance_requests(
             detail="Only landlords and admins can access this endpoint"
         )
     
-    return get_maintenance_requests_by_landlord(db, current_user.id)
+    cached = response_cache.lookup(current_user.id, "maintenance:landlord", cursor, limit)
+    if cached.hit:
+        return cached.response()
+    
+    try:
+        requests, next_cursor = await get_maintenance_requests_by_landlord_async(db, current_user.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return cached.store(
+        page_response(requests, next_cursor),
+        [tag("maintenance"), tag("maintenance", "landlord", current_user.id)]
+    )
+
+@router.get("/landlord/export")
+@query_budget(2)
+async def export_landlord_maintenance(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    property_id: Optional[int] = None,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can export maintenance requests"
+        )
+    
+    # Streamed from its own session on a worker thread; nothing is loaded up front
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    try:
+        statement = maintenance_export_query(landlord_id, property_id, from_month, to_month)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return export_response(statement, format, "maintenance")
+
+@router.get("/queue", response_model=List[MaintenanceRequestResponse])
+@query_budget(4)
+async def get_maintenance_queue(
+    limit: int = Query(DEFAULT_QUEUE_SIZE, ge=1, le=MAX_QUEUE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can view the work queue"
+        )
+    
+    # Landlords see the requests on their own units, admins everyone's
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    return list_response(await get_maintenance_queue_async(db, landlord_id, limit))
+
+@router.post("/queue/claim", response_model=List[MaintenanceRequestResponse])
+@query_budget(5)
+async def claim_maintenance_requests(
+    limit: int = Query(1, ge=1, le=MAX_QUEUE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can claim maintenance requests"
+        )
+    
+    # Atomic: concurrent claimers never get the same request; an empty list
+    # means the queue is drained
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    return list_response(await claim_maintenance_requests_async(db, current_user.id, landlord_id, limit))
 
 @router.put("/{request_id}/status")
-def update_maintenance_request_status(
+@query_budget(7)
+async def update_maintenance_request_status(
     request_id: int,
     status: MaintenanceStatus,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -92,7 +241,7 @@ def update_maintenance_request_status(
             detail="Only landlords and admins can update maintenance status"
         )
     
-    request = update_maintenance_status(db, request_id, status)
+    request = await update_maintenance_status_async(db, request_id, status)
     if not request:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,26 +1,50 @@
 # app/api/v1/payments.py
-from fastapi import APIRouter, Depends, HTTPException, status
+import io
+from fastapi import APIRouter, Body, Depends, File, Header, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional
 
-from ...core.database import get_db
+from ...core.database import get_async_db, get_db
 from ...core.security import get_current_user
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...core.etag import etag_matches, not_modified, version_etag
+from ...core.responses import list_response, page_response
+from ...core.response_cache import response_cache, tag
+from ...core.export import EXPORT_FORMAT_PATTERN, export_response
+from ...core.batch import MAX_BATCH_SIZE, batch_result, validate_items
+from ...core.metrics import query_budget
 from ...models.user import User, UserRole
 from ...models.payment import PaymentStatus
-from ...schemas.payment import PaymentCreate, PaymentResponse
-from ...services.payment_service import create_payment, get_payments_by_tenant, get_payments_by_landlord, update_payment_status
-from ...services.assignment_service import get_assignment_by_id
+from ...schemas.payment import PaymentCreate, PaymentImportResult, PaymentResponse
+from ...schemas.pagination import Page
+from ...schemas.batch import BatchResult
+from ...services.payment_service import (
+    create_payment_async,
+    create_payments_async,
+    get_payments_by_ids_async,
+    get_recorded_mpesa_references_async,
+    get_payments_by_tenant_async,
+    get_payments_by_landlord_async,
+    get_payments_version_by_tenant_async,
+    get_payments_version_by_landlord_async,
+    update_payment_status_async
+)
+from ...services.assignment_service import get_assignment_by_id_async, get_assignments_by_ids_async
+from ...services.mpesa_service import import_mpesa_statement
+from ...services.export_service import payments_export_query
 
 router = APIRouter()
 
 @router.post("/", response_model=PaymentResponse)
-def record_payment(
+@query_budget(9)
+async def record_payment(
     payment: PaymentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     # Verify assignment exists
-    assignment = get_assignment_by_id(db, payment.assignment_id)
+    assignment = await get_assignment_by_id_async(db, payment.assignment_id)
     if not assignment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -34,14 +58,103 @@ def record_payment(
             detail="Not authorized to record payment for this assignment"
         )
     
-    return create_payment(db, payment, assignment.tenant_id)
+    try:
+        return await create_payment_async(db, payment, assignment.tenant_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.post("/batch", response_model=BatchResult[PaymentResponse])
+@query_budget(11)
+async def record_payments_batch(
+    payments: List[Dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    valid, errors = validate_items(PaymentCreate, payments)
+    
+    # One lookup for every referenced assignment, then the same checks as
+    # record_payment applied per item
+    assignments = {
+        assignment.id: assignment
+        for assignment in await get_assignments_by_ids_async(db, list({payment.assignment_id for _, payment in valid}))
+    }
+    references = await get_recorded_mpesa_references_async(
+        db, [payment.mpesa_reference for _, payment in valid if payment.mpesa_reference]
+    )
+    accepted = []
+    for index, payment in valid:
+        assignment = assignments.get(payment.assignment_id)
+        if not assignment:
+            errors.append((index, "Assignment not found"))
+        elif current_user.role == UserRole.TENANT and current_user.id != assignment.tenant_id:
+            errors.append((index, "Not authorized to record payment for this assignment"))
+        elif payment.mpesa_reference and payment.mpesa_reference in references:
+            errors.append((index, "A payment with this M-Pesa reference is already recorded"))
+        else:
+            if payment.mpesa_reference:
+                references.add(payment.mpesa_reference)
+            accepted.append((index, payment, assignment.tenant_id))
+    
+    created = []
+    inserted = await create_payments_async(db, [(payment, tenant_id) for _, payment, tenant_id in accepted])
+    for (index, _, _), db_payment in zip(accepted, inserted):
+        # Recorded by a concurrent request after the reference check above
+        if db_payment is None:
+            errors.append((index, "A payment with this M-Pesa reference is already recorded"))
+        else:
+            created.append((index, db_payment))
+    return batch_result(created, errors)
 
-@router.get("/tenant/payments", response_model=List[PaymentResponse])
-def get_tenant_payments(
-    skip: int = 0,
-    limit: int = 100,
+@router.post("/import", response_model=PaymentImportResult)
+@query_budget(9)
+def import_payments(
+    statement: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
+):
+    # Sync on purpose: the statement is parsed and inserted as a stream on a
+    # worker thread instead of being read into memory on the event loop
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can import statements"
+        )
+    
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    lines = io.TextIOWrapper(statement.file, encoding="utf-8-sig", newline="")
+    try:
+        return import_mpesa_statement(db, lines, landlord_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+@router.get("/", response_model=List[PaymentResponse])
+@query_budget(2)
+async def get_payments_by_ids(
+    ids: List[int] = Query(..., max_length=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Tenants see their own payments, landlords those on their properties
+    tenant_id = current_user.id if current_user.role == UserRole.TENANT else None
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    return list_response(await get_payments_by_ids_async(db, ids, tenant_id, landlord_id))
+
+@router.get("/tenant/payments", response_model=Page[PaymentResponse])
+@query_budget(3)
+async def get_tenant_payments(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
 ):
     if current_user.role != UserRole.TENANT:
         raise HTTPException(
@@ -49,13 +162,41 @@ def get_tenant_payments(
             detail="Only tenants can access this endpoint"
         )
     
-    return get_payments_by_tenant(db, current_user.id, skip, limit)
+    cached = response_cache.lookup(current_user.id, "payments:tenant", cursor, limit, from_month, to_month)
+    if cached.hit:
+        return cached.response(if_none_match)
+    
+    # An unchanged listing is answered from its version alone, without loading rows
+    version = await get_payments_version_by_tenant_async(db, current_user.id)
+    etag = version_etag("payments/tenant", current_user.id, cursor, limit, from_month, to_month, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    try:
+        # Billing month ranges seek the (tenant, billing_period) index
+        payments, next_cursor = await get_payments_by_tenant_async(
+            db, current_user.id, cursor, limit, from_month, to_month
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return cached.store(
+        page_response(payments, next_cursor, etag),
+        [tag("payments"), tag("payments", "tenant", current_user.id)]
+    )
 
-@router.get("/landlord/payments", response_model=List[PaymentResponse])
-def get_landlord_payments(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+@router.get("/landlord/payments", response_model=Page[PaymentResponse])
+@query_budget(3)
+async def get_landlord_payments(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -64,13 +205,65 @@ def get_landlord_payments(
             detail="Only landlords and admins can access this endpoint"
         )
     
-    return get_payments_by_landlord(db, current_user.id, skip, limit)
+    cached = response_cache.lookup(current_user.id, "payments:landlord", cursor, limit, from_month, to_month)
+    if cached.hit:
+        return cached.response(if_none_match)
+    
+    # An unchanged listing is answered from its version alone, without loading rows
+    version = await get_payments_version_by_landlord_async(db, current_user.id)
+    etag = version_etag("payments/landlord", current_user.id, cursor, limit, from_month, to_month, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    try:
+        # Billing month ranges seek the (lease, billing_period) index
+        payments, next_cursor = await get_payments_by_landlord_async(
+            db, current_user.id, cursor, limit, from_month, to_month
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return cached.store(
+        page_response(payments, next_cursor, etag),
+        [tag("payments"), tag("payments", "landlord", current_user.id)]
+    )
+
+@router.get("/landlord/export")
+@query_budget(2)
+async def export_landlord_payments(
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN),
+    property_id: Optional[int] = None,
+    from_month: Optional[str] = None,
+    to_month: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can export payments"
+        )
+    
+    # Streamed from its own session on a worker thread; nothing is loaded up front
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    try:
+        statement = payments_export_query(landlord_id, property_id, from_month, to_month)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return export_response(statement, format, "payments")
 
 @router.put("/{payment_id}/status")
-def update_payment_status_endpoint(
+@query_budget(5)
+async def update_payment_status_endpoint(
     payment_id: int,
     status: PaymentStatus,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -79,7 +272,7 @@ def update_payment_status_endpoint(
             detail="Only landlords and admins can update payment status"
         )
     
-    payment = update_payment_status(db, payment_id, status)
+    payment = await update_payment_status_async(db, payment_id, status)
     if not payment:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,20 +1,32 @@
 # app/api/v1/properties.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
-from ...core.database import get_db
+from ...core.database import get_async_db
 from ...core.security import get_current_user
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...core.etag import etag_matches, not_modified, version_etag
+from ...core.responses import page_response
+from ...core.response_cache import response_cache, tag
+from ...core.metrics import query_budget
 from ...models.user import User, UserRole
 from ...schemas.property import PropertyCreate, PropertyResponse
-from ...services.property_service import create_property, get_properties_by_landlord, get_property_with_stats
+from ...schemas.pagination import Page
+from ...services.property_service import (
+    create_property_async,
+    get_properties_by_landlord_async,
+    get_properties_version_async,
+    get_property_with_stats_async
+)
 
 router = APIRouter()
 
 @router.post("/", response_model=PropertyResponse)
-def create_new_property(
+@query_budget(6)
+async def create_new_property(
     property: PropertyCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -23,13 +35,15 @@ def create_new_property(
             detail="Not authorized to create properties"
         )
     
-    return create_property(db, property, current_user.id)
+    return await create_property_async(db, property, current_user.id)
 
-@router.get("/", response_model=List[PropertyResponse])
-def get_properties(
-    skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[PropertyResponse])
+@query_budget(3)
+async def get_properties(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
@@ -38,23 +52,39 @@ def get_properties(
             detail="Not authorized to view properties"
         )
     
-    properties = get_properties_by_landlord(db, current_user.id, skip, limit)
+    cached = response_cache.lookup(current_user.id, "properties", cursor, limit)
+    if cached.hit:
+        return cached.response(if_none_match)
     
-    # Add statistics to each property
-    for property in properties:
-        property_with_stats = get_property_with_stats(db, property.id)
-        property.units_count = property_with_stats.units_count
-        property.occupied_units = property_with_stats.occupied_units
+    # An unchanged listing is answered from its index-only version alone
+    version = await get_properties_version_async(db, current_user.id)
+    etag = version_etag("properties", current_user.id, cursor, limit, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
     
-    return properties
+    # Occupancy comes joined from the property_stats read model
+    try:
+        properties, next_cursor = await get_properties_by_landlord_async(db, current_user.id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # Counter changes drop the pages showing that property
+    return cached.store(
+        page_response(properties, next_cursor, etag),
+        [tag("properties"), tag("properties", current_user.id)] + [tag("property", item["id"]) for item in properties]
+    )
 
 @router.get("/{property_id}", response_model=PropertyResponse)
-def get_property(
+@query_budget(2)
+async def get_property(
     property_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    property = get_property_with_stats(db, property_id)
+    property = await get_property_with_stats_async(db, property_id)
     if not property:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,42 @@
+# app/api/v1/search.py
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from ...core.database import get_async_db
+from ...core.security import get_current_user
+from ...core.responses import list_response
+from ...core.metrics import query_budget
+from ...models.user import User, UserRole
+from ...schemas.search import SearchResult
+from ...services.search_service import search_async, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+
+router = APIRouter()
+
+@router.get("", response_model=List[SearchResult])
+@query_budget(2)
+async def search(
+    q: str = Query(..., min_length=2, max_length=200),
+    kind: List[str] = Query([]),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role not in [UserRole.LANDLORD, UserRole.ADMIN]:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only landlords and admins can search"
+        )
+    
+    # Best matches first; landlords search their own properties, units and
+    # tenants, admins everyone's
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    try:
+        results = await search_async(db, q, landlord_id, kind, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return list_response(results)
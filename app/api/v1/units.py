@@ -1,26 +1,43 @@
 # app/api/v1/units.py
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, List, Optional
 
-from ...core.database import get_db
+from ...core.database import get_async_db
 from ...core.security import get_current_user
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from ...core.etag import etag_matches, not_modified, version_etag
+from ...core.responses import list_response, page_response
+from ...core.response_cache import response_cache, tag
+from ...core.batch import MAX_BATCH_SIZE, batch_result, validate_items
+from ...core.metrics import query_budget
 from ...models.user import User, UserRole
-from ...schemas.unit import UnitCreate, UnitResponse
-from ...services.unit_service import create_unit, get_units_by_property, get_unit_by_id
-from ...services.property_service import get_property_by_id
+from ...schemas.unit import UnitCreate, UnitResponse, VacancySearch
+from ...schemas.pagination import Page
+from ...schemas.batch import BatchResult
+from ...services.unit_service import (
+    create_unit_async,
+    create_units_async,
+    get_units_by_property_async,
+    get_units_version_async,
+    get_unit_by_id_async,
+    get_units_by_ids_async
+)
+from ...services.property_service import get_property_by_id_async
+from ...services.vacancy_service import get_vacancy_facets_async, search_vacant_units_async
 
 router = APIRouter()
 
 @router.post("/properties/{property_id}/units/", response_model=UnitResponse)
-def create_new_unit(
+@query_budget(9)
+async def create_new_unit(
     property_id: int,
     unit: UnitCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     # Check if property exists and user owns it
-    property = get_property_by_id(db, property_id)
+    property = await get_property_by_id_async(db, property_id)
     if not property:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -33,16 +50,94 @@ def create_new_unit(
             detail="Not authorized to add units to this property"
         )
     
-    return create_unit(db, unit, property_id)
+    return await create_unit_async(db, unit, property_id)
 
-@router.get("/properties/{property_id}/units/", response_model=List[UnitResponse])
-def get_property_units(
+@router.post("/properties/{property_id}/units/batch", response_model=BatchResult[UnitResponse])
+@query_budget(8)
+async def create_units_batch(
     property_id: int,
-    db: Session = Depends(get_db),
+    units: List[Dict[str, Any]] = Body(..., max_length=MAX_BATCH_SIZE),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
+    # Check if property exists and user owns it
+    property = await get_property_by_id_async(db, property_id)
+    if not property:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Property not found"
+        )
+    
+    if current_user.role == UserRole.LANDLORD and property.landlord_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to add units to this property"
+        )
+    
+    # Invalid items are reported back; the valid ones go in one transaction
+    valid, errors = validate_items(UnitCreate, units)
+    created = await create_units_async(db, [unit for _, unit in valid], property_id)
+    return batch_result(list(zip([index for index, _ in valid], created)), errors)
+
+@router.get("/units/", response_model=List[UnitResponse])
+@query_budget(2)
+async def get_units_by_ids(
+    ids: List[int] = Query(..., max_length=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Landlords only see units in their own properties
+    landlord_id = current_user.id if current_user.role == UserRole.LANDLORD else None
+    return list_response(await get_units_by_ids_async(db, ids, landlord_id))
+
+@router.get("/units/vacant", response_model=VacancySearch)
+@query_budget(3)
+async def search_vacant_units(
+    county: List[str] = Query([]),
+    city: List[str] = Query([]),
+    bedrooms: List[int] = Query([]),
+    bathrooms: List[float] = Query([]),
+    min_rent: Optional[float] = Query(None, ge=0),
+    max_rent: Optional[float] = Query(None, ge=0),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Listings are public to every signed-in user; repeating a filter
+    # matches any of its values, and each facet counts the units that
+    # pass the other filters
+    filters = dict(
+        county=county, city=city, bedrooms=bedrooms, bathrooms=bathrooms, min_rent=min_rent, max_rent=max_rent
+    )
+    try:
+        units, next_cursor = await search_vacant_units_async(db, cursor, limit, **filters)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    facets = await get_vacancy_facets_async(db, **filters)
+    return page_response(units, next_cursor, **facets)
+
+@router.get("/properties/{property_id}/units/", response_model=Page[UnitResponse])
+@query_budget(4)
+async def get_property_units(
+    property_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Keyed by the caller, so a hit was already authorized
+    cached = response_cache.lookup(current_user.id, "units", property_id, cursor, limit)
+    if cached.hit:
+        return cached.response(if_none_match)
+    
     # Check if property exists and user has access
-    property = get_property_by_id(db, property_id)
+    property = await get_property_by_id_async(db, property_id)
     if not property:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -55,15 +150,30 @@ def get_property_units(
             detail="Not authorized to view units in this property"
         )
     
-    return get_units_by_property(db, property_id)
+    # An unchanged listing is answered from its version alone, without loading rows
+    version = await get_units_version_async(db, property_id)
+    etag = version_etag("units", property_id, cursor, limit, *version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    try:
+        units, next_cursor = await get_units_by_property_async(db, property_id, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    return cached.store(page_response(units, next_cursor, etag), [tag("units"), tag("units", property_id)])
 
 @router.get("/units/{unit_id}", response_model=UnitResponse)
-def get_unit(
+@query_budget(3)
+async def get_unit(
     unit_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    unit = get_unit_by_id(db, unit_id)
+    unit = await get_unit_by_id_async(db, unit_id)
     if not unit:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -72,7 +182,7 @@ def get_unit(
     
     # Check authorization
     if current_user.role == UserRole.LANDLORD:
-        property = get_property_by_id(db, unit.property_id)
+        property = await get_property_by_id_async(db, unit.property_id)
         if property.landlord_id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
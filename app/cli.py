@@ -0,0 +1,130 @@
+# app/cli.py
+"""Operational commands: ``python -m app.cli <command>``."""
+import argparse
+import os
+import sys
+
+from sqlalchemy import inspect
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Revision matching the schema that Base.metadata.create_all used to build
+BASELINE_REVISION = "0001"
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(os.path.join(ROOT_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT_DIR, "migrations"))
+    return config
+
+def migrate(args) -> int:
+    from alembic import command
+    from .core.database import get_engine
+
+    config = alembic_config()
+    tables = set(inspect(get_engine()).get_table_names())
+    if "users" in tables and "alembic_version" not in tables:
+        # Database predates migrations; record it as the baseline schema
+        command.stamp(config, BASELINE_REVISION)
+    
+    command.upgrade(config, args.revision)
+    return 0
+
+def import_mpesa(args) -> int:
+    import json
+    from .core.database import SessionLocal
+    from .services.mpesa_service import IMPORT_BATCH_SIZE, import_mpesa_statement
+
+    db = SessionLocal()
+    try:
+        with open(args.statement, encoding="utf-8-sig", newline="") as lines:
+            result = import_mpesa_statement(db, lines, args.landlord_id, args.batch_size or IMPORT_BATCH_SIZE)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    
+    print(json.dumps(result, indent=2))
+    return 0
+
+def generate_invoices(args) -> int:
+    from .core.database import SessionLocal
+    from .services.billing_service import generate_monthly_invoices, next_billing_month
+
+    for_month = args.month or next_billing_month()
+    shards = [args.shard] if args.shard is not None else range(args.shards)
+    db = SessionLocal()
+    try:
+        # One transaction per shard keeps each statement's footprint bounded
+        for shard in shards:
+            created = generate_monthly_invoices(db, for_month, shard, args.shards)
+            print(f"{for_month} shard {shard}/{args.shards}: {created} invoices")
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    return 0
+
+def sweep_overdue(args) -> int:
+    from datetime import date
+    from .core.database import SessionLocal
+    from .services.billing_service import sweep_overdue_payments
+
+    as_of = date.fromisoformat(args.as_of) if args.as_of else None
+    db = SessionLocal()
+    try:
+        result = sweep_overdue_payments(db, as_of)
+    finally:
+        db.close()
+    
+    print(f"{result['overdue']} charges marked overdue, {result['late_fees']} late fees raised")
+    return 0
+
+def reindex_search(args) -> int:
+    from .core.database import SessionLocal
+    from .services.search_service import rebuild_search_index
+
+    db = SessionLocal()
+    try:
+        counts = rebuild_search_index(db)
+    finally:
+        db.close()
+    
+    print(", ".join(f"{count} {kind} documents" for kind, count in counts.items()))
+    return 0
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="apply database migrations")
+    migrate_parser.add_argument("revision", nargs="?", default="head")
+    migrate_parser.set_defaults(handler=migrate)
+
+    import_parser = commands.add_parser("import-mpesa", help="record the receipts of an M-Pesa statement CSV")
+    import_parser.add_argument("statement", help="path to the statement CSV")
+    import_parser.add_argument("--landlord-id", type=int, help="only match leases of this landlord")
+    import_parser.add_argument("--batch-size", type=int, help="rows per INSERT")
+    import_parser.set_defaults(handler=import_mpesa)
+
+    invoice_parser = commands.add_parser("generate-invoices", help="raise the monthly rent charge for every active lease")
+    invoice_parser.add_argument("--month", help="billing month as YYYY-MM (default: next month)")
+    invoice_parser.add_argument("--shards", type=int, default=1, help="split landlords into this many transactions")
+    invoice_parser.add_argument("--shard", type=int, help="only run this shard (0-based), e.g. one per worker")
+    invoice_parser.set_defaults(handler=generate_invoices)
+
+    sweep_parser = commands.add_parser("sweep-overdue", help="mark unpaid charges overdue and raise late fees")
+    sweep_parser.add_argument("--as-of", help="run as of this date, YYYY-MM-DD (default: today)")
+    sweep_parser.set_defaults(handler=sweep_overdue)
+
+    reindex_parser = commands.add_parser("reindex-search", help="rebuild the search index from the source tables")
+    reindex_parser.set_defaults(handler=reindex_search)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,24 @@
+# app/core/batch.py
+from typing import Any, Dict, List, Tuple, Type
+from pydantic import BaseModel, ValidationError
+
+# Largest number of items accepted by a batch endpoint
+MAX_BATCH_SIZE = 500
+
+def validate_items(schema: Type[BaseModel], items: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, BaseModel]], List[Tuple[int, str]]]:
+    """Validate each raw item on its own so one bad row doesn't reject the batch."""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, schema(**item)))
+        except ValidationError as e:
+            errors.append((index, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            )))
+    return valid, errors
+
+def batch_result(created: List[Tuple[int, Any]], errors: List[Tuple[int, str]]) -> dict:
+    results = [{"index": index, "ok": True, "item": item, "error": None} for index, item in created]
+    results += [{"index": index, "ok": False, "item": None, "error": error} for index, error in errors]
+    results.sort(key=lambda result: result["index"])
+    return {"created": len(created), "failed": len(errors), "results": results}
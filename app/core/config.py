@@ -0,0 +1,47 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
+
+    PROJECT_NAME: str = "RentEZi"
+    API_V1_STR: str = "/api/v1"
+    DEBUG: bool = False
+
+    DATABASE_URL: str = "sqlite:///./rentezi.db"
+
+    SECRET_KEY: str
+    ALGORITHM: str = "HS256"
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
+
+    # bcrypt cost; hashes at any other cost are upgraded on the next login
+    BCRYPT_ROUNDS: int = 12
+    # Processes dedicated to hashing, and logins allowed to wait for one
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_SIZE: int = 32
+
+    # Authenticated principals cached per token; entries never outlive the token.
+    # Per process: with several workers, a role change or deactivation reaches
+    # the other workers' caches only when the TTL runs out (0 disables caching)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+
+    # Read-through cache of list responses: "memory://" keeps an LRU per
+    # process, a redis:// URL shares one across workers (use it when running
+    # more than one, or other workers serve stale lists until the TTL) and
+    # empty disables it. Writes through app/services invalidate it.
+    RESPONSE_CACHE_URL: str = "memory://"
+    RESPONSE_CACHE_SIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+
+    # Prometheus metrics at /metrics: request latency, SQL per request,
+    # pool and threadpool occupancy, and event-loop lag sampled this often
+    METRICS_ENABLED: bool = True
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+
+    # Late fee charged once per overdue rent charge, GRACE_DAYS after it fell
+    # due: FLAT plus PERCENT of the rent. Both zero disables late fees.
+    LATE_FEE_GRACE_DAYS: int = 5
+    LATE_FEE_FLAT: float = 0.0
+    LATE_FEE_PERCENT: float = 0.0
+
+settings = Settings()
@@ -1,18 +1,61 @@
+import functools
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.DEBUG
-)
+# Async drivers used for the event-loop engine, keyed by backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+# Engines are created on first use so importing the app does no database work
+@functools.lru_cache(maxsize=None)
+def get_engine() -> Engine:
+    return create_engine(
+        settings.DATABASE_URL,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=settings.DEBUG
+    )
+
+@functools.lru_cache(maxsize=None)
+def get_async_engine() -> AsyncEngine:
+    return create_async_engine(
+        async_database_url(settings.DATABASE_URL),
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=settings.DEBUG
+    )
+
+def __getattr__(name):
+    # Backwards-compatible ``from app.core.database import engine``
+    if name == "engine":
+        return get_engine()
+    if name == "async_engine":
+        return get_async_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Create session factories, bound to the engines when a session is opened
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+_async_session_factory = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+def SessionLocal() -> Session:
+    return _session_factory(bind=get_engine())
+
+def AsyncSessionLocal() -> AsyncSession:
+    return _async_session_factory(bind=get_async_engine())
 
 # Create base class for models
 Base = declarative_base()
@@ -23,4 +66,20 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def run_async(fn):
+    """Expose a sync service function as a coroutine taking an AsyncSession.
+
+    The function runs through ``AsyncSession.run_sync``, so its queries are
+    awaited on the async driver instead of blocking a worker thread.
+    """
+    @functools.wraps(fn)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(fn, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,25 @@
+# app/core/etag.py
+import hashlib
+from datetime import datetime
+from typing import Any, Optional
+from fastapi import Response
+
+def version_etag(*parts: Any) -> str:
+    """Strong ETag for a listing: its scope, page parameters and data version.
+
+    The version is an aggregate such as (count, max(updated_at)) read from
+    an index, so the tag is known before any row is loaded.
+    """
+    raw = "|".join(part.isoformat() if isinstance(part, datetime) else str(part) for part in parts)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix still matches
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,99 @@
+# app/core/export.py
+import csv
+import enum
+import io
+import json
+from typing import Callable, Iterator, Sequence
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.sql import sqltypes
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal
+
+# Rows fetched from the cursor and written to the response per step
+EXPORT_CHUNK_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+EXPORT_FORMAT_PATTERN = "^(csv|ndjson)$"
+
+def _enum_text(value: enum.Enum) -> str:
+    # Int-valued enums (priorities) read better by name
+    return value.name.lower() if isinstance(value.value, int) else value.value
+
+def _isoformat(value) -> str:
+    return value.isoformat()
+
+def _row_converter(statement: Select) -> Callable[[Sequence], list]:
+    """Turn a result row into plain CSV/JSON values.
+
+    The conversions are picked once from the selected column types, so the
+    per-row work only touches enum and date columns.
+    """
+    conversions = []
+    for index, column in enumerate(statement.selected_columns):
+        if isinstance(column.type, sqltypes.Enum):
+            conversions.append((index, _enum_text))
+        elif isinstance(column.type, (sqltypes.Date, sqltypes.DateTime)):
+            conversions.append((index, _isoformat))
+
+    def convert(row: Sequence) -> list:
+        values = list(row)
+        for index, conversion in conversions:
+            if values[index] is not None:
+                values[index] = conversion(values[index])
+        return values
+    return convert
+
+def _encode_csv(columns, rows, header: bool) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+def _encode_ndjson(columns, rows, header: bool) -> bytes:
+    return "".join(json.dumps(dict(zip(columns, row))) + "\n" for row in rows).encode("utf-8")
+
+ENCODERS = {"csv": _encode_csv, "ndjson": _encode_ndjson}
+
+def stream_export(
+    statement: Select, format: str = "csv", chunk_size: int = EXPORT_CHUNK_SIZE,
+    session_factory: Callable[[], Session] = SessionLocal
+) -> Iterator[bytes]:
+    """Run ``statement`` on a server-side cursor and yield it encoded, a chunk at a time.
+
+    Only ``chunk_size`` rows are held at once, so memory stays flat however
+    many rows the export covers. The generator owns its session: a
+    ``StreamingResponse`` keeps pulling from it after the request's own
+    dependencies have been torn down.
+    """
+    if format not in ENCODERS:
+        raise ValueError(f"Unsupported export format '{format}'")
+    encode = ENCODERS[format]
+    db = session_factory()
+    try:
+        result = db.execute(statement.execution_options(stream_results=True, yield_per=chunk_size))
+        columns = list(result.keys())
+        convert = _row_converter(statement)
+        header = True
+        for rows in result.partitions():
+            yield encode(columns, [convert(row) for row in rows], header)
+            header = False
+        if header and format == "csv":
+            # Nothing matched; still send the header so the file is well-formed
+            yield encode(columns, [], True)
+    finally:
+        db.close()
+
+def export_response(statement: Select, format: str, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        stream_export(statement, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{format}"'}
+    )
@@ -0,0 +1,181 @@
+# app/core/metrics.py
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .database import get_async_engine, get_engine
+
+# Metrics live in this process; with several workers, scrape each one
+registry = CollectorRegistry()
+
+REQUEST_SECONDS = Histogram(
+    "rentezi_http_request_duration_seconds", "Time to answer a request, by route template",
+    ["method", "route", "status"], registry=registry
+)
+# A route whose statement count grows with the page size is an N+1
+REQUEST_SQL_STATEMENTS = Histogram(
+    "rentezi_http_request_sql_statements", "SQL statements executed while answering a request",
+    ["method", "route"], buckets=(0, 1, 2, 3, 4, 6, 8, 12, 16, 25, 50, 100, 250), registry=registry
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "rentezi_http_request_sql_seconds", "Time spent executing SQL while answering a request",
+    ["method", "route"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=registry
+)
+REQUEST_OVER_QUERY_BUDGET = Counter(
+    "rentezi_http_request_over_query_budget", "Requests that ran more SQL statements than their route's budget",
+    ["method", "route"], registry=registry
+)
+EVENT_LOOP_LAG = Histogram(
+    "rentezi_event_loop_lag_seconds", "How late the event loop woke a sleeping task; blocking calls show here",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5), registry=registry
+)
+
+# Route label for requests no route matched, so scanners cannot grow the label set
+UNMATCHED_ROUTE = "unmatched"
+
+def query_budget(statements: int):
+    """Declare the most SQL statements an endpoint may run, whatever the data size.
+
+    Goes between the route decorator and the endpoint, and includes loading
+    the caller when their principal isn't cached. Checked at two data sizes
+    by ``tests/test_query_budget.py``; requests over it are counted.
+    """
+    def declare(endpoint):
+        endpoint.query_budget = statements
+        return endpoint
+    return declare
+
+def route_query_budget(route) -> Optional[int]:
+    return getattr(getattr(route, "endpoint", None), "query_budget", None)
+
+class SQLStats:
+    """SQL statements run, and seconds spent running them, within one ``track_sql`` block."""
+    __slots__ = ("statements", "seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+
+# Set per request; the sync work of AsyncSession.run_sync and the threadpool
+# both run in a copy of the request's context, so they count against it
+_current_sql: ContextVar[Optional[SQLStats]] = ContextVar("current_sql", default=None)
+
+@contextmanager
+def track_sql():
+    """Count the SQL executed on any engine inside the block, in this context."""
+    stats = SQLStats()
+    token = _current_sql.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_sql.reset(token)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_statement(conn, cursor, statement, parameters, context, executemany):
+    if _current_sql.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _finish_statement(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_sql.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is not None and started is not None:
+        stats.statements += 1
+        stats.seconds += time.perf_counter() - started
+
+class PoolCollector:
+    """Connection pool and threadpool occupancy, read when scraped."""
+
+    def collect(self):
+        checked_out = GaugeMetricFamily(
+            "rentezi_db_pool_checked_out", "Connections lent out by the pool", labels=["engine"]
+        )
+        overflow = GaugeMetricFamily(
+            "rentezi_db_pool_overflow", "Connections open beyond the pool size; negative while below it",
+            labels=["engine"]
+        )
+        size = GaugeMetricFamily("rentezi_db_pool_size", "Connections the pool keeps open", labels=["engine"])
+        for name, engine in (("sync", get_engine()), ("async", get_async_engine().sync_engine)):
+            pool = engine.pool
+            # SingletonThreadPool and NullPool keep no such counts
+            if hasattr(pool, "checkedout"):
+                checked_out.add_metric([name], pool.checkedout())
+                overflow.add_metric([name], pool.overflow())
+                size.add_metric([name], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+        
+        # Sync endpoints and run_in_threadpool share anyio's default limiter
+        try:
+            from anyio.to_thread import current_default_thread_limiter
+            limiter = current_default_thread_limiter()
+        except RuntimeError:  # Scraped outside the event loop
+            return
+        busy = GaugeMetricFamily("rentezi_threadpool_busy", "Worker threads running sync endpoints and calls")
+        busy.add_metric([], limiter.borrowed_tokens)
+        limit = GaugeMetricFamily("rentezi_threadpool_size", "Worker threads available to sync endpoints and calls")
+        limit.add_metric([], limiter.total_tokens)
+        yield busy
+        yield limit
+
+registry.register(PoolCollector())
+
+def render_metrics() -> tuple:
+    """(body, content type) of the Prometheus text exposition."""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+class MetricsMiddleware:
+    """Time every HTTP request and count the SQL it runs, labelled by route template.
+
+    Plain ASGI rather than BaseHTTPMiddleware so streamed bodies are timed
+    to their last chunk and the SQL context reaches the endpoint.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        started = time.perf_counter()
+        with track_sql() as sql:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                # The router leaves the matched route in the scope
+                matched = scope.get("route")
+                route = getattr(matched, "path", UNMATCHED_ROUTE)
+                method = scope["method"]
+                budget = route_query_budget(matched)
+                if budget is not None and sql.statements > budget:
+                    REQUEST_OVER_QUERY_BUDGET.labels(method, route).inc()
+                REQUEST_SECONDS.labels(method, route, str(status)).observe(time.perf_counter() - started)
+                REQUEST_SQL_STATEMENTS.labels(method, route).observe(sql.statements)
+                REQUEST_SQL_SECONDS.labels(method, route).observe(sql.seconds)
+
+async def watch_event_loop(interval: float) -> None:
+    """Sleep ``interval`` seconds at a time and record how late each wake-up was."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - started - interval))
@@ -0,0 +1,53 @@
+# app/core/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+from sqlalchemy import tuple_
+
+# Hard server-side caps for every list endpoint
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def paginate(
+    query,
+    model,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    entity: Optional[Callable[[Any], Any]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """Return one page of ``query`` keyed on (created_at, id), newest first.
+
+    ``entity`` picks the model instance out of a result row when the query
+    selects extra columns next to it. Seeking on the key instead of using
+    OFFSET keeps deep pages as cheap as the first one.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        # As a row value the key is one range on (..., created_at, id)
+        # indexes; spelled as an OR of two comparisons it is not seekable
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, last_id))
+    
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = entity(rows[-1]) if entity else rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    return rows, next_cursor
@@ -0,0 +1,108 @@
+# app/core/principal_cache.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set
+
+from ..models.user import UserRole
+
+class Principal(NamedTuple):
+    """What authorisation reads of a user, copied when their token is verified.
+
+    Immutable, so one cached entry can be handed to concurrent requests.
+    """
+    id: int
+    role: UserRole
+    is_active: bool
+
+    @classmethod
+    def of(cls, user) -> "Principal":
+        return cls(user.id, user.role, user.is_active)
+
+class PrincipalCache:
+    """Bounded LRU of authenticated principals keyed by the SHA-256 of their token.
+
+    Entries expire after ``ttl_seconds`` or at the token's own ``exp``,
+    whichever comes first. The cache is per process: ``invalidate_user``,
+    called whenever a user's record changes, only reaches the worker that
+    made the change. Other workers keep serving the old role, or a
+    deactivated user, for up to ``ttl_seconds``.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._keys_by_user: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Principal]:
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return principal
+
+    def set(self, token: str, principal: Principal, token_exp: float) -> None:
+        expires_at = min(time.time() + self.ttl_seconds, token_exp)
+        if expires_at <= time.time() or self.max_size <= 0:
+            return
+        
+        key = self.digest(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (principal, expires_at)
+            self._keys_by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+            }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        
+        keys = self._keys_by_user.get(entry[0].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[0].id]
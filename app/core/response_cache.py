@@ -0,0 +1,317 @@
+# app/core/response_cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .etag import etag_matches, not_modified
+
+# A cached body and the ETag it was sent with
+Entry = Tuple[bytes, Optional[str]]
+
+class MemoryBackend:
+    """Bounded LRU of response bodies in this process, indexed by tag."""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            value, expires_at, _ = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Entry, tags: Iterable[str], generation: int) -> bool:
+        with self._lock:
+            # Something was invalidated while the response was being built
+            if generation != self._generation or self.max_size <= 0:
+                return False
+            
+            self._remove(key)
+            tags = tuple(tags)
+            self._entries[key] = (value, time.time() + self.ttl_seconds, tags)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            self._generation += 1
+            removed = 0
+            for tag in tags:
+                for key in list(self._keys_by_tag.get(tag, ())):
+                    self._remove(key)
+                    removed += 1
+            return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_tag.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"evictions": self.evictions, "size": len(self._entries), "max_size": self.max_size}
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+class RedisBackend:
+    """Response bodies in Redis, shared by every worker and host.
+
+    Each tag is a set of the keys stored under it, and a generation counter
+    is bumped on every invalidation. Stores run ``STORE_SCRIPT`` so the
+    generation check and the writes are one atomic step; everything else is
+    plain commands (GET, SMEMBERS, DEL, INCR, SCAN). Any client with the
+    redis-py interface works, including a local stand-in in tests.
+    Evictions are Redis' own, under its ``maxmemory`` policy.
+    """
+
+    # KEYS: generation, entry, then its tag sets. ARGV: generation the
+    # response was built at, value, TTL, entry key as listed in the tags.
+    STORE_SCRIPT = """
+if tonumber(redis.call('GET', KEYS[1]) or '0') ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+for i = 3, #KEYS do
+    redis.call('SADD', KEYS[i], ARGV[4])
+    redis.call('EXPIRE', KEYS[i], ARGV[3])
+end
+return 1
+"""
+
+    def __init__(self, client, ttl_seconds: float, prefix: str = "rentezi:response:"):
+        self.client = client
+        self.ttl_seconds = int(ttl_seconds)
+        self.prefix = prefix
+        self._store = client.register_script(self.STORE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, ttl_seconds: float) -> "RedisBackend":
+        import redis  # Only needed when a shared cache is configured
+        
+        return cls(redis.Redis.from_url(url), ttl_seconds)
+
+    def _generation_key(self) -> str:
+        return self.prefix + "generation"
+
+    def _tag_key(self, tag: str) -> str:
+        return self.prefix + "tag:" + tag
+
+    def generation(self) -> int:
+        return int(self.client.get(self._generation_key()) or 0)
+
+    def get(self, key: str) -> Optional[Entry]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        
+        etag, _, body = raw.partition(b"\n")
+        return body, etag.decode() or None
+
+    def set(self, key: str, value: Entry, tags: Iterable[str], generation: int) -> bool:
+        # Checked inside the script: an invalidation landing between a
+        # separate check and SET would leave the old body stored
+        body, etag = value
+        return bool(self._store(
+            keys=[self._generation_key(), self.prefix + key] + [self._tag_key(tag) for tag in tags],
+            args=[generation, (etag or "").encode() + b"\n" + body, self.ttl_seconds, key]
+        ))
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        self.client.incr(self._generation_key())
+        removed = 0
+        for tag in tags:
+            keys = [key.decode() if isinstance(key, bytes) else key for key in self.client.smembers(self._tag_key(tag))]
+            if keys:
+                removed += self.client.delete(*[self.prefix + key for key in keys])
+            self.client.delete(self._tag_key(tag))
+        return removed
+
+    def clear(self) -> None:
+        self.client.incr(self._generation_key())
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {"evictions": None, "size": None, "max_size": None}
+
+class NullBackend:
+    """Caching disabled: every lookup misses and nothing is stored."""
+
+    def generation(self) -> int:
+        return 0
+
+    def get(self, key: str) -> Optional[Entry]:
+        return None
+
+    def set(self, key: str, value: Entry, tags: Iterable[str], generation: int) -> bool:
+        return False
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        return 0
+
+    def clear(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"evictions": 0, "size": 0, "max_size": 0}
+
+class CacheLookup:
+    """The outcome of one lookup; stores the response built on a miss."""
+
+    def __init__(self, cache: "ResponseCache", key: str, hit: Optional[Entry], generation: int):
+        self.cache = cache
+        self.key = key
+        self.hit = hit
+        self.generation = generation
+
+    def response(self, if_none_match: Optional[str] = None) -> Response:
+        body, etag = self.hit
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag)
+        return Response(body, media_type="application/json", headers={"ETag": etag} if etag else None)
+
+    def store(self, response: Response, tags: Iterable[str]) -> Response:
+        if response.status_code == 200:
+            self.cache.set(self.key, (response.body, response.headers.get("etag")), tags, self.generation)
+        return response
+
+class ResponseCache:
+    """Read-through cache of serialized list responses.
+
+    Keys are the principal, the route and its parameters, so an entry is
+    only ever served to the user it was built for. Entries carry tags for
+    the data they show (``tag("units", property_id)``); the service write
+    paths call ``invalidate_on_commit`` with the tags they affect and the
+    matching entries are dropped once the transaction commits. A response
+    built while any invalidation happened is not stored, so a read racing a
+    write cannot cache the old data. The TTL bounds staleness from writes
+    made outside the services.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(principal_id: int, route: str, *params: Any) -> str:
+        return ":".join([str(principal_id), route] + ["" if param is None else str(param) for param in params])
+
+    def lookup(self, principal_id: int, route: str, *params: Any) -> CacheLookup:
+        key = self.key(principal_id, route, *params)
+        generation = self.backend.generation()
+        hit = self.backend.get(key)
+        with self._lock:
+            if hit is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return CacheLookup(self, key, hit, generation)
+
+    def set(self, key: str, value: Entry, tags: Iterable[str], generation: int) -> bool:
+        return self.backend.set(key, value, tags, generation)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = set(tags)
+        if not tags:
+            return 0
+        
+        removed = self.backend.invalidate(tags)
+        with self._lock:
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "invalidations": self.invalidations,
+            }
+        stats.update(self.backend.stats())
+        return stats
+
+def tag(namespace: str, *scope: Any) -> str:
+    """Tag for the entries of a namespace, optionally narrowed to a scope.
+
+    Listings are stored under both, e.g. ``payments`` and
+    ``payments:landlord:7``, so a bulk job can drop a whole namespace.
+    """
+    return ":".join([namespace] + [str(part) for part in scope])
+
+def build_backend(url: str, max_size: int, ttl_seconds: float):
+    if not url:
+        return NullBackend()
+    if url.startswith("memory://"):
+        return MemoryBackend(max_size, ttl_seconds)
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend.from_url(url, ttl_seconds)
+    raise ValueError(f"Unsupported response cache URL '{url}'")
+
+response_cache = ResponseCache(
+    build_backend(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+)
+
+# Tags queued by the write paths, dropped from the cache when the session's
+# transaction commits and forgotten if it rolls back
+PENDING_TAGS = "response_cache_tags"
+
+def invalidate_on_commit(db: Session, *tags: str) -> None:
+    db.info.setdefault(PENDING_TAGS, set()).update(tags)
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    tags = session.info.pop(PENDING_TAGS, None)
+    if tags:
+        response_cache.invalidate(tags)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session: Session) -> None:
+    session.info.pop(PENDING_TAGS, None)
@@ -0,0 +1,16 @@
+# app/core/responses.py
+from typing import Any, List, Optional
+from fastapi.responses import ORJSONResponse
+
+# List endpoints select their response columns as plain rows and serialize
+# them with orjson directly. Returning a Response skips FastAPI's
+# response_model validation; the declared model still documents the shape,
+# so the projections must keep to its fields.
+
+def page_response(items: List[Any], next_cursor: Optional[str], etag: Optional[str] = None, **fields: Any) -> ORJSONResponse:
+    # ``fields`` are extra top-level members of the page, such as totals
+    headers = {"ETag": etag} if etag else None
+    return ORJSONResponse({"items": items, "next_cursor": next_cursor, **fields}, headers=headers)
+
+def list_response(items: List[Any]) -> ORJSONResponse:
+    return ORJSONResponse(items)
@@ -1,16 +1,28 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Tuple, Union, Any
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from .config import settings
-from .database import get_db
+from .database import get_async_db
+from .principal_cache import Principal, PrincipalCache
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
 
 def create_access_token(subject: Union[str, Any], expires_delta: timedelta = None) -> str:
     if expires_delta:
@@ -30,27 +42,91 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
-def verify_token(token: str) -> Optional[str]:
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password, returning a replacement hash if the stored one uses a stale cost."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+# bcrypt runs on a dedicated process pool so hashing neither holds the GIL
+# nor occupies the request threadpool. Requests that need a hash take a slot
+# first; beyond the workers plus the queue allowance they get a fast 503.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_slots_in_use = 0
+
+def _hash_pool_context():
+    # Workers start from a clean server process (or a fresh interpreter where
+    # there's no forkserver), never by forking this threaded one with its
+    # locks possibly held
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, mp_context=_hash_pool_context())
+    return _hash_pool
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+@asynccontextmanager
+async def password_hash_slot():
+    global _hash_slots_in_use
+    if _hash_slots_in_use >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    
+    _hash_slots_in_use += 1
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload.get("sub")
+        yield
+    finally:
+        _hash_slots_in_use -= 1
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), get_password_hash, password)
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_hash_pool(), verify_and_update_password, plain_password, hashed_password
+    )
+
+def decode_token(token: str) -> Optional[dict]:
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def verify_token(token: str) -> Optional[str]:
+    payload = decode_token(token)
+    return payload.get("sub") if payload else None
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    user_id = verify_token(token)
-    if user_id is None:
+    # Fast path: token already verified and its user loaded by this process
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
+    payload = decode_token(token)
+    if payload is None or payload.get("sub") is None:
         raise credentials_exception
     
-    from ..services.user_service import get_user_by_id
-    user = get_user_by_id(db, user_id=int(user_id))
-    if user is None:
+    from ..services.user_service import get_user_by_id_async
+    user = await get_user_by_id_async(db, user_id=int(payload["sub"]))
+    if user is None or not user.is_active:
         raise credentials_exception
     
-    return user
\ No newline at end of file
+    # A snapshot rather than the ORM instance, which belongs to this request's session
+    principal = Principal.of(user)
+    principal_cache.set(token, principal, payload.get("exp", 0))
+    return principal
@@ -1,20 +1,37 @@
 # app/main.py
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .core.config import settings
-from .core.database import engine
-from .models.base import Base
+from .core.security import principal_cache, shutdown_hash_pool
+from .core.response_cache import response_cache
+from .core.metrics import MetricsMiddleware, render_metrics, watch_event_loop
 from .api.v1 import api_router
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+# The schema is managed by migrations (python -m app.cli migrate); importing
+# the app performs no database I/O and engines connect on first use
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    watch = None
+    if settings.METRICS_ENABLED:
+        watch = asyncio.create_task(watch_event_loop(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS))
+    try:
+        yield
+    finally:
+        if watch is not None:
+            watch.cancel()
+        # Password workers are separate processes; don't leave them behind
+        shutdown_hash_pool()
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
     description="RentEZi - Kenya Rent Management API",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -26,6 +43,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so latency covers the other middleware too
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -39,7 +60,18 @@ def root():
 
 @app.get("/health")
 def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "principal_cache": principal_cache.stats(),
+        "response_cache": response_cache.stats()
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.METRICS_ENABLED:
+        return Response(status_code=404)
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
 
 if __name__ == "__main__":
     import uvicorn
@@ -2,17 +2,30 @@
 from .base import Base
 from .user import User
 from .property import Property
+from .property_stats import PropertyStats
+from .landlord_stats import LandlordStats, LandlordMonthlyStats
 from .unit import Unit
 from .assignment import Assignment
+from .assignment_balance import AssignmentBalance
 from .payment import Payment
 from .maintenance import MaintenanceRequest
+from .job_watermark import JobWatermark
+from .search_document import SearchDocument
+from .vacancy_facet import VacancyFacet
 
 __all__ = [
     "Base",
     "User",
     "Property", 
+    "PropertyStats",
+    "LandlordStats",
+    "LandlordMonthlyStats",
     "Unit",
     "Assignment",
+    "AssignmentBalance",
     "Payment",
-    "MaintenanceRequest"
+    "MaintenanceRequest",
+    "JobWatermark",
+    "SearchDocument",
+    "VacancyFacet"
 ]
\ No newline at end of file
@@ -1,10 +1,20 @@
 # app/models/assignment.py
-from sqlalchemy import Column, Integer, Float, Date, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, Date, Boolean, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 class Assignment(BaseModel):
     __tablename__ = "assignments"
+    __table_args__ = (
+        Index("ix_assignments_tenant_created", "tenant_id", "created_at", "id"),
+        Index("ix_assignments_unit_active", "unit_id", "is_active"),
+        # At most one active lease per unit
+        Index(
+            "uq_assignments_active_unit", "unit_id", unique=True,
+            sqlite_where=text("is_active"),
+            postgresql_where=text("is_active")
+        ),
+    )
 
     unit_id = Column(Integer, ForeignKey("units.id"), nullable=False)
     tenant_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -18,4 +28,5 @@ class Assignment(BaseModel):
     # Relationships
     unit = relationship("Unit", back_populates="assignments")
     tenant = relationship("User", back_populates="tenant_assignments")
-    payments = relationship("Payment", back_populates="assignment")
\ No newline at end of file
+    payments = relationship("Payment", back_populates="assignment")
+    ledger = relationship("AssignmentBalance", back_populates="assignment", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
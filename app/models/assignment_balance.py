@@ -0,0 +1,24 @@
+# app/models/assignment_balance.py
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from .base import Base
+
+class AssignmentBalance(Base):
+    """Running totals for a lease, kept current by every write that adds a
+    charge or moves a receipt in or out of PAID, so balances never have to
+    be summed from payment history."""
+    __tablename__ = "assignment_balances"
+
+    assignment_id = Column(Integer, ForeignKey("assignments.id", ondelete="CASCADE"), primary_key=True)
+    charged_total = Column(Float, nullable=False, default=0.0)  # Rent and fees
+    paid_total = Column(Float, nullable=False, default=0.0)  # PAID receipts
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    assignment = relationship("Assignment", back_populates="ledger")
+
+    @property
+    def balance(self) -> float:
+        """Amount owed; negative when the tenant is in credit."""
+        return round(self.charged_total - self.paid_total, 2)
@@ -1,15 +1,24 @@
 from .user import User
 from .property import Property
+from .property_stats import PropertyStats
+from .landlord_stats import LandlordStats, LandlordMonthlyStats
 from .unit import Unit
 from .assignment import Assignment
+from .assignment_balance import AssignmentBalance
 from .payment import Payment
 from .maintenance import MaintenanceRequest
+from .job_watermark import JobWatermark
 
 __all__ = [
     "User",
     "Property", 
+    "PropertyStats",
+    "LandlordStats",
+    "LandlordMonthlyStats",
     "Unit",
     "Assignment",
+    "AssignmentBalance",
     "Payment",
-    "MaintenanceRequest"
+    "MaintenanceRequest",
+    "JobWatermark"
 ]
\ No newline at end of file
@@ -0,0 +1,12 @@
+# app/models/job_watermark.py
+from sqlalchemy import Column, String, Date, DateTime
+from datetime import datetime
+from .base import Base
+
+class JobWatermark(Base):
+    """How far a periodic job has got, so the next run starts from there."""
+    __tablename__ = "job_watermarks"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(Date, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,26 @@
+# app/models/landlord_stats.py
+from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey
+from datetime import datetime
+from .base import Base
+
+class LandlordStats(Base):
+    """Open maintenance counters for a landlord's portfolio, kept current by
+    the maintenance write paths for the dashboard."""
+    __tablename__ = "landlord_stats"
+
+    landlord_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    open_requests_high = Column(Integer, nullable=False, default=0)
+    open_requests_medium = Column(Integer, nullable=False, default=0)
+    open_requests_low = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class LandlordMonthlyStats(Base):
+    """Rent expected (RENT charges) and collected (PAID receipts) per landlord
+    and for_month, kept current by the payment write paths."""
+    __tablename__ = "landlord_monthly_stats"
+
+    landlord_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    for_month = Column(String, primary_key=True)  # Format: "YYYY-MM"
+    expected_rent = Column(Float, nullable=False, default=0.0)
+    collected_rent = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
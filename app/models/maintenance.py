@@ -1,5 +1,5 @@
 # app/models/maintenance.py
-from sqlalchemy import Column, String, Integer, ForeignKey, Enum, DateTime, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, Enum, DateTime, Text, Index
 from sqlalchemy.orm import relationship
 import enum
 from .base import BaseModel
@@ -17,6 +17,12 @@ class MaintenancePriority(int, enum.Enum):
 
 class MaintenanceRequest(BaseModel):
     __tablename__ = "maintenance_requests"
+    __table_args__ = (
+        Index("ix_maintenance_tenant_created", "tenant_id", "created_at", "id"),
+        Index("ix_maintenance_unit_created", "unit_id", "created_at", "id"),
+        # Work queue: oldest first within each status and priority
+        Index("ix_maintenance_queue", "status", "priority", "created_at", "id"),
+    )
 
     unit_id = Column(Integer, ForeignKey("units.id"), nullable=False)
     tenant_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -25,7 +31,10 @@ class MaintenanceRequest(BaseModel):
     status = Column(Enum(MaintenanceStatus), default=MaintenanceStatus.PENDING)
     priority = Column(Enum(MaintenancePriority), default=MaintenancePriority.MEDIUM)
     resolved_at = Column(DateTime)
+    # Who took it off the work queue, and when
+    claimed_by = Column(Integer, ForeignKey("users.id", name="fk_maintenance_requests_claimed_by"))
+    claimed_at = Column(DateTime)
 
     # Relationships
     unit = relationship("Unit", back_populates="maintenance_requests")
-    tenant = relationship("User", back_populates="maintenance_requests")
\ No newline at end of file
+    tenant = relationship("User", back_populates="maintenance_requests", foreign_keys=[tenant_id])
\ No newline at end of file
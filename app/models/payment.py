@@ -1,5 +1,5 @@
 # app/models/payment.py
-from sqlalchemy import Column, Integer, Float, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Float, String, Date, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 import enum
 from .base import BaseModel
@@ -10,17 +10,47 @@ class PaymentStatus(str, enum.Enum):
     OVERDUE = "overdue"
     PARTIALLY_PAID = "partially_paid"
 
+class PaymentKind(str, enum.Enum):
+    RECEIPT = "receipt"  # Money received from the tenant
+    RENT = "rent"  # Monthly rent charged to the lease
+    LATE_FEE = "late_fee"
+
 class Payment(BaseModel):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Tenant history, newest first (keyset pagination order)
+        Index("ix_payments_tenant_created", "tenant_id", "created_at", "id"),
+        Index("ix_payments_assignment_created", "assignment_id", "created_at", "id"),
+        # A receipt can only be recorded once; statement imports rely on it
+        Index("uq_payments_mpesa_reference", "mpesa_reference", unique=True),
+        # One charge of each kind per lease and month; makes invoicing rerunnable
+        Index(
+            "uq_payments_charge_month", "assignment_id", "kind", "for_month", unique=True,
+            sqlite_where=text("kind != 'RECEIPT'"),
+            postgresql_where=text("kind != 'RECEIPT'")
+        ),
+        # Overdue sweeps walk charges by due date
+        Index("ix_payments_due_status", "due_date", "status"),
+        # Listing versions (count, max updated_at) for ETags, index-only
+        Index("ix_payments_tenant_updated", "tenant_id", "updated_at"),
+        Index("ix_payments_assignment_updated", "assignment_id", "updated_at"),
+        # Billing period ranges ("Q1", "last 12 months") per tenant or lease
+        Index("ix_payments_tenant_period", "tenant_id", "billing_period"),
+        Index("ix_payments_assignment_period", "assignment_id", "billing_period"),
+    )
 
     assignment_id = Column(Integer, ForeignKey("assignments.id"), nullable=False)
     tenant_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     amount = Column(Float, nullable=False)
     payment_date = Column(DateTime)
     mpesa_reference = Column(String)
+    # Receipts are PAID once received; charges follow the lease's receipts (settle_charges)
     status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING)
+    kind = Column(Enum(PaymentKind), nullable=False, default=PaymentKind.RECEIPT, server_default=PaymentKind.RECEIPT.name)
+    due_date = Column(Date)  # Charges only
     for_month = Column(String, nullable=False)  # Format: "YYYY-MM"
     for_year = Column(Integer, nullable=False)
+    billing_period = Column(Date, nullable=False)  # First day of for_month
     notes = Column(String)
 
     # Relationships
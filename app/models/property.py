@@ -1,9 +1,14 @@
-from sqlalchemy import Column, String, Integer, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from .base import BaseModel
 
 class Property(BaseModel):
     __tablename__ = "properties"
+    __table_args__ = (
+        Index("ix_properties_landlord_created", "landlord_id", "created_at", "id"),
+        # Listing versions (count, max updated_at) for ETags, index-only
+        Index("ix_properties_landlord_updated", "landlord_id", "updated_at"),
+    )
 
     name = Column(String, nullable=False)
     address = Column(String, nullable=False)
@@ -14,4 +19,5 @@ class Property(BaseModel):
 
     # Relationships
     landlord = relationship("User", back_populates="properties")
-    units = relationship("Unit", back_populates="property", cascade="all, delete-orphan")
\ No newline at end of file
+    units = relationship("Unit", back_populates="property", cascade="all, delete-orphan")
+    stats = relationship("PropertyStats", back_populates="property", uselist=False, cascade="all, delete-orphan")
\ No newline at end of file
@@ -0,0 +1,22 @@
+# app/models/property_stats.py
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from .base import Base
+
+class PropertyStats(Base):
+    """Occupancy counters for a property, kept current by the unit and
+    assignment write paths so listings never have to COUNT units."""
+    __tablename__ = "property_stats"
+    __table_args__ = (
+        # Lets a property listing's version read the counters' changes index-only
+        Index("ix_property_stats_property_updated", "property_id", "updated_at"),
+    )
+
+    property_id = Column(Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True)
+    units_count = Column(Integer, nullable=False, default=0)
+    occupied_units = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Relationships
+    property = relationship("Property", back_populates="stats")
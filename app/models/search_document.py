@@ -0,0 +1,28 @@
+# app/models/search_document.py
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Index
+from .base import BaseModel
+
+class SearchDocument(BaseModel):
+    """One searchable property, unit or tenant, as a landlord sees it.
+
+    Kept current by the property, unit, assignment and user write paths.
+    The full-text index over it is backend-specific and lives in the
+    migrations: an FTS5 table fed by triggers on SQLite, a GIN index on a
+    tsvector expression on PostgreSQL.
+    """
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        # A tenant is indexed once per landlord they have leased from
+        Index("ix_search_documents_object", "kind", "object_id", "landlord_id", unique=True),
+        Index("ix_search_documents_landlord", "landlord_id"),
+        Index("ix_search_documents_property", "property_id"),
+    )
+
+    kind = Column(String, nullable=False)
+    object_id = Column(Integer, nullable=False)
+    landlord_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # The property itself for a property, the unit's property for a unit
+    property_id = Column(Integer)
+    title = Column(String, nullable=False)
+    subtitle = Column(String)
+    terms = Column(Text, nullable=False)
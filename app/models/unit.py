@@ -1,5 +1,5 @@
 # app/models/unit.py
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 import enum
 from .base import BaseModel
@@ -11,6 +11,18 @@ class UnitStatus(str, enum.Enum):
 
 class Unit(BaseModel):
     __tablename__ = "units"
+    __table_args__ = (
+        Index("ix_units_property_status", "property_id", "status"),
+        Index("ix_units_property_created", "property_id", "created_at", "id"),
+        # Listing versions (count, max updated_at) for ETags, index-only
+        Index("ix_units_property_updated", "property_id", "updated_at"),
+        # Vacancy search walks vacant units newest first and checks layout,
+        # rent and property from the index, reading only the rows it lists
+        Index("ix_units_vacancy", "status", "created_at", "id", "bedrooms", "bathrooms", "monthly_rent", "property_id"),
+        # Rent filters that end inside a rent band count that band's vacant
+        # units by rent range, again from the index alone
+        Index("ix_units_vacant_rent", "status", "monthly_rent", "bedrooms", "bathrooms", "property_id"),
+    )
 
     unit_number = Column(String, nullable=False)
     floor = Column(String)
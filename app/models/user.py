@@ -25,4 +25,6 @@ class User(BaseModel):
     properties = relationship("Property", back_populates="landlord")
     tenant_assignments = relationship("Assignment", back_populates="tenant")
     payments = relationship("Payment", back_populates="tenant")
-    maintenance_requests = relationship("MaintenanceRequest", back_populates="tenant")
\ No newline at end of file
+    maintenance_requests = relationship(
+        "MaintenanceRequest", back_populates="tenant", foreign_keys="MaintenanceRequest.tenant_id"
+    )
\ No newline at end of file
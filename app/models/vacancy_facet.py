@@ -0,0 +1,19 @@
+# app/models/vacancy_facet.py
+from sqlalchemy import Column, Integer, Float, String, DateTime
+from datetime import datetime
+from .base import Base
+
+class VacancyFacet(Base):
+    """Vacant units per location, layout and rent band, kept current by the
+    unit, assignment and property write paths so vacancy facets never count
+    units. Bands are ``vacancy_service.RENT_BANDS``, so the table grows with
+    locations and layouts rather than with distinct rents."""
+    __tablename__ = "vacancy_facets"
+
+    county = Column(String, primary_key=True)
+    city = Column(String, primary_key=True)
+    bedrooms = Column(Integer, primary_key=True)
+    bathrooms = Column(Float, primary_key=True)
+    rent_band = Column(Integer, primary_key=True)
+    vacant_units = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, validator
 from datetime import date, datetime
-from typing import Optional
+from typing import List, Optional
 
 class AssignmentBase(BaseModel):
     start_date: date
@@ -31,5 +31,30 @@ class AssignmentResponse(AssignmentBase):
     class Config:
         from_attributes = True
 
+class AssignmentBalanceResponse(BaseModel):
+    assignment_id: int
+    charged_total: float
+    paid_total: float
+    balance: float
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class ArrearsItem(BaseModel):
+    assignment_id: int
+    tenant_id: int
+    tenant_name: str
+    unit_info: str
+    property_name: str
+    charged_total: float
+    paid_total: float
+    balance: float
+
+class ArrearsReport(BaseModel):
+    leases_in_arrears: int
+    total_arrears: float
+    items: List[ArrearsItem]
+
 # For compatibility
 Assignment = AssignmentResponse
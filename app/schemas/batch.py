@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+class BatchItemResult(BaseModel, Generic[T]):
+    index: int
+    ok: bool
+    item: Optional[T] = None
+    error: Optional[str] = None
+
+class BatchResult(BaseModel, Generic[T]):
+    created: int
+    failed: int
+    results: List[BatchItemResult[T]]
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Dict, List
+from datetime import date
+
+class OccupancySummary(BaseModel):
+    properties: int
+    units: int
+    occupied_units: int
+    occupancy_rate: float
+
+class MonthlyRent(BaseModel):
+    for_month: str  # Format: "YYYY-MM"
+    expected: float
+    collected: float
+    outstanding: float
+
+class ExpiringLease(BaseModel):
+    assignment_id: int
+    tenant_name: str
+    unit_info: str
+    property_name: str
+    end_date: date
+    monthly_rent: float
+
+class ExpiringLeases(BaseModel):
+    within_days: int
+    count: int
+    items: List[ExpiringLease]
+
+class LandlordDashboard(BaseModel):
+    occupancy: OccupancySummary
+    rent: List[MonthlyRent]  # Current month first, then the previous one
+    open_maintenance: Dict[str, int]  # By priority: high, medium, low
+    expiring_leases: ExpiringLeases
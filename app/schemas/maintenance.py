@@ -17,6 +17,8 @@ class MaintenanceRequestResponse(MaintenanceRequestBase):
     tenant_id: int
     status: MaintenanceStatus
     resolved_at: Optional[datetime] = None
+    claimed_by: Optional[int] = None
+    claimed_at: Optional[datetime] = None
     created_at: datetime
     tenant_name: Optional[str] = None
     unit_info: Optional[str] = None
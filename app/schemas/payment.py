@@ -1,7 +1,8 @@
-from pydantic import BaseModel
-from typing import Optional
-from datetime import datetime
-from ..models.payment import PaymentStatus
+import re
+from pydantic import BaseModel, validator
+from typing import List, Optional
+from datetime import date, datetime
+from ..models.payment import PaymentKind, PaymentStatus
 
 class PaymentBase(BaseModel):
     amount: float
@@ -12,6 +13,12 @@ class PaymentBase(BaseModel):
 class PaymentCreate(PaymentBase):
     assignment_id: int
     mpesa_reference: Optional[str] = None
+    
+    @validator('for_month')
+    def validate_for_month(cls, v):
+        if not re.fullmatch(r"\d{4}-(0[1-9]|1[0-2])", v):
+            raise ValueError('for_month must be a month in YYYY-MM format')
+        return v
 
 class PaymentResponse(PaymentBase):
     id: int
@@ -20,6 +27,8 @@ class PaymentResponse(PaymentBase):
     payment_date: Optional[datetime] = None
     mpesa_reference: Optional[str] = None
     status: PaymentStatus
+    kind: PaymentKind = PaymentKind.RECEIPT
+    due_date: Optional[date] = None
     created_at: datetime
     tenant_name: Optional[str] = None
     unit_info: Optional[str] = None
@@ -29,3 +38,13 @@ class PaymentResponse(PaymentBase):
 
 # For compatibility
 Payment = PaymentResponse
+
+class PaymentImportError(BaseModel):
+    line: int
+    error: str
+
+class PaymentImportResult(BaseModel):
+    inserted: int
+    duplicates: int
+    rejected: int
+    errors: List[PaymentImportError] = []
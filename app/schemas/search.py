@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class SearchResult(BaseModel):
+    kind: str
+    id: int
+    title: str
+    subtitle: Optional[str] = None
+    # The property a unit belongs to, or the property itself
+    property_id: Optional[int] = None
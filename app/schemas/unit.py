@@ -1,7 +1,8 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional, Union
 from datetime import datetime
 from ..models.unit import UnitStatus
+from .pagination import Page
 
 class UnitBase(BaseModel):
     unit_number: str
@@ -24,5 +25,36 @@ class UnitResponse(UnitBase):
     class Config:
         from_attributes = True
 
+class VacantUnit(UnitBase):
+    id: int
+    property_id: int
+    created_at: datetime
+    property_name: str
+    address: str
+    city: str
+    county: str
+
+class FacetCount(BaseModel):
+    value: Union[int, float, str]
+    count: int
+
+class RentBandCount(BaseModel):
+    min_rent: float
+    # None for the open-ended top band
+    max_rent: Optional[float] = None
+    count: int
+
+class VacancyFacets(BaseModel):
+    county: List[FacetCount]
+    city: List[FacetCount]
+    bedrooms: List[FacetCount]
+    bathrooms: List[FacetCount]
+    rent: List[RentBandCount]
+
+class VacancySearch(Page[VacantUnit]):
+    # Vacant units matching every filter, across all pages
+    total: int
+    facets: VacancyFacets
+
 # For compatibility
 Unit = UnitResponse
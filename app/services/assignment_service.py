@@ -1,12 +1,19 @@
 # app/services/assignment_service.py
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
 from datetime import date
 from ..models.assignment import Assignment
+from ..models.assignment_balance import AssignmentBalance
 from ..models.unit import Unit, UnitStatus
 from ..models.user import User
 from ..models.property import Property
 from ..schemas.assignment import AssignmentCreate
+from ..core.pagination import paginate, DEFAULT_PAGE_SIZE
+from .property_service import adjust_property_stats, occupancy_delta
+from .vacancy_service import adjust_vacancies, vacancy_delta
+from ..core.database import run_async
+from ..core.response_cache import invalidate_on_commit, tag
+from .search_service import index_tenants
 
 def create_assignment(db: Session, assignment: AssignmentCreate, unit_id: int) -> Assignment:
     # Check if unit is available
@@ -28,13 +35,23 @@ def create_assignment(db: Session, assignment: AssignmentCreate, unit_id: int) -
     db_assignment = Assignment(
         unit_id=unit_id,
         **assignment.dict(),
-        is_active=True
+        is_active=True,
+        ledger=AssignmentBalance(charged_total=0.0, paid_total=0.0)
     )
     db.add(db_assignment)
     
     # Update unit status
+    adjust_property_stats(db, unit.property_id, occupied_delta=occupancy_delta(unit.status, UnitStatus.OCCUPIED))
+    adjust_vacancies(db, unit.property_id, [unit], vacancy_delta(unit.status, UnitStatus.OCCUPIED))
     unit.status = UnitStatus.OCCUPIED
     
+    # The tenant becomes searchable by the unit's landlord
+    db.flush()
+    index_tenants(db, [assignment.tenant_id])
+    
+    invalidate_on_commit(db, *_listing_tags(db, unit, assignment.tenant_id))
+    if existing_assignment:
+        invalidate_on_commit(db, tag("assignments", "tenant", existing_assignment.tenant_id))
     db.commit()
     db.refresh(db_assignment)
     return db_assignment
@@ -42,37 +59,63 @@ def create_assignment(db: Session, assignment: AssignmentCreate, unit_id: int) -
 def get_assignment_by_id(db: Session, assignment_id: int) -> Optional[Assignment]:
     return db.query(Assignment).filter(Assignment.id == assignment_id).first()
 
-def get_assignments_by_tenant(db: Session, tenant_id: int) -> List[Assignment]:
-    assignments = db.query(Assignment).filter(
-        Assignment.tenant_id == tenant_id
-    ).options(
-        joinedload(Assignment.unit).joinedload(Unit.property)
-    ).all()
-    
-    # Add computed fields
-    for assignment in assignments:
-        tenant = db.query(User).filter(User.id == assignment.tenant_id).first()
-        assignment.tenant_name = f"{tenant.first_name} {tenant.last_name}" if tenant else None
-        assignment.unit_info = f"{assignment.unit.unit_number}"
-        assignment.property_name = assignment.unit.property.name
-    
-    return assignments
+def get_assignments_by_ids(db: Session, assignment_ids: List[int]) -> List[Assignment]:
+    return db.query(Assignment).filter(Assignment.id.in_(assignment_ids)).all()
 
-def get_assignments_by_landlord(db: Session, landlord_id: int) -> List[Assignment]:
-    assignments = db.query(Assignment).join(Unit).join(Property).filter(
-        Property.landlord_id == landlord_id
-    ).options(
-        joinedload(Assignment.unit).joinedload(Unit.property),
-        joinedload(Assignment.tenant)
+def get_active_assignments_for_units(db: Session, unit_ids: List[int]) -> List[Assignment]:
+    return db.query(Assignment).filter(
+        Assignment.unit_id.in_(unit_ids),
+        Assignment.is_active == True
     ).all()
-    
-    # Add computed fields
-    for assignment in assignments:
-        assignment.tenant_name = f"{assignment.tenant.first_name} {assignment.tenant.last_name}"
-        assignment.unit_info = f"{assignment.unit.unit_number}"
-        assignment.property_name = assignment.unit.property.name
-    
-    return assignments
+
+def get_active_assignment_for_unit(db: Session, unit_id: int) -> Optional[Assignment]:
+    return db.query(Assignment).filter(
+        Assignment.unit_id == unit_id,
+        Assignment.is_active == True
+    ).first()
+
+def _assignment_rows(db: Session):
+    # The AssignmentResponse columns with the display names joined in
+    return db.query(
+        Assignment.id,
+        Assignment.start_date,
+        Assignment.end_date,
+        Assignment.monthly_rent,
+        Assignment.security_deposit,
+        Assignment.payment_due_day,
+        Assignment.unit_id,
+        Assignment.tenant_id,
+        Assignment.is_active,
+        Assignment.created_at,
+        (User.first_name + " " + User.last_name).label("tenant_name"),
+        Unit.unit_number.label("unit_info"),
+        Property.name.label("property_name")
+    ).join(Unit, Unit.id == Assignment.unit_id).join(
+        Property, Property.id == Unit.property_id
+    ).join(User, User.id == Assignment.tenant_id)
+
+def get_assignments_by_tenant(
+    db: Session, tenant_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[dict], Optional[str]]:
+    query = _assignment_rows(db).filter(Assignment.tenant_id == tenant_id)
+    rows, next_cursor = paginate(query, Assignment, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+def get_assignments_by_landlord(
+    db: Session, landlord_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[dict], Optional[str]]:
+    query = _assignment_rows(db).filter(Property.landlord_id == landlord_id)
+    rows, next_cursor = paginate(query, Assignment, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+def _listing_tags(db: Session, unit: Unit, tenant_id: int) -> Tuple[str, ...]:
+    """Cached listings a lease change on ``unit`` shows up in."""
+    landlord_id = db.query(Property.landlord_id).filter(Property.id == unit.property_id).scalar()
+    return (
+        tag("units", unit.property_id),
+        tag("assignments", "tenant", tenant_id),
+        tag("assignments", "landlord", landlord_id),
+    )
 
 def end_assignment(db: Session, assignment_id: int) -> Optional[Assignment]:
     assignment = get_assignment_by_id(db, assignment_id)
@@ -84,8 +127,21 @@ def end_assignment(db: Session, assignment_id: int) -> Optional[Assignment]:
     # Update unit status to vacant
     unit = db.query(Unit).filter(Unit.id == assignment.unit_id).first()
     if unit:
+        adjust_property_stats(db, unit.property_id, occupied_delta=occupancy_delta(unit.status, UnitStatus.VACANT))
+        adjust_vacancies(db, unit.property_id, [unit], vacancy_delta(unit.status, UnitStatus.VACANT))
         unit.status = UnitStatus.VACANT
+        invalidate_on_commit(db, *_listing_tags(db, unit, assignment.tenant_id))
     
     db.commit()
     db.refresh(assignment)
-    return assignment
\ No newline at end of file
+    return assignment
+
+# Async variants for callers holding an AsyncSession
+create_assignment_async = run_async(create_assignment)
+get_assignment_by_id_async = run_async(get_assignment_by_id)
+get_assignments_by_ids_async = run_async(get_assignments_by_ids)
+get_active_assignments_for_units_async = run_async(get_active_assignments_for_units)
+get_active_assignment_for_unit_async = run_async(get_active_assignment_for_unit)
+get_assignments_by_tenant_async = run_async(get_assignments_by_tenant)
+get_assignments_by_landlord_async = run_async(get_assignments_by_landlord)
+end_assignment_async = run_async(end_assignment)
@@ -0,0 +1,229 @@
+# app/services/billing_service.py
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import case, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased
+
+from ..core.config import settings
+from ..core.response_cache import invalidate_on_commit, tag
+from ..models.payment import Payment, PaymentKind, PaymentStatus
+from ..models.assignment import Assignment
+from ..models.unit import Unit
+from ..models.property import Property
+from ..models.assignment_balance import AssignmentBalance
+from ..models.job_watermark import JobWatermark
+from .ledger_service import apply_inserted_payments, settle_charges
+from .dashboard_service import apply_inserted_payments_to_rollups
+
+# Watermarks: the latest due date each sweep step has processed
+OVERDUE_WATERMARK = "overdue_sweep"
+LATE_FEE_WATERMARK = "late_fees"
+
+def next_billing_month(today: Optional[date] = None) -> str:
+    """The ``for_month`` ("YYYY-MM") that invoices are raised for next."""
+    today = today or date.today()
+    year, month = (today.year + 1, 1) if today.month == 12 else (today.year, today.month + 1)
+    return f"{year:04d}-{month:02d}"
+
+def parse_billing_month(for_month: str) -> date:
+    """First day of a "YYYY-MM" month."""
+    try:
+        return datetime.strptime(for_month, "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"Invalid billing month '{for_month}', expected YYYY-MM")
+
+def period_bounds(from_month: Optional[str], to_month: Optional[str]) -> Tuple[Optional[date], Optional[date]]:
+    """First day of ``from_month`` and first day after ``to_month``, either may be open."""
+    start = parse_billing_month(from_month) if from_month else None
+    end = None
+    if to_month:
+        # Day 28 + 4 days always lands in the following month
+        end = (parse_billing_month(to_month).replace(day=28) + timedelta(days=4)).replace(day=1)
+    if start and end and start >= end:
+        raise ValueError("from_month must not be after to_month")
+    return start, end
+
+def _due_date(month_start: date):
+    """SQL expression for the lease's due date within the month.
+
+    ``payment_due_day`` past the end of a short month falls on its last day.
+    Spelled as a CASE over the possible days so it renders the same on
+    every backend, without dialect-specific date arithmetic.
+    """
+    last_day = calendar.monthrange(month_start.year, month_start.month)[1]
+    return case(
+        {day: month_start.replace(day=min(day, last_day)) for day in range(1, 32)},
+        value=Assignment.payment_due_day,
+        else_=month_start.replace(day=last_day)
+    )
+
+def generate_monthly_invoices(
+    db: Session, for_month: str, shard: int = 0, shards: int = 1, landlord_id: Optional[int] = None
+) -> int:
+    """Raise the month's PENDING rent charge for every active lease.
+
+    A single INSERT ... SELECT over the leases that run into the month and
+    don't have a charge for it yet, so reruns insert nothing new (the
+    partial unique index backs this up under concurrency). ``shard`` of
+    ``shards`` restricts the run to landlords with ``landlord_id % shards ==
+    shard`` so large portfolios can be split into smaller transactions or
+    across workers. Leases paid ahead have the new charge settled from
+    their credit. Returns the number of charges created.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"Shard {shard} is outside 0..{shards - 1}")
+    month_start = parse_billing_month(for_month)
+    month_end = month_start.replace(day=calendar.monthrange(month_start.year, month_start.month)[1])
+    now = datetime.utcnow()
+
+    already_invoiced = exists().where(
+        Payment.assignment_id == Assignment.id,
+        Payment.kind == PaymentKind.RENT,
+        Payment.for_month == for_month
+    )
+    leases = select(
+        Assignment.id,
+        Assignment.tenant_id,
+        Assignment.monthly_rent,
+        literal(PaymentStatus.PENDING, Payment.status.type),
+        literal(PaymentKind.RENT, Payment.kind.type),
+        literal(for_month),
+        literal(month_start.year),
+        literal(month_start, Payment.billing_period.type),
+        _due_date(month_start),
+        literal(f"Rent for {for_month}"),
+        literal(now, Payment.created_at.type),
+        literal(now, Payment.updated_at.type)
+    ).join(Unit, Unit.id == Assignment.unit_id).join(Property, Property.id == Unit.property_id).where(
+        Assignment.is_active == True,
+        Assignment.start_date <= month_end,
+        Assignment.end_date >= month_start,
+        ~already_invoiced
+    )
+    if shards > 1:
+        leases = leases.where(Property.landlord_id % shards == shard)
+    if landlord_id is not None:
+        leases = leases.where(Property.landlord_id == landlord_id)
+
+    result = db.execute(insert(Payment).from_select(
+        [
+            "assignment_id", "tenant_id", "amount", "status", "kind", "for_month", "for_year",
+            "billing_period", "due_date", "notes", "created_at", "updated_at"
+        ],
+        leases
+    ))
+    inserted = (Payment.kind == PaymentKind.RENT, Payment.for_month == for_month, Payment.created_at == now)
+    apply_inserted_payments(db, *inserted)
+    apply_inserted_payments_to_rollups(db, *inserted)
+    if result.rowcount:
+        # Leases paid ahead cover the new charge from their credit
+        charge = aliased(Payment)
+        settle_charges(db, select(charge.assignment_id).join(
+            AssignmentBalance, AssignmentBalance.assignment_id == charge.assignment_id
+        ).where(
+            charge.kind == PaymentKind.RENT, charge.for_month == for_month, charge.created_at == now,
+            AssignmentBalance.paid_total - AssignmentBalance.charged_total + charge.amount > 0.005
+        ), now=now)
+        # Charges land on every landlord at once; drop all payment listings
+        invalidate_on_commit(db, tag("payments"))
+    db.commit()
+    return result.rowcount
+
+def _get_watermark(db: Session, name: str) -> Optional[date]:
+    return db.query(JobWatermark.watermark).filter(JobWatermark.name == name).scalar()
+
+def _set_watermark(db: Session, name: str, watermark: date):
+    row = db.get(JobWatermark, name)
+    if row:
+        # A run for an earlier date never winds the watermark back
+        row.watermark = max(row.watermark, watermark)
+    else:
+        db.add(JobWatermark(name=name, watermark=watermark))
+
+def _due_between(after: Optional[date], before: date, payment=Payment):
+    """Charges that fell due after ``after`` (exclusive) and before ``before``."""
+    conditions = [payment.kind != PaymentKind.RECEIPT, payment.due_date < before]
+    if after is not None:
+        conditions.append(payment.due_date > after)
+    return conditions
+
+def sweep_overdue_payments(db: Session, as_of: Optional[date] = None) -> dict:
+    """Mark charges past their due date OVERDUE and raise late fees.
+
+    The leases of the charges a run looks at are settled first, so a charge
+    covered by the tenant's receipts is PAID and neither goes overdue nor
+    draws a fee. Each step is a single set-based statement bounded by a
+    due-date watermark, so a run only looks at charges that fell due since
+    the last one. The late fee (``LATE_FEE_FLAT`` plus ``LATE_FEE_PERCENT``
+    of the rent) is charged once per rent charge still overdue
+    ``LATE_FEE_GRACE_DAYS`` after its due date, due on ``as_of``.
+    Everything commits together, watermarks included.
+    """
+    as_of = as_of or date.today()
+    now = datetime.utcnow()
+
+    overdue_after = _get_watermark(db, OVERDUE_WATERMARK)
+    fee_after = _get_watermark(db, LATE_FEE_WATERMARK)
+    fee_before = as_of - timedelta(days=settings.LATE_FEE_GRACE_DAYS)
+
+    # Settle anything either step could pick up against the receipts on file
+    settle_after = None if overdue_after is None or fee_after is None else min(overdue_after, fee_after)
+    charge = aliased(Payment)
+    settle_charges(db, select(charge.assignment_id).where(
+        charge.status != PaymentStatus.PAID, *_due_between(settle_after, as_of, charge)
+    ), today=as_of, now=now)
+
+    # Due yesterday or earlier and still unpaid
+    overdue = db.execute(
+        update(Payment).where(
+            Payment.status.in_([PaymentStatus.PENDING, PaymentStatus.PARTIALLY_PAID]),
+            *_due_between(overdue_after, as_of)
+        ).values(status=PaymentStatus.OVERDUE, updated_at=now),
+        execution_options={"synchronize_session": False}
+    ).rowcount
+    _set_watermark(db, OVERDUE_WATERMARK, as_of - timedelta(days=1))
+
+    late_fees = 0
+    if settings.LATE_FEE_FLAT or settings.LATE_FEE_PERCENT:
+        fee = aliased(Payment)
+        already_charged = exists().where(
+            fee.assignment_id == Payment.assignment_id,
+            fee.kind == PaymentKind.LATE_FEE,
+            fee.for_month == Payment.for_month
+        )
+        charges = select(
+            Payment.assignment_id,
+            Payment.tenant_id,
+            func.round(settings.LATE_FEE_FLAT + Payment.amount * (settings.LATE_FEE_PERCENT / 100), 2),
+            literal(PaymentStatus.PENDING, Payment.status.type),
+            literal(PaymentKind.LATE_FEE, Payment.kind.type),
+            Payment.for_month,
+            Payment.for_year,
+            Payment.billing_period,
+            literal(as_of, Payment.due_date.type),
+            literal("Late fee"),
+            literal(now, Payment.created_at.type),
+            literal(now, Payment.updated_at.type)
+        ).where(
+            Payment.kind == PaymentKind.RENT,
+            Payment.status == PaymentStatus.OVERDUE,
+            *_due_between(fee_after, fee_before),
+            ~already_charged
+        )
+        late_fees = db.execute(insert(Payment).from_select(
+            [
+                "assignment_id", "tenant_id", "amount", "status", "kind", "for_month", "for_year",
+                "billing_period", "due_date", "notes", "created_at", "updated_at"
+            ],
+            charges
+        )).rowcount
+        apply_inserted_payments(db, Payment.kind == PaymentKind.LATE_FEE, Payment.created_at == now)
+    # Advanced even with fees off, so enabling them later doesn't bill history
+    _set_watermark(db, LATE_FEE_WATERMARK, fee_before - timedelta(days=1))
+
+    if overdue or late_fees:
+        invalidate_on_commit(db, tag("payments"))
+    db.commit()
+    return {"overdue": overdue, "late_fees": late_fees}
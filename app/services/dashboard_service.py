@@ -0,0 +1,330 @@
+# app/services/dashboard_service.py
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, bindparam, case, func, select
+from sqlalchemy.orm import Session
+
+from ..models.assignment import Assignment
+from ..models.landlord_stats import LandlordMonthlyStats, LandlordStats
+from ..models.maintenance import MaintenancePriority, MaintenanceRequest, MaintenanceStatus
+from ..models.payment import Payment, PaymentKind, PaymentStatus
+from ..models.property import Property
+from ..models.property_stats import PropertyStats
+from ..models.unit import Unit
+from ..models.user import User
+from ..core.database import run_async
+
+OPEN_STATUSES = (MaintenanceStatus.PENDING, MaintenanceStatus.IN_PROGRESS)
+
+# Counter column holding each priority's open requests
+OPEN_REQUEST_COLUMNS = {
+    MaintenancePriority.HIGH: "open_requests_high",
+    MaintenancePriority.MEDIUM: "open_requests_medium",
+    MaintenancePriority.LOW: "open_requests_low",
+}
+
+# Leases ending within this many days are listed as expiring
+EXPIRING_WITHIN_DAYS = 60
+EXPIRING_LIST_SIZE = 10
+
+def _landlord_of_unit(db: Session, unit_id: int) -> Optional[int]:
+    return db.scalar(
+        select(Property.landlord_id).join(Unit, Unit.property_id == Property.id).where(Unit.id == unit_id)
+    )
+
+def _landlord_of_assignment(db: Session, assignment_id: int) -> Optional[int]:
+    return db.scalar(
+        select(Property.landlord_id).join(Unit, Unit.property_id == Property.id).join(
+            Assignment, Assignment.unit_id == Unit.id
+        ).where(Assignment.id == assignment_id)
+    )
+
+def is_open(status: Optional[MaintenanceStatus]) -> bool:
+    return status in OPEN_STATUSES
+
+def _adjust_open_counts(db: Session, landlord_id: int, deltas: dict) -> None:
+    # One UPDATE for every counter column changing
+    values = {getattr(LandlordStats, name): getattr(LandlordStats, name) + delta for name, delta in deltas.items()}
+    updated = db.query(LandlordStats).filter(LandlordStats.landlord_id == landlord_id).update({
+        **values,
+        LandlordStats.updated_at: datetime.utcnow(),
+    }, synchronize_session=False)
+
+    if not updated:
+        # Landlord predates the rollup; seed it from the flushed requests
+        # and apply the pending change on top
+        for stats in rebuild_landlord_stats(db, landlord_id):
+            for name, delta in deltas.items():
+                setattr(stats, name, getattr(stats, name) + delta)
+
+def adjust_open_requests(db: Session, unit_id: int, priority: MaintenancePriority, delta: int) -> None:
+    """Change the open count for a request on ``unit_id``, in the caller's transaction."""
+    if not delta:
+        return
+    landlord_id = _landlord_of_unit(db, unit_id)
+    if landlord_id is None:
+        return
+
+    # Requests without a priority get the column default
+    _adjust_open_counts(db, landlord_id, {OPEN_REQUEST_COLUMNS[priority or MaintenancePriority.MEDIUM]: delta})
+
+def adjust_open_requests_many(db: Session, changes: dict) -> None:
+    """Apply ``{(unit_id, priority): delta}`` open count changes, one UPDATE per landlord.
+
+    A seeded stats row is pending until flushed, so each landlord must be
+    adjusted once per transaction step rather than once per unit.
+    """
+    changes = {key: delta for key, delta in changes.items() if delta}
+    if not changes:
+        return
+    landlords = dict(db.execute(
+        select(Unit.id, Property.landlord_id).join(Property, Property.id == Unit.property_id).where(
+            Unit.id.in_({unit_id for unit_id, _ in changes})
+        )
+    ).all())
+
+    deltas = {}
+    for (unit_id, priority), delta in changes.items():
+        if unit_id not in landlords:
+            continue
+        column = OPEN_REQUEST_COLUMNS[priority or MaintenancePriority.MEDIUM]
+        landlord_deltas = deltas.setdefault(landlords[unit_id], {})
+        landlord_deltas[column] = landlord_deltas.get(column, 0) + delta
+    for landlord_id, landlord_deltas in deltas.items():
+        _adjust_open_counts(db, landlord_id, landlord_deltas)
+
+def rebuild_landlord_stats(db: Session, landlord_id: Optional[int] = None) -> List[LandlordStats]:
+    """Recompute open request counters for one landlord, or all of them."""
+    counts = [
+        func.coalesce(func.sum(case((MaintenanceRequest.priority == priority, 1), else_=0)), 0)
+        for priority in OPEN_REQUEST_COLUMNS
+    ]
+    query = select(Property.landlord_id, *counts).join(Unit, Unit.property_id == Property.id).join(
+        MaintenanceRequest, MaintenanceRequest.unit_id == Unit.id
+    ).where(MaintenanceRequest.status.in_(OPEN_STATUSES)).group_by(Property.landlord_id)
+    if landlord_id is not None:
+        query = query.where(Property.landlord_id == landlord_id)
+
+    rows = {row[0]: row[1:] for row in db.execute(query).all()}
+    if landlord_id is not None:
+        rows.setdefault(landlord_id, (0,) * len(OPEN_REQUEST_COLUMNS))
+
+    with db.no_autoflush:
+        return [
+            db.merge(LandlordStats(landlord_id=lid, **dict(zip(OPEN_REQUEST_COLUMNS.values(), values))))
+            for lid, values in rows.items()
+        ]
+
+def _rollup_amounts():
+    """(expected, collected) contributions of a payments row, as SQL expressions."""
+    expected = case((Payment.kind == PaymentKind.RENT, Payment.amount), else_=0.0)
+    collected = case(
+        ((Payment.kind == PaymentKind.RECEIPT) & (Payment.status == PaymentStatus.PAID), Payment.amount),
+        else_=0.0
+    )
+    return expected, collected
+
+def rent_delta(payment: Payment, old_status: Optional[PaymentStatus] = None) -> tuple:
+    """(expected, collected) change from recording ``payment``, or from
+    moving it out of ``old_status`` into its current status."""
+    if payment.kind == PaymentKind.RENT:
+        return (payment.amount if old_status is None else 0.0), 0.0
+    if payment.kind == PaymentKind.RECEIPT:
+        was_paid = old_status == PaymentStatus.PAID
+        is_paid = payment.status == PaymentStatus.PAID
+        return 0.0, payment.amount * (is_paid - was_paid)
+    return 0.0, 0.0
+
+def adjust_monthly_stats(
+    db: Session, assignment_id: int, for_month: str, expected_delta: float = 0.0, collected_delta: float = 0.0
+) -> None:
+    """Change the month's rent totals for the lease's landlord, in the caller's transaction."""
+    if not expected_delta and not collected_delta:
+        return
+    landlord_id = _landlord_of_assignment(db, assignment_id)
+    if landlord_id is None:
+        return
+
+    updated = db.query(LandlordMonthlyStats).filter(
+        LandlordMonthlyStats.landlord_id == landlord_id,
+        LandlordMonthlyStats.for_month == for_month
+    ).update({
+        LandlordMonthlyStats.expected_rent: LandlordMonthlyStats.expected_rent + expected_delta,
+        LandlordMonthlyStats.collected_rent: LandlordMonthlyStats.collected_rent + collected_delta,
+        LandlordMonthlyStats.updated_at: datetime.utcnow(),
+    }, synchronize_session=False)
+
+    if not updated:
+        for stats in rebuild_monthly_stats(db, landlord_id, for_month):
+            stats.expected_rent += expected_delta
+            stats.collected_rent += collected_delta
+
+def rebuild_monthly_stats(
+    db: Session, landlord_id: Optional[int] = None, for_month: Optional[str] = None
+) -> List[LandlordMonthlyStats]:
+    """Recompute rent totals from the flushed payments table, optionally for one landlord and month."""
+    expected, collected = _rollup_amounts()
+    query = select(
+        Property.landlord_id, Payment.for_month, func.sum(expected), func.sum(collected)
+    ).select_from(Payment).join(Assignment, Assignment.id == Payment.assignment_id).join(
+        Unit, Unit.id == Assignment.unit_id
+    ).join(Property, Property.id == Unit.property_id).group_by(Property.landlord_id, Payment.for_month)
+    if landlord_id is not None:
+        query = query.where(Property.landlord_id == landlord_id)
+    if for_month is not None:
+        query = query.where(Payment.for_month == for_month)
+
+    rows = {(row[0], row[1]): row[2:] for row in db.execute(query).all()}
+    if landlord_id is not None and for_month is not None:
+        rows.setdefault((landlord_id, for_month), (0.0, 0.0))
+
+    with db.no_autoflush:
+        return [
+            db.merge(LandlordMonthlyStats(
+                landlord_id=lid, for_month=month, expected_rent=expected_rent, collected_rent=collected_rent
+            ))
+            for (lid, month), (expected_rent, collected_rent) in rows.items()
+        ]
+
+def apply_inserted_payments_to_rollups(db: Session, *conditions) -> None:
+    """Add payments just written by a bulk INSERT to the monthly rent totals.
+
+    ``conditions`` must match exactly the inserted rows. Their amounts are
+    summed per landlord and month in one grouped SELECT and applied with one
+    executemany UPDATE; months a landlord has no totals for yet start at
+    zero (existing history is backfilled by the migration).
+    """
+    expected, collected = _rollup_amounts()
+    totals = db.execute(
+        select(Property.landlord_id, Payment.for_month, func.sum(expected), func.sum(collected)).select_from(
+            Payment
+        ).join(Assignment, Assignment.id == Payment.assignment_id).join(Unit, Unit.id == Assignment.unit_id).join(
+            Property, Property.id == Unit.property_id
+        ).where(*conditions).group_by(Property.landlord_id, Payment.for_month)
+    ).all()
+    if not totals:
+        return
+
+    table = LandlordMonthlyStats.__table__
+    existing = set(db.execute(
+        select(table.c.landlord_id, table.c.for_month).where(
+            table.c.landlord_id.in_({landlord_id for landlord_id, _, _, _ in totals}),
+            table.c.for_month.in_({for_month for _, for_month, _, _ in totals})
+        )
+    ).all())
+    now = datetime.utcnow()
+    missing = [
+        {"landlord_id": landlord_id, "for_month": for_month, "expected_rent": 0.0, "collected_rent": 0.0, "updated_at": now}
+        for landlord_id, for_month, _, _ in totals if (landlord_id, for_month) not in existing
+    ]
+    if missing:
+        db.execute(table.insert(), missing)
+
+    db.execute(
+        table.update().where(
+            table.c.landlord_id == bindparam("b_landlord_id"),
+            table.c.for_month == bindparam("b_for_month")
+        ).values(
+            expected_rent=table.c.expected_rent + bindparam("b_expected"),
+            collected_rent=table.c.collected_rent + bindparam("b_collected"),
+            updated_at=now
+        ),
+        [
+            {"b_landlord_id": landlord_id, "b_for_month": for_month, "b_expected": expected_rent, "b_collected": collected_rent}
+            for landlord_id, for_month, expected_rent, collected_rent in totals
+        ]
+    )
+
+def _previous_month(for_month: str) -> str:
+    first = datetime.strptime(for_month, "%Y-%m").date()
+    return (first - timedelta(days=1)).strftime("%Y-%m")
+
+def get_landlord_dashboard(db: Session, landlord_id: int, today: Optional[date] = None) -> dict:
+    """Everything the landlord home screen shows, read from the rollup tables.
+
+    Occupancy sums the landlord's property_stats rows, rent and maintenance
+    come from one landlord row each, and expiring leases are a bounded
+    indexed lookup.
+    """
+    today = today or date.today()
+    current_month = today.strftime("%Y-%m")
+    months = [current_month, _previous_month(current_month)]
+
+    properties, units, occupied = db.execute(
+        select(
+            func.count(Property.id),
+            func.coalesce(func.sum(PropertyStats.units_count), 0),
+            func.coalesce(func.sum(PropertyStats.occupied_units), 0)
+        ).select_from(Property).outerjoin(PropertyStats, PropertyStats.property_id == Property.id).where(
+            Property.landlord_id == landlord_id
+        )
+    ).one()
+
+    monthly = {
+        stats.for_month: stats
+        for stats in db.scalars(select(LandlordMonthlyStats).where(
+            LandlordMonthlyStats.landlord_id == landlord_id,
+            LandlordMonthlyStats.for_month.in_(months)
+        ))
+    }
+    rent = []
+    for for_month in months:
+        stats = monthly.get(for_month)
+        expected_rent = stats.expected_rent if stats else 0.0
+        collected_rent = stats.collected_rent if stats else 0.0
+        rent.append({
+            "for_month": for_month,
+            "expected": round(expected_rent, 2),
+            "collected": round(collected_rent, 2),
+            "outstanding": round(max(expected_rent - collected_rent, 0.0), 2),
+        })
+
+    open_stats = db.get(LandlordStats, landlord_id)
+    open_maintenance = {
+        priority.name.lower(): getattr(open_stats, column) if open_stats else 0
+        for priority, column in OPEN_REQUEST_COLUMNS.items()
+    }
+
+    expiring = and_(
+        Property.landlord_id == landlord_id,
+        Assignment.is_active == True,
+        Assignment.end_date >= today,
+        Assignment.end_date <= today + timedelta(days=EXPIRING_WITHIN_DAYS)
+    )
+    leases = select(Assignment).join(Unit, Unit.id == Assignment.unit_id).join(Property, Property.id == Unit.property_id)
+    expiring_count = db.scalar(leases.with_only_columns(func.count()).where(expiring))
+    expiring_rows = db.execute(
+        leases.add_columns(User.first_name, User.last_name, Unit.unit_number, Property.name).join(
+            User, User.id == Assignment.tenant_id
+        ).where(expiring).order_by(Assignment.end_date, Assignment.id).limit(EXPIRING_LIST_SIZE)
+    ).all()
+
+    return {
+        "occupancy": {
+            "properties": properties,
+            "units": units,
+            "occupied_units": occupied,
+            "occupancy_rate": round(occupied / units, 4) if units else 0.0,
+        },
+        "rent": rent,
+        "open_maintenance": open_maintenance,
+        "expiring_leases": {
+            "within_days": EXPIRING_WITHIN_DAYS,
+            "count": expiring_count,
+            "items": [
+                {
+                    "assignment_id": assignment.id,
+                    "tenant_name": f"{first_name} {last_name}",
+                    "unit_info": unit_number,
+                    "property_name": property_name,
+                    "end_date": assignment.end_date,
+                    "monthly_rent": assignment.monthly_rent,
+                }
+                for assignment, first_name, last_name, unit_number, property_name in expiring_rows
+            ],
+        },
+    }
+
+# Async variants for callers holding an AsyncSession
+get_landlord_dashboard_async = run_async(get_landlord_dashboard)
@@ -0,0 +1,130 @@
+# app/services/export_service.py
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import aliased
+
+from ..models.assignment import Assignment
+from ..models.maintenance import MaintenanceRequest
+from ..models.payment import Payment
+from ..models.property import Property
+from ..models.unit import Unit
+from ..models.user import User
+from .billing_service import period_bounds
+
+# Property by property, unit by unit, matching the landlord and unit indexes
+EXPORT_ORDER = (Property.created_at, Property.id, Unit.created_at, Unit.id)
+
+def _scoped(statement: Select, landlord_id: Optional[int], property_id: Optional[int]) -> Select:
+    if landlord_id is not None:
+        statement = statement.where(Property.landlord_id == landlord_id)
+    if property_id is not None:
+        statement = statement.where(Property.id == property_id)
+    return statement
+
+def payments_export_query(
+    landlord_id: Optional[int] = None, property_id: Optional[int] = None,
+    from_month: Optional[str] = None, to_month: Optional[str] = None
+) -> Select:
+    """Payments (receipts and charges) by billing month."""
+    start, end = period_bounds(from_month, to_month)
+    tenant = aliased(User)
+    statement = select(
+        Payment.id,
+        Payment.for_month,
+        Payment.kind,
+        Payment.status,
+        Payment.amount,
+        Payment.due_date,
+        Payment.payment_date,
+        Payment.mpesa_reference,
+        Payment.assignment_id,
+        Payment.tenant_id,
+        (tenant.first_name + " " + tenant.last_name).label("tenant_name"),
+        Unit.unit_number,
+        Property.id.label("property_id"),
+        Property.name.label("property_name"),
+        Payment.notes,
+        Payment.created_at,
+    ).join(Assignment, Assignment.id == Payment.assignment_id).join(
+        Unit, Unit.id == Assignment.unit_id
+    ).join(
+        Property, Property.id == Unit.property_id
+    ).join(
+        tenant, tenant.id == Payment.tenant_id
+    )
+    if start:
+        statement = statement.where(Payment.billing_period >= start)
+    if end:
+        statement = statement.where(Payment.billing_period < end)
+    return _scoped(statement, landlord_id, property_id).order_by(
+        *EXPORT_ORDER, Payment.assignment_id, Payment.created_at, Payment.id
+    )
+
+def assignments_export_query(
+    landlord_id: Optional[int] = None, property_id: Optional[int] = None,
+    from_month: Optional[str] = None, to_month: Optional[str] = None
+) -> Select:
+    """Leases running at any point in the period."""
+    start, end = period_bounds(from_month, to_month)
+    tenant = aliased(User)
+    statement = select(
+        Assignment.id,
+        Assignment.start_date,
+        Assignment.end_date,
+        Assignment.monthly_rent,
+        Assignment.security_deposit,
+        Assignment.payment_due_day,
+        Assignment.is_active,
+        Assignment.tenant_id,
+        (tenant.first_name + " " + tenant.last_name).label("tenant_name"),
+        Assignment.unit_id,
+        Unit.unit_number,
+        Property.id.label("property_id"),
+        Property.name.label("property_name"),
+        Assignment.created_at,
+    ).join(Unit, Unit.id == Assignment.unit_id).join(
+        Property, Property.id == Unit.property_id
+    ).join(
+        tenant, tenant.id == Assignment.tenant_id
+    )
+    if start:
+        statement = statement.where(Assignment.end_date >= start)
+    if end:
+        statement = statement.where(Assignment.start_date < end)
+    return _scoped(statement, landlord_id, property_id).order_by(*EXPORT_ORDER, Assignment.created_at, Assignment.id)
+
+def maintenance_export_query(
+    landlord_id: Optional[int] = None, property_id: Optional[int] = None,
+    from_month: Optional[str] = None, to_month: Optional[str] = None
+) -> Select:
+    """Maintenance requests raised in the period."""
+    start, end = period_bounds(from_month, to_month)
+    tenant = aliased(User)
+    statement = select(
+        MaintenanceRequest.id,
+        MaintenanceRequest.issue_type,
+        MaintenanceRequest.description,
+        MaintenanceRequest.status,
+        MaintenanceRequest.priority,
+        MaintenanceRequest.tenant_id,
+        (tenant.first_name + " " + tenant.last_name).label("tenant_name"),
+        MaintenanceRequest.unit_id,
+        Unit.unit_number,
+        Property.id.label("property_id"),
+        Property.name.label("property_name"),
+        MaintenanceRequest.created_at,
+        MaintenanceRequest.resolved_at,
+    ).join(Unit, Unit.id == MaintenanceRequest.unit_id).join(
+        Property, Property.id == Unit.property_id
+    ).join(
+        tenant, tenant.id == MaintenanceRequest.tenant_id
+    )
+    if start:
+        statement = statement.where(MaintenanceRequest.created_at >= datetime.combine(start, datetime.min.time()))
+    if end:
+        statement = statement.where(MaintenanceRequest.created_at < datetime.combine(end, datetime.min.time()))
+    return _scoped(statement, landlord_id, property_id).order_by(
+        *EXPORT_ORDER, MaintenanceRequest.created_at, MaintenanceRequest.id
+    )
@@ -0,0 +1,196 @@
+# app/services/ledger_service.py
+from datetime import date, datetime
+from typing import List, Optional
+
+from sqlalchemy import and_, case, exists, func, insert, literal, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from ..models.assignment import Assignment
+from ..models.assignment_balance import AssignmentBalance
+from ..models.payment import Payment, PaymentKind, PaymentStatus
+from ..models.unit import Unit
+from ..models.property import Property
+from ..models.user import User
+from ..core.database import run_async
+
+def _ledger_amounts():
+    """(charged, paid) contributions of a payments row, as SQL expressions."""
+    charged = case((Payment.kind != PaymentKind.RECEIPT, Payment.amount), else_=0.0)
+    paid = case(
+        ((Payment.kind == PaymentKind.RECEIPT) & (Payment.status == PaymentStatus.PAID), Payment.amount),
+        else_=0.0
+    )
+    return charged, paid
+
+def ledger_delta(payment: Payment, old_status: Optional[PaymentStatus] = None) -> tuple:
+    """(charged, paid) change from recording ``payment``, or from moving it
+    out of ``old_status`` into its current status."""
+    if payment.kind != PaymentKind.RECEIPT:
+        return (0.0 if old_status is not None else payment.amount), 0.0
+    was_paid = old_status == PaymentStatus.PAID
+    is_paid = payment.status == PaymentStatus.PAID
+    return 0.0, payment.amount * (is_paid - was_paid)
+
+def adjust_balance(db: Session, assignment_id: int, charged_delta: float = 0.0, paid_delta: float = 0.0) -> None:
+    """Apply a change to the lease's stored totals as part of the caller's transaction."""
+    if not charged_delta and not paid_delta:
+        return
+
+    updated = db.query(AssignmentBalance).filter(AssignmentBalance.assignment_id == assignment_id).update({
+        AssignmentBalance.charged_total: AssignmentBalance.charged_total + charged_delta,
+        AssignmentBalance.paid_total: AssignmentBalance.paid_total + paid_delta,
+        AssignmentBalance.updated_at: datetime.utcnow(),
+    }, synchronize_session=False)
+
+    if not updated:
+        # Lease predates the ledger; seed it from its payments and apply
+        # the pending change on top
+        for ledger in rebuild_balances(db, assignment_id):
+            ledger.charged_total += charged_delta
+            ledger.paid_total += paid_delta
+
+def _history_totals():
+    charged, paid = _ledger_amounts()
+    return select(
+        Assignment.id,
+        func.coalesce(func.sum(charged), 0.0),
+        func.coalesce(func.sum(paid), 0.0)
+    ).select_from(Assignment).outerjoin(Payment, Payment.assignment_id == Assignment.id).group_by(Assignment.id)
+
+def rebuild_balances(db: Session, assignment_id: Optional[int] = None) -> List[AssignmentBalance]:
+    """Recompute totals from the flushed payments table for one lease, or all of them."""
+    query = _history_totals()
+    if assignment_id is not None:
+        query = query.where(Assignment.id == assignment_id)
+
+    with db.no_autoflush:
+        return [
+            db.merge(AssignmentBalance(assignment_id=aid, charged_total=charged, paid_total=paid))
+            for aid, charged, paid in db.execute(query).all()
+        ]
+
+def apply_inserted_payments(db: Session, *conditions) -> None:
+    """Add payments just written by a bulk INSERT to their leases' totals.
+
+    ``conditions`` must match exactly the inserted rows (e.g. the run's
+    created_at stamp plus its kind and month). One UPDATE adds them to the
+    existing ledgers; leases without a ledger row yet are seeded from their
+    whole history, which already includes the new rows.
+    """
+    charged, paid = _ledger_amounts()
+    new_rows = select(Payment.assignment_id).where(*conditions)
+
+    def new_totals(amount):
+        return select(func.coalesce(func.sum(amount), 0.0)).where(
+            Payment.assignment_id == AssignmentBalance.assignment_id, *conditions
+        ).scalar_subquery()
+
+    db.execute(
+        update(AssignmentBalance).where(AssignmentBalance.assignment_id.in_(new_rows)).values(
+            charged_total=AssignmentBalance.charged_total + new_totals(charged),
+            paid_total=AssignmentBalance.paid_total + new_totals(paid),
+            updated_at=datetime.utcnow()
+        ),
+        execution_options={"synchronize_session": False}
+    )
+    missing = _history_totals().where(
+        Assignment.id.in_(new_rows),
+        ~exists().where(AssignmentBalance.assignment_id == Assignment.id)
+    )
+    db.execute(insert(AssignmentBalance).from_select(["assignment_id", "charged_total", "paid_total"], missing))
+
+def settle_charges(db: Session, leases, today: Optional[date] = None, now: Optional[datetime] = None) -> int:
+    """Bring the status of the leases' charges in line with their PAID receipts.
+
+    Receipts aren't tied to a charge: each lease's ``paid_total`` is applied
+    to its charges oldest due date first. A covered charge is PAID, the one
+    the money runs out on PARTIALLY_PAID, and the rest stay PENDING or
+    OVERDUE. A PAID charge left short by a reversed receipt is PENDING or
+    PARTIALLY_PAID again, or OVERDUE once past due. ``leases`` is a list of
+    assignment ids or a select of them (alias Payment in it, or it is
+    correlated to the UPDATE). One UPDATE that only touches charges whose
+    status changes, stamped with the caller's ``now``; call it after the
+    ledger is adjusted and flushed. Returns the number of charges changed.
+    """
+    today = today or date.today()
+    now = now or datetime.utcnow()
+    earlier = aliased(Payment)
+    charged_before = select(func.coalesce(func.sum(earlier.amount), 0.0)).where(
+        earlier.assignment_id == Payment.assignment_id,
+        earlier.kind != PaymentKind.RECEIPT,
+        or_(earlier.due_date < Payment.due_date, and_(earlier.due_date == Payment.due_date, earlier.id < Payment.id))
+    ).scalar_subquery()
+    paid = func.coalesce(
+        select(AssignmentBalance.paid_total).where(
+            AssignmentBalance.assignment_id == Payment.assignment_id
+        ).scalar_subquery(),
+        0.0
+    )
+
+    def status(value: PaymentStatus):
+        return literal(value, Payment.status.type)
+
+    settled = case(
+        (paid >= charged_before + Payment.amount - 0.005, status(PaymentStatus.PAID)),
+        (Payment.status == PaymentStatus.OVERDUE, status(PaymentStatus.OVERDUE)),
+        # The sweep passed over it while it was PAID, so it is overdue now
+        ((Payment.status == PaymentStatus.PAID) & (Payment.due_date < today), status(PaymentStatus.OVERDUE)),
+        (paid > charged_before + 0.005, status(PaymentStatus.PARTIALLY_PAID)),
+        else_=status(PaymentStatus.PENDING)
+    )
+    return db.execute(
+        update(Payment).where(
+            Payment.assignment_id.in_(leases),
+            Payment.kind != PaymentKind.RECEIPT,
+            Payment.status != settled
+        ).values(status=settled, updated_at=now),
+        execution_options={"synchronize_session": False}
+    ).rowcount
+
+def get_balance(db: Session, assignment_id: int) -> Optional[AssignmentBalance]:
+    ledger = db.get(AssignmentBalance, assignment_id)
+    if ledger is None and db.get(Assignment, assignment_id) is not None:
+        ledger = rebuild_balances(db, assignment_id)[0]
+        db.commit()
+    return ledger
+
+def get_arrears_report(db: Session, landlord_id: int, limit: int) -> dict:
+    """Leases of a landlord that owe money, largest balance first, with totals.
+
+    Reads only the stored ledger rows of the landlord's leases.
+    """
+    owed = AssignmentBalance.charged_total - AssignmentBalance.paid_total
+    in_arrears = select(AssignmentBalance).join(
+        Assignment, Assignment.id == AssignmentBalance.assignment_id
+    ).join(Unit, Unit.id == Assignment.unit_id).join(Property, Property.id == Unit.property_id).where(
+        Property.landlord_id == landlord_id,
+        owed > 0.005
+    )
+
+    totals = in_arrears.with_only_columns(func.count(), func.coalesce(func.sum(owed), 0.0))
+    leases, total_arrears = db.execute(totals).one()
+
+    rows = db.execute(
+        in_arrears.with_only_columns(
+            AssignmentBalance, Assignment.tenant_id, User.first_name, User.last_name, Unit.unit_number, Property.name
+        ).join(User, User.id == Assignment.tenant_id).order_by(owed.desc(), AssignmentBalance.assignment_id).limit(limit)
+    ).all()
+
+    items = [
+        {
+            "assignment_id": ledger.assignment_id,
+            "tenant_id": tenant_id,
+            "tenant_name": f"{first_name} {last_name}",
+            "unit_info": unit_number,
+            "property_name": property_name,
+            "charged_total": ledger.charged_total,
+            "paid_total": ledger.paid_total,
+            "balance": ledger.balance,
+        }
+        for ledger, tenant_id, first_name, last_name, unit_number, property_name in rows
+    ]
+    return {"leases_in_arrears": leases, "total_arrears": round(total_arrears, 2), "items": items}
+
+# Async variants for callers holding an AsyncSession
+get_balance_async = run_async(get_balance)
+get_arrears_report_async = run_async(get_arrears_report)
@@ -1,12 +1,32 @@
 # app/services/maintenance_service.py
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, update
+from typing import List, Optional, Set, Tuple
 from datetime import datetime
-from ..models.maintenance import MaintenanceRequest, MaintenanceStatus
+from ..models.maintenance import MaintenanceRequest, MaintenancePriority, MaintenanceStatus
 from ..models.unit import Unit
 from ..models.property import Property
 from ..models.user import User
 from ..schemas.maintenance import MaintenanceRequestCreate
+from ..core.pagination import paginate, DEFAULT_PAGE_SIZE
+from ..core.database import run_async
+from ..core.response_cache import invalidate_on_commit, tag
+from .dashboard_service import adjust_open_requests, adjust_open_requests_many, is_open
+
+# Work queue order: by priority, then oldest first within each one
+QUEUE_PRIORITIES = (MaintenancePriority.HIGH, MaintenancePriority.MEDIUM, MaintenancePriority.LOW)
+DEFAULT_QUEUE_SIZE = 10
+MAX_QUEUE_SIZE = 100
+
+def _listing_tags(db: Session, requests: List[Tuple[int, int]]) -> Set[str]:
+    """Cached listings showing requests on these (unit_id, tenant_id) pairs."""
+    unit_ids = {unit_id for unit_id, _ in requests}
+    landlord_ids = db.query(Property.landlord_id).join(
+        Unit, Unit.property_id == Property.id
+    ).filter(Unit.id.in_(unit_ids)).distinct()
+    return {tag("maintenance", "tenant", tenant_id) for _, tenant_id in requests} | {
+        tag("maintenance", "landlord", landlord_id) for landlord_id, in landlord_ids
+    }
 
 def create_maintenance_request(db: Session, request: MaintenanceRequestCreate, tenant_id: int) -> MaintenanceRequest:
     db_request = MaintenanceRequest(
@@ -14,55 +34,166 @@ def create_maintenance_request(db: Session, request: MaintenanceRequestCreate, t
         tenant_id=tenant_id,
         status=MaintenanceStatus.PENDING
     )
+    adjust_open_requests(db, db_request.unit_id, request.priority, 1)
+    invalidate_on_commit(db, *_listing_tags(db, [(db_request.unit_id, tenant_id)]))
     db.add(db_request)
     db.commit()
     db.refresh(db_request)
     return db_request
 
-def get_maintenance_request_by_id(db: Session, request_id: int) -> Optional[MaintenanceRequest]:
-    return db.query(MaintenanceRequest).filter(MaintenanceRequest.id == request_id).first()
-
-def get_maintenance_requests_by_tenant(db: Session, tenant_id: int) -> List[MaintenanceRequest]:
-    requests = db.query(MaintenanceRequest).filter(
-        MaintenanceRequest.tenant_id == tenant_id
-    ).options(
-        joinedload(MaintenanceRequest.unit).joinedload(Unit.property)
-    ).all()
+def create_maintenance_requests(
+    db: Session, requests: List[MaintenanceRequestCreate], tenant_id: int
+) -> List[MaintenanceRequest]:
+    """Insert many requests in one statement and one transaction."""
+    if not requests:
+        return []
     
-    # Add computed fields
+    opened = {}
     for request in requests:
-        tenant = db.query(User).filter(User.id == request.tenant_id).first()
-        request.tenant_name = f"{tenant.first_name} {tenant.last_name}"
-        request.unit_info = f"{request.unit.unit_number}"
-        request.property_name = request.unit.property.name
-    
-    return requests
-
-def get_maintenance_requests_by_landlord(db: Session, landlord_id: int) -> List[MaintenanceRequest]:
-    requests = db.query(MaintenanceRequest).join(Unit).join(Property).filter(
-        Property.landlord_id == landlord_id
-    ).options(
-        joinedload(MaintenanceRequest.unit).joinedload(Unit.property),
-        joinedload(MaintenanceRequest.tenant)
-    ).all()
+        opened[(request.unit_id, request.priority)] = opened.get((request.unit_id, request.priority), 0) + 1
+    adjust_open_requests_many(db, opened)
     
-    # Add computed fields
-    for request in requests:
-        request.tenant_name = f"{request.tenant.first_name} {request.tenant.last_name}"
-        request.unit_info = f"{request.unit.unit_number}"
-        request.property_name = request.unit.property.name
-    
-    return requests
+    db_requests = list(db.scalars(
+        insert(MaintenanceRequest).returning(MaintenanceRequest),
+        [dict(request.dict(), tenant_id=tenant_id, status=MaintenanceStatus.PENDING) for request in requests]
+    ))
+    invalidate_on_commit(db, *_listing_tags(db, [(request.unit_id, tenant_id) for request in requests]))
+    db.commit()
+    return db_requests
+
+def get_maintenance_request_by_id(db: Session, request_id: int) -> Optional[MaintenanceRequest]:
+    return db.query(MaintenanceRequest).filter(MaintenanceRequest.id == request_id).first()
+
+def _maintenance_rows(db: Session):
+    # The MaintenanceRequestResponse columns with the display names joined in
+    return db.query(
+        MaintenanceRequest.id,
+        MaintenanceRequest.issue_type,
+        MaintenanceRequest.description,
+        MaintenanceRequest.priority,
+        MaintenanceRequest.unit_id,
+        MaintenanceRequest.tenant_id,
+        MaintenanceRequest.status,
+        MaintenanceRequest.resolved_at,
+        MaintenanceRequest.claimed_by,
+        MaintenanceRequest.claimed_at,
+        MaintenanceRequest.created_at,
+        (User.first_name + " " + User.last_name).label("tenant_name"),
+        Unit.unit_number.label("unit_info"),
+        Property.name.label("property_name")
+    ).join(Unit, Unit.id == MaintenanceRequest.unit_id).join(
+        Property, Property.id == Unit.property_id
+    ).join(User, User.id == MaintenanceRequest.tenant_id)
+
+def get_maintenance_requests_by_tenant(
+    db: Session, tenant_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[dict], Optional[str]]:
+    query = _maintenance_rows(db).filter(MaintenanceRequest.tenant_id == tenant_id)
+    rows, next_cursor = paginate(query, MaintenanceRequest, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+def get_maintenance_requests_by_landlord(
+    db: Session, landlord_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[dict], Optional[str]]:
+    query = _maintenance_rows(db).filter(Property.landlord_id == landlord_id)
+    rows, next_cursor = paginate(query, MaintenanceRequest, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
 
 def update_maintenance_status(db: Session, request_id: int, status: MaintenanceStatus) -> Optional[MaintenanceRequest]:
     request = get_maintenance_request_by_id(db, request_id)
     if not request:
         return None
     
+    adjust_open_requests(db, request.unit_id, request.priority, is_open(status) - is_open(request.status))
     request.status = status
     if status == MaintenanceStatus.COMPLETED:
         request.resolved_at = datetime.utcnow()
+    if status == MaintenanceStatus.PENDING:
+        # Back on the work queue for anyone to claim
+        request.claimed_by = request.claimed_at = None
     
+    invalidate_on_commit(db, *_listing_tags(db, [(request.unit_id, request.tenant_id)]))
     db.commit()
     db.refresh(request)
     return request
+
+def _queued(priority: MaintenancePriority, landlord_id: Optional[int]):
+    """Pending requests of one priority, oldest first, straight off ix_maintenance_queue."""
+    statement = select(MaintenanceRequest.id).where(
+        MaintenanceRequest.status == MaintenanceStatus.PENDING,
+        MaintenanceRequest.priority == priority
+    ).order_by(MaintenanceRequest.created_at, MaintenanceRequest.id)
+    if landlord_id is not None:
+        # A subquery rather than a join, so FOR UPDATE locks only the requests
+        statement = statement.where(MaintenanceRequest.unit_id.in_(
+            select(Unit.id).join(Property, Property.id == Unit.property_id).where(Property.landlord_id == landlord_id)
+        ))
+    return statement
+
+def _queue_rows(db: Session, request_ids: List[int]) -> List[dict]:
+    rows = {row.id: row._asdict() for row in _maintenance_rows(db).filter(MaintenanceRequest.id.in_(request_ids))}
+    return [rows[request_id] for request_id in request_ids if request_id in rows]
+
+def get_maintenance_queue(db: Session, landlord_id: Optional[int] = None, limit: int = DEFAULT_QUEUE_SIZE) -> List[dict]:
+    """The next ``limit`` pending requests by priority and age, without claiming them.
+
+    One index-ordered read per priority, stopping once ``limit`` are found,
+    instead of sorting every open request.
+    """
+    request_ids = []
+    for priority in QUEUE_PRIORITIES:
+        if len(request_ids) >= limit:
+            break
+        request_ids += db.scalars(_queued(priority, landlord_id).limit(limit - len(request_ids))).all()
+    return _queue_rows(db, request_ids)
+
+def claim_maintenance_requests(
+    db: Session, claimed_by: int, landlord_id: Optional[int] = None, limit: int = 1
+) -> List[dict]:
+    """Move up to ``limit`` of the next pending requests to IN_PROGRESS for ``claimed_by``.
+
+    Each priority is claimed with one UPDATE over the head of its queue.
+    On PostgreSQL the head is selected FOR UPDATE SKIP LOCKED, so
+    concurrent claimers take different requests without waiting on each
+    other. SQLite has no row locks and drops the clause; there the UPDATE
+    runs under the database write lock, so claimers queue for it and each
+    one reads the queue as the previous claim left it. Either way the
+    ``status == PENDING`` recheck means a request is only ever claimed once.
+    Returns the claimed requests in queue order; empty when there is no work.
+    """
+    now = datetime.utcnow()
+    claimed = []
+    for priority in QUEUE_PRIORITIES:
+        if len(claimed) >= limit:
+            break
+        head = _queued(priority, landlord_id).limit(limit - len(claimed)).with_for_update(skip_locked=True)
+        claimed += db.execute(
+            update(MaintenanceRequest).where(
+                MaintenanceRequest.id.in_(head),
+                MaintenanceRequest.status == MaintenanceStatus.PENDING
+            ).values(
+                status=MaintenanceStatus.IN_PROGRESS, claimed_by=claimed_by, claimed_at=now, updated_at=now
+            ).returning(MaintenanceRequest.id, MaintenanceRequest.unit_id, MaintenanceRequest.tenant_id),
+            execution_options={"synchronize_session": False}
+        ).all()
+    
+    # Both statuses count as open, so the landlord rollups are unchanged
+    if claimed:
+        invalidate_on_commit(db, *_listing_tags(db, [(row.unit_id, row.tenant_id) for row in claimed]))
+    db.commit()
+    # RETURNING comes back in no particular order
+    order = {priority: rank for rank, priority in enumerate(QUEUE_PRIORITIES)}
+    return sorted(
+        _queue_rows(db, [row.id for row in claimed]),
+        key=lambda row: (order[row["priority"]], row["created_at"], row["id"])
+    )
+
+# Async variants for callers holding an AsyncSession
+create_maintenance_request_async = run_async(create_maintenance_request)
+create_maintenance_requests_async = run_async(create_maintenance_requests)
+get_maintenance_request_by_id_async = run_async(get_maintenance_request_by_id)
+get_maintenance_requests_by_tenant_async = run_async(get_maintenance_requests_by_tenant)
+get_maintenance_requests_by_landlord_async = run_async(get_maintenance_requests_by_landlord)
+update_maintenance_status_async = run_async(update_maintenance_status)
+get_maintenance_queue_async = run_async(get_maintenance_queue)
+claim_maintenance_requests_async = run_async(claim_maintenance_requests)
@@ -0,0 +1,175 @@
+# app/services/mpesa_service.py
+import csv
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..models.payment import Payment, PaymentStatus
+from ..models.assignment import Assignment
+from ..models.unit import Unit
+from ..models.property import Property
+from ..core.response_cache import invalidate_on_commit, tag
+from .payment_service import insert_ignoring_duplicates
+from .ledger_service import apply_inserted_payments, settle_charges
+from .dashboard_service import apply_inserted_payments_to_rollups
+
+# Rows per INSERT statement; keeps bound parameters under SQLite's limit
+IMPORT_BATCH_SIZE = 500
+
+# Rejected rows reported back in detail; the rest are only counted
+MAX_REPORTED_ERRORS = 100
+
+# Accepted spellings of each statement column, compared case-insensitively
+COLUMNS = {
+    "reference": ("receipt no.", "receipt no", "receipt", "transaction id", "mpesa_reference"),
+    "completed_at": ("completion time", "transaction time", "date"),
+    "amount": ("paid in", "amount"),
+    "account": ("account no.", "account no", "a/c no.", "account", "bill ref number"),
+    "status": ("transaction status", "status"),
+    "details": ("details", "other party info"),
+}
+REQUIRED_COLUMNS = ("reference", "completed_at", "amount", "account")
+
+TIME_FORMATS = ("%Y-%m-%d %H:%M:%S", "%d-%m-%Y %H:%M:%S", "%d/%m/%Y %H:%M", "%Y-%m-%d")
+
+def _resolve_columns(header: List[str]) -> Dict[str, int]:
+    positions = {name.strip().lower(): index for index, name in enumerate(header)}
+    columns = {}
+    for field, aliases in COLUMNS.items():
+        for alias in aliases:
+            if alias in positions:
+                columns[field] = positions[alias]
+                break
+    missing = [field for field in REQUIRED_COLUMNS if field not in columns]
+    if missing:
+        raise ValueError(f"Statement is missing columns: {', '.join(missing)}")
+    return columns
+
+def _parse_time(value: str) -> datetime:
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, time_format)
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognised completion time '{value}'")
+
+def _account_lookup(db: Session, landlord_id: Optional[int]) -> Dict[str, tuple]:
+    """Map statement account numbers to (assignment_id, tenant_id).
+
+    Tenants pay with either the lease id or their unit number as the
+    account; unit numbers shared by several active leases are left out.
+    """
+    query = db.query(Assignment.id, Assignment.tenant_id, Unit.unit_number).join(
+        Unit, Unit.id == Assignment.unit_id
+    ).filter(Assignment.is_active == True)
+    if landlord_id is not None:
+        query = query.join(Property, Property.id == Unit.property_id).filter(Property.landlord_id == landlord_id)
+
+    lookup, by_unit = {}, {}
+    for assignment_id, tenant_id, unit_number in query:
+        lookup[str(assignment_id)] = (assignment_id, tenant_id)
+        by_unit.setdefault(unit_number.strip().upper(), []).append((assignment_id, tenant_id))
+    for unit_number, leases in by_unit.items():
+        if len(leases) == 1:
+            lookup.setdefault(unit_number, leases[0])
+    return lookup
+
+def _insert_ignoring_duplicates(db: Session, rows: List[dict]) -> int:
+    """Insert payment rows, skipping references already on file; returns rows inserted.
+
+    Runs as a Core executemany against the table so the statement compiles
+    once and is cached; building a multi-VALUES clause per batch costs more
+    than the insert itself.
+    """
+    table = Payment.__table__
+    statement = insert_ignoring_duplicates(db, table)
+    if db.get_bind().dialect.insert_executemany_returning:
+        # Skipped rows return nothing, which makes the count exact on every driver
+        return len(db.execute(statement.returning(table.c.id), rows).all())
+    return db.execute(statement, rows).rowcount
+
+def import_mpesa_statement(
+    db: Session, lines: Iterable[str], landlord_id: Optional[int] = None, batch_size: int = IMPORT_BATCH_SIZE
+) -> dict:
+    """Record the completed receipts of an M-Pesa statement CSV as payments.
+
+    ``lines`` is consumed as a stream and inserted ``batch_size`` rows at a
+    time, so memory stays flat however long the statement is. Receipts
+    whose reference is already recorded count as duplicates; rows that
+    can't be matched to an active lease (of ``landlord_id``, when given)
+    or don't parse are rejected.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("Statement is empty")
+    columns = _resolve_columns(header)
+    accounts = _account_lookup(db, landlord_id)
+
+    result = {"inserted": 0, "duplicates": 0, "rejected": 0, "errors": []}
+
+    def reject(line: int, error: str):
+        result["rejected"] += 1
+        if len(result["errors"]) < MAX_REPORTED_ERRORS:
+            result["errors"].append({"line": line, "error": error})
+
+    def flush(batch: List[dict]):
+        # The batch's own timestamp tells its rows apart for the ledger update
+        stamp = datetime.utcnow()
+        for row in batch:
+            row["created_at"] = row["updated_at"] = stamp
+        inserted = _insert_ignoring_duplicates(db, batch)
+        conditions = (Payment.created_at == stamp, Payment.mpesa_reference.in_([row["mpesa_reference"] for row in batch]))
+        apply_inserted_payments(db, *conditions)
+        apply_inserted_payments_to_rollups(db, *conditions)
+        if inserted:
+            settle_charges(db, {row["assignment_id"] for row in batch}, now=stamp)
+            invalidate_on_commit(db, tag("payments"))
+        db.commit()
+        result["inserted"] += inserted
+        result["duplicates"] += len(batch) - inserted
+
+    batch = []
+    for row in reader:
+        line = reader.line_num
+        if not any(field.strip() for field in row):
+            continue
+        try:
+            values = {field: row[index].strip() for field, index in columns.items() if index < len(row)}
+            if "status" in values and values["status"].lower() != "completed":
+                raise ValueError(f"Transaction status is '{values['status']}'")
+            reference = values.get("reference")
+            if not reference:
+                raise ValueError("Missing receipt number")
+            amount = float(values.get("amount", "").replace(",", "") or 0)
+            if amount <= 0:
+                raise ValueError("Not a payment into the account")
+            completed_at = _parse_time(values.get("completed_at", ""))
+            lease = accounts.get(values.get("account", "").upper())
+            if not lease:
+                raise ValueError(f"No active lease for account '{values.get('account', '')}'")
+        except ValueError as e:
+            reject(line, str(e))
+            continue
+
+        assignment_id, tenant_id = lease
+        batch.append({
+            "assignment_id": assignment_id,
+            "tenant_id": tenant_id,
+            "amount": amount,
+            "payment_date": completed_at,
+            "mpesa_reference": reference,
+            "status": PaymentStatus.PAID,
+            "for_month": completed_at.strftime("%Y-%m"),
+            "for_year": completed_at.year,
+            "billing_period": completed_at.date().replace(day=1),
+            "notes": values.get("details") or None,
+        })
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+
+    if batch:
+        flush(batch)
+    return result
@@ -1,68 +1,241 @@
 # app/services/payment_service.py
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional, Set, Tuple
 from datetime import datetime
-from ..models.payment import Payment, PaymentStatus
+from ..models.payment import Payment, PaymentKind, PaymentStatus
 from ..models.assignment import Assignment
 from ..models.unit import Unit
 from ..models.property import Property
 from ..models.user import User
 from ..schemas.payment import PaymentCreate
+from ..core.pagination import paginate, DEFAULT_PAGE_SIZE
+from ..core.database import run_async
+from ..core.response_cache import invalidate_on_commit, tag
+from .ledger_service import adjust_balance, apply_inserted_payments, ledger_delta, settle_charges
+from .dashboard_service import adjust_monthly_stats, apply_inserted_payments_to_rollups, rent_delta
+from .billing_service import parse_billing_month, period_bounds
+
+# How the drivers name a violation of uq_payments_mpesa_reference
+DUPLICATE_REFERENCE_MARKERS = ("uq_payments_mpesa_reference", "payments.mpesa_reference")
+
+def _is_duplicate_reference(error: IntegrityError) -> bool:
+    message = str(error.orig)
+    return any(marker in message for marker in DUPLICATE_REFERENCE_MARKERS)
+
+def insert_ignoring_duplicates(db: Session, target=Payment):
+    """An INSERT into payments that skips rows whose M-Pesa reference is already recorded."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(target).on_conflict_do_nothing(index_elements=["mpesa_reference"])
+    if dialect == "postgresql":
+        return postgresql.insert(target).on_conflict_do_nothing(index_elements=["mpesa_reference"])
+    return insert(target).prefix_with("IGNORE")
+
+def _listing_tags(db: Session, payments: List[Tuple[int, int]]) -> Set[str]:
+    """Cached listings showing payments on these (assignment_id, tenant_id) pairs."""
+    assignment_ids = {assignment_id for assignment_id, _ in payments}
+    landlord_ids = db.query(Property.landlord_id).join(Unit, Unit.property_id == Property.id).join(
+        Assignment, Assignment.unit_id == Unit.id
+    ).filter(Assignment.id.in_(assignment_ids)).distinct()
+    return {tag("payments", "tenant", tenant_id) for _, tenant_id in payments} | {
+        tag("payments", "landlord", landlord_id) for landlord_id, in landlord_ids
+    }
 
 def create_payment(db: Session, payment: PaymentCreate, tenant_id: int) -> Payment:
     db_payment = Payment(
         **payment.dict(),
+        billing_period=parse_billing_month(payment.for_month),
         tenant_id=tenant_id,
         payment_date=datetime.utcnow(),
-        status=PaymentStatus.PAID
+        status=PaymentStatus.PAID,
+        kind=PaymentKind.RECEIPT
     )
+    adjust_balance(db, db_payment.assignment_id, *ledger_delta(db_payment))
+    adjust_monthly_stats(db, db_payment.assignment_id, db_payment.for_month, *rent_delta(db_payment))
+    invalidate_on_commit(db, *_listing_tags(db, [(db_payment.assignment_id, tenant_id)]))
     db.add(db_payment)
-    db.commit()
+    try:
+        db.flush()
+        settle_charges(db, [db_payment.assignment_id], now=db_payment.payment_date)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        # Anything else (a missing lease, a NULL column) is a bug, not bad input
+        if not _is_duplicate_reference(e):
+            raise
+        raise ValueError("A payment with this M-Pesa reference is already recorded")
     db.refresh(db_payment)
     return db_payment
 
+def create_payments(db: Session, payments: List[Tuple[PaymentCreate, int]]) -> List[Optional[Payment]]:
+    """Insert many (payment, tenant_id) pairs in one statement and one transaction.
+
+    Returns the payments in input order, with None for each whose M-Pesa
+    reference was recorded by someone else since the caller checked.
+    """
+    if not payments:
+        return []
+    
+    now = datetime.utcnow()
+    inserted = list(db.scalars(
+        insert_ignoring_duplicates(db).returning(Payment),
+        [
+            dict(
+                payment.dict(), billing_period=parse_billing_month(payment.for_month), tenant_id=tenant_id,
+                payment_date=now, status=PaymentStatus.PAID, kind=PaymentKind.RECEIPT
+            )
+            for payment, tenant_id in payments
+        ]
+    ))
+    # Only the rows actually inserted count, applied set-wise like an
+    # M-Pesa import
+    conditions = (Payment.id.in_([db_payment.id for db_payment in inserted]),)
+    apply_inserted_payments(db, *conditions)
+    apply_inserted_payments_to_rollups(db, *conditions)
+    settle_charges(db, {db_payment.assignment_id for db_payment in inserted}, now=now)
+    invalidate_on_commit(db, *_listing_tags(db, [(payment.assignment_id, tenant_id) for payment, tenant_id in payments]))
+    db.commit()
+    
+    # Skipped rows return nothing; a reference is unique, so it identifies the row
+    by_reference = {db_payment.mpesa_reference: db_payment for db_payment in inserted if db_payment.mpesa_reference}
+    unreferenced = iter(db_payment for db_payment in inserted if not db_payment.mpesa_reference)
+    return [
+        by_reference.get(payment.mpesa_reference) if payment.mpesa_reference else next(unreferenced)
+        for payment, _ in payments
+    ]
+
+def get_recorded_mpesa_references(db: Session, references: List[str]) -> Set[str]:
+    """Return which of ``references`` already belong to a recorded payment."""
+    rows = db.query(Payment.mpesa_reference).filter(Payment.mpesa_reference.in_(references))
+    return {reference for reference, in rows}
+
 def get_payment_by_id(db: Session, payment_id: int) -> Optional[Payment]:
     return db.query(Payment).filter(Payment.id == payment_id).first()
 
-def get_payments_by_tenant(db: Session, tenant_id: int, skip: int = 0, limit: int = 100) -> List[Payment]:
-    payments = db.query(Payment).filter(
-        Payment.tenant_id == tenant_id
-    ).options(
-        joinedload(Payment.assignment).joinedload(Assignment.unit).joinedload(Unit.property)
-    ).offset(skip).limit(limit).all()
-    
-    # Add computed fields
-    for payment in payments:
-        tenant = db.query(User).filter(User.id == payment.tenant_id).first()
-        payment.tenant_name = f"{tenant.first_name} {tenant.last_name}"
-        payment.unit_info = f"{payment.assignment.unit.unit_number}"
+def _payment_rows(db: Session):
+    # The PaymentResponse columns with the display names joined in, so a
+    # listing is one query of plain rows instead of ORM objects
+    return db.query(
+        Payment.id,
+        Payment.amount,
+        Payment.for_month,
+        Payment.for_year,
+        Payment.notes,
+        Payment.assignment_id,
+        Payment.tenant_id,
+        Payment.payment_date,
+        Payment.mpesa_reference,
+        Payment.status,
+        Payment.kind,
+        Payment.due_date,
+        Payment.created_at,
+        (User.first_name + " " + User.last_name).label("tenant_name"),
+        Unit.unit_number.label("unit_info")
+    ).join(Assignment, Assignment.id == Payment.assignment_id).join(
+        Unit, Unit.id == Assignment.unit_id
+    ).join(User, User.id == Payment.tenant_id)
+
+def get_payments_by_ids(
+    db: Session, payment_ids: List[int], tenant_id: Optional[int] = None, landlord_id: Optional[int] = None
+) -> List[dict]:
+    """Fetch many payments at once, in the order requested; unknown ids are skipped."""
+    query = _payment_rows(db).filter(Payment.id.in_(payment_ids))
+    if tenant_id is not None:
+        query = query.filter(Payment.tenant_id == tenant_id)
+    if landlord_id is not None:
+        query = query.join(Property, Property.id == Unit.property_id).filter(Property.landlord_id == landlord_id)
     
-    return payments
+    payments = {row.id: row._asdict() for row in query}
+    return [payments[payment_id] for payment_id in dict.fromkeys(payment_ids) if payment_id in payments]
+
+def _in_period(query, from_month: Optional[str], to_month: Optional[str]):
+    """Restrict to billing months ``from_month`` through ``to_month`` ("YYYY-MM")."""
+    start, end = period_bounds(from_month, to_month)
+    if start:
+        query = query.filter(Payment.billing_period >= start)
+    if end:
+        query = query.filter(Payment.billing_period < end)
+    return query
 
-def get_payments_by_landlord(db: Session, landlord_id: int, skip: int = 0, limit: int = 100) -> List[Payment]:
-    payments = db.query(Payment).join(Assignment).join(Unit).join(Property).filter(
+def get_payments_by_tenant(
+    db: Session, tenant_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+    from_month: Optional[str] = None, to_month: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    query = _in_period(_payment_rows(db).filter(Payment.tenant_id == tenant_id), from_month, to_month)
+    rows, next_cursor = paginate(query, Payment, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+def get_payments_by_landlord(
+    db: Session, landlord_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+    from_month: Optional[str] = None, to_month: Optional[str] = None
+) -> Tuple[List[dict], Optional[str]]:
+    query = _payment_rows(db).join(Property, Property.id == Unit.property_id).filter(
         Property.landlord_id == landlord_id
-    ).options(
-        joinedload(Payment.assignment).joinedload(Assignment.unit).joinedload(Unit.property),
-        joinedload(Payment.tenant)
-    ).offset(skip).limit(limit).all()
-    
-    # Add computed fields
-    for payment in payments:
-        payment.tenant_name = f"{payment.tenant.first_name} {payment.tenant.last_name}"
-        payment.unit_info = f"{payment.assignment.unit.unit_number}"
-    
-    return payments
+    )
+    query = _in_period(query, from_month, to_month)
+    rows, next_cursor = paginate(query, Payment, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+def get_payments_version_by_tenant(db: Session, tenant_id: int) -> tuple:
+    """Count and latest change of a tenant's payments, index-only, and of
+    the tenant, whose name the listing shows."""
+    renamed = select(User.updated_at).where(User.id == tenant_id).scalar_subquery()
+    return tuple(db.query(func.count(Payment.id), func.max(Payment.updated_at), renamed).filter(
+        Payment.tenant_id == tenant_id
+    ).one())
+
+def get_payments_version_by_landlord(db: Session, landlord_id: int) -> tuple:
+    """Count and latest change of the payments on a landlord's properties.
+
+    Every step of the join is covered by an index, ending in
+    (assignment_id, updated_at) on payments, so no row is read. The latest
+    change of the landlord's tenants is added for the names the listing
+    shows.
+    """
+    lease, unit, owned = aliased(Assignment), aliased(Unit), aliased(Property)
+    renamed = select(func.max(User.updated_at)).join(lease, lease.tenant_id == User.id).join(
+        unit, unit.id == lease.unit_id
+    ).join(owned, owned.id == unit.property_id).where(owned.landlord_id == landlord_id)
+    return tuple(db.query(func.count(Payment.id), func.max(Payment.updated_at), renamed.scalar_subquery()).join(
+        Assignment, Assignment.id == Payment.assignment_id
+    ).join(
+        Unit, Unit.id == Assignment.unit_id
+    ).join(
+        Property, Property.id == Unit.property_id
+    ).filter(Property.landlord_id == landlord_id).one())
 
 def update_payment_status(db: Session, payment_id: int, status: PaymentStatus) -> Optional[Payment]:
     payment = get_payment_by_id(db, payment_id)
     if not payment:
         return None
     
+    old_status = payment.status
     payment.status = status
+    adjust_balance(db, payment.assignment_id, *ledger_delta(payment, old_status))
+    adjust_monthly_stats(db, payment.assignment_id, payment.for_month, *rent_delta(payment, old_status))
     if status == PaymentStatus.PAID and not payment.payment_date:
         payment.payment_date = datetime.utcnow()
+    if payment.kind == PaymentKind.RECEIPT:
+        # Charges of the lease are settled from its receipts, not set by hand
+        db.flush()
+        settle_charges(db, [payment.assignment_id])
     
+    invalidate_on_commit(db, *_listing_tags(db, [(payment.assignment_id, payment.tenant_id)]))
     db.commit()
     db.refresh(payment)
-    return payment
\ No newline at end of file
+    return payment
+
+# Async variants for callers holding an AsyncSession
+create_payment_async = run_async(create_payment)
+create_payments_async = run_async(create_payments)
+get_recorded_mpesa_references_async = run_async(get_recorded_mpesa_references)
+get_payment_by_id_async = run_async(get_payment_by_id)
+get_payments_by_ids_async = run_async(get_payments_by_ids)
+get_payments_by_tenant_async = run_async(get_payments_by_tenant)
+get_payments_by_landlord_async = run_async(get_payments_by_landlord)
+get_payments_version_by_tenant_async = run_async(get_payments_version_by_tenant)
+get_payments_version_by_landlord_async = run_async(get_payments_version_by_landlord)
+update_payment_status_async = run_async(update_payment_status)
@@ -1,16 +1,30 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy import func, case
+from typing import List, Optional, Tuple
 from ..models.property import Property
+from ..models.property_stats import PropertyStats
 from ..models.unit import Unit, UnitStatus
 from ..schemas.property import PropertyCreate
+from ..core.pagination import paginate, DEFAULT_PAGE_SIZE
+from ..core.database import run_async
+from ..core.response_cache import invalidate_on_commit, tag
+from .dashboard_service import rebuild_landlord_stats, rebuild_monthly_stats
+from .search_service import index_properties, index_units, remove_property_documents
+from .vacancy_service import move_vacancies, remove_vacancies
+
+# Fields the search documents of a property and its units are built from
+SEARCHED_FIELDS = {"name", "address", "city", "county"}
 
 def create_property(db: Session, property: PropertyCreate, landlord_id: int) -> Property:
     db_property = Property(
         **property.dict(),
         landlord_id=landlord_id
     )
+    db_property.stats = PropertyStats(units_count=0, occupied_units=0)
     db.add(db_property)
+    db.flush()
+    index_properties(db, [db_property.id])
+    invalidate_on_commit(db, tag("properties", landlord_id))
     db.commit()
     db.refresh(db_property)
     return db_property
@@ -18,35 +32,112 @@ def create_property(db: Session, property: PropertyCreate, landlord_id: int) ->
 def get_property_by_id(db: Session, property_id: int) -> Optional[Property]:
     return db.query(Property).filter(Property.id == property_id).first()
 
-def get_properties_by_landlord(db: Session, landlord_id: int, skip: int = 0, limit: int = 100) -> List[Property]:
-    return db.query(Property).filter(Property.landlord_id == landlord_id).offset(skip).limit(limit).all()
+def _with_stats(rows) -> List[Property]:
+    properties = []
+    for property, units_count, occupied_units in rows:
+        property.units_count = units_count or 0
+        property.occupied_units = occupied_units or 0
+        properties.append(property)
+    return properties
+
+def _stats_query(db: Session):
+    return db.query(
+        Property, PropertyStats.units_count, PropertyStats.occupied_units
+    ).outerjoin(PropertyStats, PropertyStats.property_id == Property.id)
+
+def get_properties_by_landlord(
+    db: Session, landlord_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[dict], Optional[str]]:
+    # The PropertyResponse columns as plain rows, counters from property_stats
+    query = db.query(
+        Property.id,
+        Property.name,
+        Property.address,
+        Property.city,
+        Property.county,
+        Property.description,
+        Property.landlord_id,
+        Property.created_at,
+        func.coalesce(PropertyStats.units_count, 0).label("units_count"),
+        func.coalesce(PropertyStats.occupied_units, 0).label("occupied_units")
+    ).outerjoin(PropertyStats, PropertyStats.property_id == Property.id).filter(Property.landlord_id == landlord_id)
+    rows, next_cursor = paginate(query, Property, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+def get_properties_version(db: Session, landlord_id: int) -> tuple:
+    """Count and latest changes of a landlord's properties and their counters.
+
+    Answered from the (landlord_id, updated_at) and (property_id, updated_at)
+    indexes without touching the rows; the listing's ETag is built from it.
+    """
+    return tuple(db.query(
+        func.count(Property.id), func.max(Property.updated_at), func.max(PropertyStats.updated_at)
+    ).outerjoin(PropertyStats, PropertyStats.property_id == Property.id).filter(
+        Property.landlord_id == landlord_id
+    ).one())
 
 def get_property_with_stats(db: Session, property_id: int):
-    property = get_property_by_id(db, property_id)
-    if not property:
+    row = _stats_query(db).filter(Property.id == property_id).first()
+    if not row:
         return None
+    return _with_stats([row])[0]
+
+def occupancy_delta(old_status: Optional[UnitStatus], new_status: Optional[UnitStatus]) -> int:
+    return int(new_status == UnitStatus.OCCUPIED) - int(old_status == UnitStatus.OCCUPIED)
+
+def adjust_property_stats(db: Session, property_id: int, units_delta: int = 0, occupied_delta: int = 0) -> None:
+    """Apply a change to the stored counters as part of the caller's transaction."""
+    if not units_delta and not occupied_delta:
+        return
     
-    # Get unit statistics
-    units_count = db.query(func.count(Unit.id)).filter(Unit.property_id == property_id).scalar()
-    occupied_units = db.query(func.count(Unit.id)).filter(
-        Unit.property_id == property_id,
-        Unit.status == UnitStatus.OCCUPIED
-    ).scalar()
+    invalidate_on_commit(db, tag("property", property_id))
+    updated = db.query(PropertyStats).filter(PropertyStats.property_id == property_id).update({
+        PropertyStats.units_count: PropertyStats.units_count + units_delta,
+        PropertyStats.occupied_units: PropertyStats.occupied_units + occupied_delta,
+    }, synchronize_session=False)
     
-    # Add computed fields
-    property.units_count = units_count or 0
-    property.occupied_units = occupied_units or 0
+    if not updated:
+        # Property predates the read model; seed it from the units table
+        # and apply the pending change on top
+        for stats in rebuild_property_stats(db, property_id):
+            stats.units_count += units_delta
+            stats.occupied_units += occupied_delta
+
+def rebuild_property_stats(db: Session, property_id: Optional[int] = None) -> List[PropertyStats]:
+    """Recompute counters from the flushed units table for one property, or all of them."""
+    query = db.query(
+        Property.id,
+        func.count(Unit.id),
+        func.coalesce(func.sum(case((Unit.status == UnitStatus.OCCUPIED, 1), else_=0)), 0)
+    ).outerjoin(Unit, Unit.property_id == Property.id).group_by(Property.id)
+    if property_id is not None:
+        query = query.filter(Property.id == property_id)
     
-    return property
+    with db.no_autoflush:
+        return [
+            db.merge(PropertyStats(property_id=pid, units_count=units_count, occupied_units=occupied_units))
+            for pid, units_count, occupied_units in query.all()
+        ]
 
 def update_property(db: Session, property_id: int, property_update: dict) -> Optional[Property]:
     db_property = get_property_by_id(db, property_id)
     if not db_property:
         return None
     
+    old_location = (db_property.county, db_property.city)
     for key, value in property_update.items():
         setattr(db_property, key, value)
     
+    # Vacant units are counted under their property's county and city
+    move_vacancies(db, property_id, old_location, (db_property.county, db_property.city))
+    
+    if SEARCHED_FIELDS & property_update.keys():
+        db.flush()
+        index_properties(db, [property_id])
+        index_units(db, db.query(Unit.id).filter(Unit.property_id == property_id))
+    
+    # Lease and maintenance listings show the property's name
+    invalidate_on_commit(db, tag("property", property_id), tag("assignments"), tag("maintenance"))
     db.commit()
     db.refresh(db_property)
     return db_property
@@ -56,6 +147,26 @@ def delete_property(db: Session, property_id: int) -> bool:
     if not db_property:
         return False
     
+    landlord_id = db_property.landlord_id
+    remove_vacancies(db, property_id)
     db.delete(db_property)
+    db.flush()
+    remove_property_documents(db, property_id)
+    # The property's units went with it; recount the landlord's rollups
+    rebuild_landlord_stats(db, landlord_id)
+    rebuild_monthly_stats(db, landlord_id)
+    invalidate_on_commit(
+        db, tag("properties", landlord_id), tag("units", property_id),
+        tag("assignments"), tag("payments"), tag("maintenance")
+    )
     db.commit()
-    return True
\ No newline at end of file
+    return True
+
+# Async variants for callers holding an AsyncSession
+create_property_async = run_async(create_property)
+get_property_by_id_async = run_async(get_property_by_id)
+get_properties_by_landlord_async = run_async(get_properties_by_landlord)
+get_properties_version_async = run_async(get_properties_version)
+get_property_with_stats_async = run_async(get_property_with_stats)
+update_property_async = run_async(update_property)
+delete_property_async = run_async(delete_property)
@@ -0,0 +1,210 @@
+# app/services/search_service.py
+import re
+import unicodedata
+from sqlalchemy.orm import Session
+from sqlalchemy import column, delete, func, insert, literal, literal_column, null, select, table
+from typing import Iterable, List, Optional
+from ..models.search_document import SearchDocument
+from ..models.assignment import Assignment
+from ..models.property import Property
+from ..models.unit import Unit
+from ..models.user import User
+from ..core.database import run_async
+
+SEARCH_KINDS = ("property", "unit", "tenant")
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+# Words past this many are ignored rather than widening the query
+MAX_QUERY_WORDS = 8
+
+DOCUMENT_COLUMNS = ["kind", "object_id", "landlord_id", "property_id", "title", "subtitle", "terms"]
+
+# Letters and digits; everything else separates words, as in both indexes
+WORD = re.compile(r"[^\W_]+")
+
+# SQLite: contentless FTS5 table over search_documents, fed by triggers.
+# Its columns hold each word twice, plain and prefixed with the landlord
+# ("o7xkamau"); landlords query the prefixed form, so prefix expansion,
+# intersection and bm25's term statistics only read their own documents
+FTS_TABLE = "search_documents_fts"
+# bm25 weights for its (kind, title, terms) columns
+FTS_WEIGHTS = (0.0, 10.0, 1.0)
+
+def _words(*values):
+    text = func.coalesce(values[0], "")
+    for value in values[1:]:
+        text = text + " " + func.coalesce(value, "")
+    return text
+
+def _digits(value):
+    # Phone numbers are also indexed without separators
+    for separator in ("+", " ", "-", "(", ")", ".", "/"):
+        value = func.replace(value, separator, "")
+    return value
+
+def _property_documents(*criteria):
+    return select(
+        literal("property"), Property.id, Property.landlord_id, Property.id,
+        Property.name, Property.address + ", " + Property.city,
+        _words(Property.name, Property.address, Property.city, Property.county)
+    ).where(*criteria)
+
+def _unit_documents(*criteria):
+    return select(
+        literal("unit"), Unit.id, Property.landlord_id, Unit.property_id,
+        Unit.unit_number, Property.name,
+        _words(Unit.unit_number, Property.name)
+    ).join(Property, Property.id == Unit.property_id).where(*criteria)
+
+def _tenant_documents(*criteria):
+    # One document per landlord the tenant has leased from, current or past
+    return select(
+        literal("tenant"), User.id, Property.landlord_id, null(),
+        User.first_name + " " + User.last_name, User.phone_number,
+        _words(
+            User.first_name, User.last_name, User.email, User.phone_number, _digits(User.phone_number), User.id_number
+        )
+    ).select_from(Assignment).join(Unit, Unit.id == Assignment.unit_id).join(
+        Property, Property.id == Unit.property_id
+    ).join(User, User.id == Assignment.tenant_id).where(*criteria).distinct()
+
+def _replace(db: Session, kind: str, object_ids, documents) -> None:
+    db.execute(delete(SearchDocument).where(SearchDocument.kind == kind, SearchDocument.object_id.in_(object_ids)))
+    db.execute(insert(SearchDocument).from_select(DOCUMENT_COLUMNS, documents))
+
+def index_properties(db: Session, property_ids) -> None:
+    """(Re)index properties, by id list or a select of ids, in the caller's transaction."""
+    _replace(db, "property", property_ids, _property_documents(Property.id.in_(property_ids)))
+
+def index_units(db: Session, unit_ids) -> None:
+    """(Re)index units; their documents carry the property's name."""
+    _replace(db, "unit", unit_ids, _unit_documents(Unit.id.in_(unit_ids)))
+
+def index_tenants(db: Session, tenant_ids) -> None:
+    """(Re)index tenants under every landlord they have leased from."""
+    _replace(db, "tenant", tenant_ids, _tenant_documents(Assignment.tenant_id.in_(tenant_ids)))
+
+def remove_property_documents(db: Session, property_id: int) -> None:
+    """Drop a property's document and its units'."""
+    db.execute(delete(SearchDocument).where(
+        SearchDocument.kind.in_(("property", "unit")), SearchDocument.property_id == property_id
+    ))
+
+def rebuild_search_index(db: Session) -> dict:
+    """Rebuild every document from the source tables in one transaction."""
+    db.execute(delete(SearchDocument))
+    counts = {}
+    for kind, documents in (
+        ("property", _property_documents()), ("unit", _unit_documents()), ("tenant", _tenant_documents())
+    ):
+        counts[kind] = db.execute(insert(SearchDocument).from_select(DOCUMENT_COLUMNS, documents)).rowcount
+    db.commit()
+    return counts
+
+def _query_words(q: str) -> List[List[str]]:
+    """Each query word with its alternatives; all are matched as prefixes."""
+    # Composed, so an accent typed as a combining mark doesn't split a word
+    words = [word.lower() for word in WORD.findall(unicodedata.normalize("NFC", q))]
+    if words and all(word.isdigit() for word in words):
+        # A phone number typed with spaces or dashes is one number
+        words = ["".join(words)]
+    
+    groups = []
+    for word in words[:MAX_QUERY_WORDS]:
+        group = [word]
+        # Numbers are stored as typed: match the local and +254 forms of each other
+        if word.isdigit() and word.startswith("254") and len(word) > 3:
+            group.append("0" + word[3:])
+        elif word.isdigit() and word.startswith("0") and len(word) > 1:
+            group.append("254" + word[1:])
+        groups.append(group)
+    return groups
+
+def _result_columns():
+    return (
+        SearchDocument.kind,
+        SearchDocument.object_id.label("id"),
+        SearchDocument.property_id,
+        SearchDocument.title,
+        SearchDocument.subtitle
+    )
+
+def _fts5_search(groups, landlord_id, kinds, limit):
+    # Admins match the plain words, landlords their own prefixed ones
+    owner = "" if landlord_id is None else f"o{int(landlord_id)}"
+    word_prefix, kind_prefix = (owner + "x", owner + "k") if owner else ("", "")
+    words = " AND ".join("(" + " OR ".join(f'"{word_prefix}{word}"*' for word in group) + ")" for group in groups)
+    expression = f"{{title terms}} : ({words})"
+    if kinds:
+        expression += " AND kind : (" + " OR ".join(f'"{kind_prefix}{kind}"' for kind in kinds) + ")"
+    
+    fts = table(FTS_TABLE, column("rowid"))
+    score = func.bm25(literal_column(FTS_TABLE), *FTS_WEIGHTS)
+    ranked = select(fts.c.rowid.label("id"), score.label("score")).where(
+        literal_column(FTS_TABLE).op("MATCH")(expression)
+    ).order_by(score).limit(limit).subquery()
+    statement = select(*_result_columns(), ranked.c.score).join(ranked, ranked.c.id == SearchDocument.id)
+    if landlord_id is not None:
+        # The prefix already scopes the match; this keeps a stray token from leaking rows
+        statement = statement.where(SearchDocument.landlord_id == landlord_id)
+    return statement.order_by(ranked.c.score, SearchDocument.id)
+
+def _tsvector():
+    # Must match the expression of ix_search_documents_fts (migration 0011).
+    # The parser would keep an email or host name as one token, so every
+    # non-word character is turned into a space first, as in FTS5
+    simple = literal_column("'simple'")
+
+    def words(value):
+        return func.to_tsvector(simple, func.regexp_replace(
+            value, literal_column("'[^[:alnum:]]+'"), literal_column("' '"), literal_column("'g'")
+        ))
+    return func.setweight(words(SearchDocument.title), literal_column("'A'")).op("||")(words(SearchDocument.terms))
+
+def _tsvector_search(groups, landlord_id, kinds, limit):
+    terms = " & ".join("(" + " | ".join(f"{word}:*" for word in group) + ")" for group in groups)
+    query = func.to_tsquery(literal_column("'simple'"), terms)
+    score = func.ts_rank(_tsvector(), query)
+    statement = select(*_result_columns(), score.label("score")).where(_tsvector().op("@@")(query))
+    if landlord_id is not None:
+        statement = statement.where(SearchDocument.landlord_id == landlord_id)
+    if kinds:
+        statement = statement.where(SearchDocument.kind.in_(kinds))
+    return statement.order_by(score.desc(), SearchDocument.id).limit(limit)
+
+SEARCHES = {"sqlite": _fts5_search, "postgresql": _tsvector_search}
+
+def search(
+    db: Session, q: str, landlord_id: Optional[int] = None, kinds: Optional[Iterable[str]] = None,
+    limit: int = DEFAULT_SEARCH_LIMIT
+) -> List[dict]:
+    """Ranked properties, units and tenants matching every word of ``q``.
+
+    Scoped to one landlord's documents, or all of them when ``landlord_id``
+    is None. Words match as prefixes, so results follow typing.
+    """
+    kinds = sorted(set(kinds or ()))
+    unknown = set(kinds) - set(SEARCH_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown search kind '{sorted(unknown)[0]}'")
+    
+    groups = _query_words(q)
+    if not groups:
+        return []
+    
+    backend = db.get_bind().dialect.name
+    if backend not in SEARCHES:
+        raise ValueError(f"Full-text search is not available on {backend}")
+    
+    # Across landlords a tenant has a document per landlord; fetch spares
+    fetch = limit if landlord_id is not None else limit * 2
+    results = {}
+    for row in db.execute(SEARCHES[backend](groups, landlord_id, kinds, fetch)):
+        result = row._asdict()
+        del result["score"]
+        results.setdefault((result["kind"], result["id"]), result)
+    return list(results.values())[:limit]
+
+# Async variants for callers holding an AsyncSession
+search_async = run_async(search)
+rebuild_search_index_async = run_async(rebuild_search_index)
@@ -1,9 +1,17 @@
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, func, insert, select
+from typing import Dict, List, Optional, Tuple
 from ..models.unit import Unit, UnitStatus
 from ..models.assignment import Assignment
 from ..models.user import User
+from ..models.property import Property
 from ..schemas.unit import UnitCreate
+from ..core.pagination import paginate, DEFAULT_PAGE_SIZE
+from .property_service import adjust_property_stats, occupancy_delta
+from ..core.database import run_async
+from ..core.response_cache import invalidate_on_commit, tag
+from .search_service import index_units
+from .vacancy_service import adjust_vacancies, vacancy_delta
 
 def create_unit(db: Session, unit: UnitCreate, property_id: int) -> Unit:
     db_unit = Unit(
@@ -11,37 +19,112 @@ def create_unit(db: Session, unit: UnitCreate, property_id: int) -> Unit:
         property_id=property_id
     )
     db.add(db_unit)
+    adjust_property_stats(db, property_id, units_delta=1, occupied_delta=occupancy_delta(None, db_unit.status))
+    adjust_vacancies(db, property_id, [db_unit], 1)
+    db.flush()
+    index_units(db, [db_unit.id])
+    invalidate_on_commit(db, tag("units", property_id))
     db.commit()
     db.refresh(db_unit)
     return db_unit
 
+def create_units(db: Session, units: List[UnitCreate], property_id: int) -> List[Unit]:
+    """Insert many units in one statement and one transaction."""
+    if not units:
+        return []
+    
+    # New units start vacant; counted before the insert like create_unit
+    adjust_property_stats(db, property_id, units_delta=len(units))
+    adjust_vacancies(db, property_id, units, 1)
+    db_units = list(db.scalars(
+        insert(Unit).returning(Unit),
+        [dict(unit.dict(), property_id=property_id) for unit in units]
+    ))
+    index_units(db, [unit.id for unit in db_units])
+    invalidate_on_commit(db, tag("units", property_id))
+    db.commit()
+    return db_units
+
 def get_unit_by_id(db: Session, unit_id: int) -> Optional[Unit]:
     return db.query(Unit).filter(Unit.id == unit_id).first()
 
-def get_units_by_property(db: Session, property_id: int) -> List[Unit]:
-    units = db.query(Unit).filter(Unit.property_id == property_id).all()
-    
-    # Add current tenant info
-    for unit in units:
-        active_assignment = db.query(Assignment).filter(
-            Assignment.unit_id == unit.id,
-            Assignment.is_active == True
-        ).first()
-        
-        if active_assignment:
-            tenant = db.query(User).filter(User.id == active_assignment.tenant_id).first()
-            unit.current_tenant = f"{tenant.first_name} {tenant.last_name}" if tenant else None
-        else:
-            unit.current_tenant = None
+def _unit_rows(db: Session):
+    # The UnitResponse columns as plain rows; the active assignment's tenant
+    # is resolved in the same query, and a vacant unit's name concatenates to NULL
+    return db.query(
+        Unit.id,
+        Unit.unit_number,
+        Unit.floor,
+        Unit.bedrooms,
+        Unit.bathrooms,
+        Unit.square_feet,
+        Unit.monthly_rent,
+        Unit.property_id,
+        Unit.status,
+        Unit.created_at,
+        (User.first_name + " " + User.last_name).label("current_tenant")
+    ).outerjoin(
+        Assignment,
+        and_(Assignment.unit_id == Unit.id, Assignment.is_active == True)
+    ).outerjoin(
+        User, User.id == Assignment.tenant_id
+    )
+
+def get_units_by_property(
+    db: Session, property_id: int, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE
+) -> Tuple[List[dict], Optional[str]]:
+    query = _unit_rows(db).filter(Unit.property_id == property_id)
+    rows, next_cursor = paginate(query, Unit, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+def get_units_version(db: Session, property_id: int) -> tuple:
+    """Count and latest change of a property's units, and of what ``current_tenant`` is read from.
+
+    A lease starting, ending or being replaced on a unit touches an
+    assignment, and renaming a tenant touches their user row, without
+    either changing the unit; the latest change of the property's leases
+    and of their active tenants is part of the version for that. Every
+    part is an index lookup per unit.
+    """
+    unit = aliased(Unit)
+    leases = select(Assignment.updated_at).join(unit, unit.id == Assignment.unit_id).where(
+        unit.property_id == property_id
+    )
+    tenants = select(User.updated_at).join(Assignment, Assignment.tenant_id == User.id).join(
+        unit, unit.id == Assignment.unit_id
+    ).where(unit.property_id == property_id, Assignment.is_active == True)
+    return tuple(db.execute(select(
+        func.count(Unit.id),
+        func.max(Unit.updated_at),
+        leases.with_only_columns(func.max(Assignment.updated_at)).scalar_subquery(),
+        tenants.with_only_columns(func.max(User.updated_at)).scalar_subquery()
+    ).where(Unit.property_id == property_id)).one())
+
+def get_units_by_ids(db: Session, unit_ids: List[int], landlord_id: Optional[int] = None) -> List[dict]:
+    """Fetch many units at once, in the order requested; unknown ids are skipped."""
+    query = _unit_rows(db).filter(Unit.id.in_(unit_ids))
+    if landlord_id is not None:
+        query = query.join(Property, Property.id == Unit.property_id).filter(Property.landlord_id == landlord_id)
     
-    return units
+    units = {row.id: row._asdict() for row in query}
+    return [units[unit_id] for unit_id in dict.fromkeys(unit_ids) if unit_id in units]
+
+def get_unit_landlords(db: Session, unit_ids: List[int]) -> Dict[int, int]:
+    """Map each existing unit id to the landlord owning its property."""
+    rows = db.query(Unit.id, Property.landlord_id).join(
+        Property, Property.id == Unit.property_id
+    ).filter(Unit.id.in_(unit_ids)).all()
+    return {unit_id: landlord_id for unit_id, landlord_id in rows}
 
 def update_unit_status(db: Session, unit_id: int, status: UnitStatus) -> Optional[Unit]:
     db_unit = get_unit_by_id(db, unit_id)
     if not db_unit:
         return None
     
+    adjust_property_stats(db, db_unit.property_id, occupied_delta=occupancy_delta(db_unit.status, status))
+    adjust_vacancies(db, db_unit.property_id, [db_unit], vacancy_delta(db_unit.status, status))
     db_unit.status = status
+    invalidate_on_commit(db, tag("units", db_unit.property_id))
     db.commit()
     db.refresh(db_unit)
     return db_unit
@@ -50,4 +133,15 @@ def get_vacant_units(db: Session, property_id: Optional[int] = None) -> List[Uni
     query = db.query(Unit).filter(Unit.status == UnitStatus.VACANT)
     if property_id:
         query = query.filter(Unit.property_id == property_id)
-    return query.all()
\ No newline at end of file
+    return query.all()
+
+# Async variants for callers holding an AsyncSession
+create_unit_async = run_async(create_unit)
+create_units_async = run_async(create_units)
+get_unit_by_id_async = run_async(get_unit_by_id)
+get_units_by_property_async = run_async(get_units_by_property)
+get_units_version_async = run_async(get_units_version)
+get_units_by_ids_async = run_async(get_units_by_ids)
+get_unit_landlords_async = run_async(get_unit_landlords)
+update_unit_status_async = run_async(update_unit_status)
+get_vacant_units_async = run_async(get_vacant_units)
@@ -3,7 +3,13 @@ from sqlalchemy import or_
 from typing import Optional, List
 from ..models.user import User, UserRole
 from ..schemas.user import UserCreate
-from ..core.security import get_password_hash, verify_password
+from ..core.security import get_password_hash, verify_password, principal_cache
+from ..core.database import run_async
+from ..core.response_cache import invalidate_on_commit, tag
+from .search_service import index_tenants
+
+# Fields a tenant's search documents are built from
+SEARCHED_FIELDS = {"first_name", "last_name", "phone_number", "id_number"}
 
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
@@ -14,8 +20,10 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
 def get_user_by_id_number(db: Session, id_number: str) -> Optional[User]:
     return db.query(User).filter(User.id_number == id_number).first()
 
-def create_user(db: Session, user: UserCreate) -> User:
-    hashed_password = get_password_hash(user.password)
+def create_user(db: Session, user: UserCreate, hashed_password: Optional[str] = None) -> User:
+    # Async callers hash off the event loop and pass the result in
+    if hashed_password is None:
+        hashed_password = get_password_hash(user.password)
     db_user = User(
         first_name=user.first_name,
         last_name=user.last_name,
@@ -37,5 +45,37 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
         return None
     return user
 
+def update_user(db: Session, user_id: int, user_update: dict) -> Optional[User]:
+    db_user = get_user_by_id(db, user_id)
+    if not db_user:
+        return None
+    
+    for key, value in user_update.items():
+        setattr(db_user, key, value)
+    
+    if {"first_name", "last_name"} & user_update.keys():
+        # Tenant names are shown in every other listing
+        invalidate_on_commit(db, tag("units"), tag("assignments"), tag("payments"), tag("maintenance"))
+    if SEARCHED_FIELDS & user_update.keys():
+        db.flush()
+        index_tenants(db, [user_id])
+    db.commit()
+    db.refresh(db_user)
+    principal_cache.invalidate_user(user_id)
+    return db_user
+
+def deactivate_user(db: Session, user_id: int) -> Optional[User]:
+    return update_user(db, user_id, {"is_active": False})
+
 def get_users_by_role(db: Session, role: UserRole, skip: int = 0, limit: int = 100) -> List[User]:
-    return db.query(User).filter(User.role == role).offset(skip).limit(limit).all()
\ No newline at end of file
+    return db.query(User).filter(User.role == role).offset(skip).limit(limit).all()
+
+# Async variants for callers holding an AsyncSession
+get_user_by_id_async = run_async(get_user_by_id)
+get_user_by_email_async = run_async(get_user_by_email)
+get_user_by_id_number_async = run_async(get_user_by_id_number)
+create_user_async = run_async(create_user)
+# authenticate_user has none: bcrypt would run on the event loop
+update_user_async = run_async(update_user)
+deactivate_user_async = run_async(deactivate_user)
+get_users_by_role_async = run_async(get_users_by_role)
@@ -0,0 +1,284 @@
+# app/services/vacancy_service.py
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, case, delete, func, insert, literal_column, select, union_all
+from sqlalchemy.orm import Session
+from ..models.property import Property
+from ..models.unit import Unit, UnitStatus
+from ..models.vacancy_facet import VacancyFacet
+from ..core.database import run_async
+from ..core.pagination import paginate, DEFAULT_PAGE_SIZE
+
+# Filters a vacancy search takes, each with a facet counting its values
+FACETS = ("county", "city", "bedrooms", "bathrooms", "rent")
+
+# Upper bounds of the rent facet's bands; the last band is open-ended.
+# vacancy_facets is keyed by band: migration 0012 copies these
+RENT_BANDS = (10_000, 20_000, 30_000, 50_000, 75_000, 100_000, 150_000)
+BAND_BOUNDS = (0,) + RENT_BANDS + (None,)
+
+# Columns each filter applies to, in the facet table and in the listing
+FACET_COLUMNS = {
+    "county": VacancyFacet.county,
+    "city": VacancyFacet.city,
+    "bedrooms": VacancyFacet.bedrooms,
+    "bathrooms": VacancyFacet.bathrooms,
+    "rent": VacancyFacet.rent_band,
+}
+LISTING_COLUMNS = {
+    "county": Property.county,
+    "city": Property.city,
+    "bedrooms": Unit.bedrooms,
+    "bathrooms": Unit.bathrooms,
+    # An expression, so the listing keeps walking ix_units_vacancy in order:
+    # on the bare column SQLite takes a rent range down ix_units_vacant_rent,
+    # which is there for the facet counts, and sorts every match
+    "rent": Unit.monthly_rent + 0,
+}
+
+def vacancy_delta(old_status: Optional[UnitStatus], new_status: Optional[UnitStatus]) -> int:
+    return int(new_status == UnitStatus.VACANT) - int(old_status == UnitStatus.VACANT)
+
+def rent_band(monthly_rent: float) -> int:
+    return bisect_right(RENT_BANDS, monthly_rent)
+
+def _rent_band(rent):
+    # Bounds are inlined so the expression can be grouped by
+    return case(
+        *[(rent < literal_column(str(bound)), literal_column(str(band))) for band, bound in enumerate(RENT_BANDS)],
+        else_=literal_column(str(len(RENT_BANDS)))
+    )
+
+def _rent_range(band: int, min_rent: Optional[float] = None, max_rent: Optional[float] = None) -> list:
+    """Conditions on ``Unit.monthly_rent`` for the part of a band within the filter."""
+    low, high = BAND_BOUNDS[band], BAND_BOUNDS[band + 1]
+    conditions = [Unit.monthly_rent >= (low if min_rent is None else max(low, min_rent))]
+    if max_rent is not None and (high is None or max_rent < high):
+        conditions.append(Unit.monthly_rent <= max_rent)
+    elif high is not None:
+        conditions.append(Unit.monthly_rent < high)
+    return conditions
+
+def _bands(min_rent: Optional[float], max_rent: Optional[float]) -> Tuple[List[int], List[int]]:
+    """Rent bands wholly inside a rent filter, and those it only cuts through."""
+    whole, partial = [], []
+    for band, (low, high) in enumerate(zip(BAND_BOUNDS, BAND_BOUNDS[1:])):
+        if (min_rent is not None and high is not None and high <= min_rent) or (max_rent is not None and low > max_rent):
+            continue
+        if (min_rent is None or low >= min_rent) and (max_rent is None or (high is not None and high <= max_rent)):
+            whole.append(band)
+        else:
+            partial.append(band)
+    return whole, partial
+
+def _layouts(units: Iterable) -> Counter:
+    return Counter((unit.bedrooms, unit.bathrooms, rent_band(unit.monthly_rent)) for unit in units)
+
+def _vacant_layouts(db: Session, property_id: int) -> Counter:
+    """Vacant units of a flushed property, by (bedrooms, bathrooms, rent band)."""
+    band = _rent_band(Unit.monthly_rent)
+    rows = db.query(Unit.bedrooms, Unit.bathrooms, band, func.count(Unit.id)).filter(
+        Unit.property_id == property_id, Unit.status == UnitStatus.VACANT
+    ).group_by(Unit.bedrooms, Unit.bathrooms, band)
+    return Counter({tuple(row[:3]): row[3] for row in rows})
+
+def _adjust(db: Session, county: str, city: str, layouts: Counter, delta: int) -> None:
+    for (bedrooms, bathrooms, band), count in layouts.items():
+        key = (county, city, bedrooms, bathrooms, band)
+        updated = db.query(VacancyFacet).filter(
+            VacancyFacet.county == county,
+            VacancyFacet.city == city,
+            VacancyFacet.bedrooms == bedrooms,
+            VacancyFacet.bathrooms == bathrooms,
+            VacancyFacet.rent_band == band
+        ).update({
+            VacancyFacet.vacant_units: VacancyFacet.vacant_units + count * delta,
+            VacancyFacet.updated_at: datetime.utcnow(),
+        }, synchronize_session=False)
+    
+        if not updated:
+            # First unit with this layout here; seed the row from the
+            # flushed units and apply the pending change on top
+            for facet in rebuild_vacancy_facets(db, key):
+                facet.vacant_units += count * delta
+
+def adjust_vacancies(db: Session, property_id: int, units: Sequence, delta: int) -> None:
+    """Count ``units`` of a property in or out of the vacancies, in the caller's transaction.
+
+    Call it before the status change is flushed, as with ``adjust_property_stats``.
+    """
+    if not delta or not units:
+        return
+    location = db.query(Property.county, Property.city).filter(Property.id == property_id).first()
+    if location is None:
+        return
+    _adjust(db, location.county, location.city, _layouts(units), delta)
+
+def move_vacancies(db: Session, property_id: int, old_location: Tuple[str, str], new_location: Tuple[str, str]) -> None:
+    """Move a property's vacant units to its new county and city."""
+    if old_location == new_location:
+        return
+    layouts = _vacant_layouts(db, property_id)
+    _adjust(db, *old_location, layouts, -1)
+    _adjust(db, *new_location, layouts, 1)
+
+def remove_vacancies(db: Session, property_id: int) -> None:
+    """Count a property's vacant units out before the property is deleted."""
+    location = db.query(Property.county, Property.city).filter(Property.id == property_id).first()
+    if location is not None:
+        _adjust(db, location.county, location.city, _vacant_layouts(db, property_id), -1)
+
+def _facet_rows(*criteria):
+    key = [Property.county, Property.city, Unit.bedrooms, Unit.bathrooms, _rent_band(Unit.monthly_rent)]
+    return select(*key, func.count(Unit.id), func.now()).join(
+        Property, Property.id == Unit.property_id
+    ).where(Unit.status == UnitStatus.VACANT, *criteria).group_by(*key)
+
+def rebuild_vacancy_facets(db: Session, key: Optional[tuple] = None) -> List[VacancyFacet]:
+    """Recompute vacancy counts from the flushed units table.
+
+    With a (county, city, bedrooms, bathrooms, rent_band) ``key`` only
+    that row is recounted, and returned; otherwise the table is refilled
+    in one statement and nothing is returned.
+    """
+    if key is None:
+        db.execute(delete(VacancyFacet))
+        db.execute(insert(VacancyFacet).from_select(
+            ["county", "city", "bedrooms", "bathrooms", "rent_band", "vacant_units", "updated_at"], _facet_rows()
+        ))
+        return []
+    
+    *layout, band = key
+    criteria = [column == value for column, value in zip(LISTING_COLUMNS.values(), layout)] + _rent_range(band)
+    count = db.execute(_facet_rows(*criteria)).first()
+    fields = dict(zip(("county", "city", "bedrooms", "bathrooms", "rent_band"), key))
+    with db.no_autoflush:
+        return [db.merge(VacancyFacet(**fields, vacant_units=count[5] if count else 0))]
+
+def _conditions(
+    columns: dict,
+    county: Optional[List[str]] = None,
+    city: Optional[List[str]] = None,
+    bedrooms: Optional[List[int]] = None,
+    bathrooms: Optional[List[float]] = None,
+    min_rent: Optional[float] = None,
+    max_rent: Optional[float] = None
+) -> Dict[str, object]:
+    """One SQL condition per filter in use, keyed by facet."""
+    conditions = {}
+    for name, values in (("county", county), ("city", city), ("bedrooms", bedrooms), ("bathrooms", bathrooms)):
+        if values:
+            conditions[name] = columns[name].in_(values)
+    
+    rent = []
+    if min_rent is not None:
+        rent.append(columns["rent"] >= min_rent)
+    if max_rent is not None:
+        rent.append(columns["rent"] <= max_rent)
+    if rent:
+        conditions["rent"] = and_(*rent)
+    return conditions
+
+def _facet_values(name: str, counts: Counter) -> List[dict]:
+    if name == "rent":
+        bounds = (0,) + RENT_BANDS + (None,)
+        return [
+            {"min_rent": bounds[band], "max_rent": bounds[band + 1], "count": count}
+            for band, count in sorted(counts.items())
+        ]
+    if name in ("county", "city"):
+        ordered = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    else:
+        ordered = sorted(counts.items())
+    return [{"value": value, "count": count} for value, count in ordered]
+
+def get_vacancy_facets(db: Session, **filters) -> dict:
+    """Matching vacant units and per-facet counts, in one grouped query.
+
+    Each facet counts the units that pass every *other* filter, so a
+    listing can show how many results picking another value would give.
+    Read from ``vacancy_facets``: only facet rows missing at most one
+    filter can count anywhere, and they are summed per facet value. The
+    table is keyed by rent band, so a rent filter ending inside a band
+    counts that band's matching units from ``ix_units_vacant_rent``.
+    """
+    min_rent, max_rent = filters.pop("min_rent", None), filters.pop("max_rent", None)
+    conditions = _conditions(FACET_COLUMNS, **filters)
+    partial = []
+    if min_rent is not None or max_rent is not None:
+        whole, partial = _bands(min_rent, max_rent)
+        conditions["rent"] = VacancyFacet.rent_band.in_(whole)
+    
+    misses = [case((condition, 0), else_=1).label(f"misses_{name}") for name, condition in conditions.items()]
+    rows = select(
+        VacancyFacet.county, VacancyFacet.city, VacancyFacet.bedrooms, VacancyFacet.bathrooms,
+        VacancyFacet.rent_band.label("rent"), *misses, VacancyFacet.vacant_units, literal_column("0").label("cut")
+    ).where(VacancyFacet.vacant_units > 0)
+    if misses:
+        rows = rows.where(sum(miss.element for miss in misses) <= 1)
+    if partial:
+        # The filtered part of each band the rent filter cuts through, one
+        # range scan per band; its facet row above counts the whole band
+        # as missed. The misses only depend on the grouped columns.
+        listing = _conditions(LISTING_COLUMNS, **filters)
+        unit_misses = [
+            case((listing[name], 0), else_=1) if name in listing else literal_column("0") for name in conditions
+        ]
+        layout = [Property.county, Property.city, Unit.bedrooms, Unit.bathrooms]
+        parts = [rows]
+        for band in partial:
+            units = select(
+                *layout, literal_column(str(band)), *unit_misses, func.count(Unit.id), literal_column("1")
+            ).join(Property, Property.id == Unit.property_id).where(
+                Unit.status == UnitStatus.VACANT, *_rent_range(band, min_rent, max_rent)
+            ).group_by(*layout)
+            if listing:
+                units = units.having(sum(unit_misses) <= 1)
+            parts.append(units)
+        rows = union_all(*parts)
+    rows = rows.subquery()
+    # Grouped outside, by name, so no bound parameter is repeated in GROUP BY
+    keys = [rows.c[name] for name in FACETS] + [rows.c[f"misses_{name}"] for name in conditions] + [rows.c.cut]
+    query = select(*keys, func.sum(rows.c.vacant_units)).group_by(*keys)
+    
+    total, counts = 0, {name: Counter() for name in FACETS}
+    for row in db.execute(query):
+        missed = [name for name, miss in zip(conditions, row[len(FACETS):-2]) if miss]
+        cut, count = row[-2:]
+        if not missed:
+            total += count
+        for name, value in zip(FACETS, row[:len(FACETS)]):
+            # Units of a band the rent filter cuts are already in its rent count
+            if missed in ([], [name]) and not (cut and name == "rent"):
+                counts[name][value] += count
+    return {"total": total, "facets": {name: _facet_values(name, counts[name]) for name in FACETS}}
+
+def search_vacant_units(
+    db: Session, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE, **filters
+) -> Tuple[List[dict], Optional[str]]:
+    """Vacant units passing every filter, newest first, with their property's location."""
+    query = db.query(
+        Unit.id,
+        Unit.unit_number,
+        Unit.floor,
+        Unit.bedrooms,
+        Unit.bathrooms,
+        Unit.square_feet,
+        Unit.monthly_rent,
+        Unit.property_id,
+        Unit.created_at,
+        Property.name.label("property_name"),
+        Property.address,
+        Property.city,
+        Property.county
+    ).join(Property, Property.id == Unit.property_id).filter(
+        Unit.status == UnitStatus.VACANT, *_conditions(LISTING_COLUMNS, **filters).values()
+    )
+    rows, next_cursor = paginate(query, Unit, cursor, limit)
+    return [row._asdict() for row in rows], next_cursor
+
+# Async variants for callers holding an AsyncSession
+get_vacancy_facets_async = run_async(get_vacancy_facets)
+search_vacant_units_async = run_async(search_vacant_units)
@@ -0,0 +1,163 @@
+# benchmarks/async_concurrency.py
+"""Compare sync (threadpool) and async (event loop) endpoints against a slow database.
+
+Every SQL statement is delayed by ``--latency-ms`` to stand in for a remote
+database. The sync path sleeps inside the worker thread, the async path
+awaits the delay inside the driver, so the comparison isolates how many
+requests each model can keep in flight.
+
+    python -m benchmarks.async_concurrency --requests 600 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def build_app(database_url: str, latency: float):
+    import aiosqlite
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    from sqlalchemy.orm import Session, sessionmaker
+    from app.core.database import async_database_url
+    from app.services.property_service import get_property_with_stats, get_property_with_stats_async
+    from app.services.unit_service import get_units_by_property, get_units_by_property_async
+
+    # Large pools so the connection pool is not the bottleneck being measured
+    engine = create_engine(database_url, pool_size=500, max_overflow=0)
+    async_engine = create_async_engine(async_database_url(database_url), pool_size=500, max_overflow=0)
+    SyncSession = sessionmaker(bind=engine, autoflush=False)
+    AsyncSessionFactory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def slow_sync(*args):
+        time.sleep(latency)
+
+    original_execute = aiosqlite.Cursor.execute
+
+    async def slow_execute(self, *args, **kwargs):
+        await asyncio.sleep(latency)
+        return await original_execute(self, *args, **kwargs)
+
+    aiosqlite.Cursor.execute = slow_execute
+
+    def sync_db():
+        db = SyncSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def async_db():
+        async with AsyncSessionFactory() as db:
+            yield db
+
+    app = FastAPI()
+
+    @app.get("/sync/properties/{property_id}")
+    def sync_property(property_id: int, db: Session = Depends(sync_db)):
+        property = get_property_with_stats(db, property_id)
+        units, _ = get_units_by_property(db, property_id, None, 20)
+        return {"units_count": property.units_count, "page": len(units)}
+
+    @app.get("/async/properties/{property_id}")
+    async def async_property(property_id: int, db: AsyncSession = Depends(async_db)):
+        property = await get_property_with_stats_async(db, property_id)
+        units, _ = await get_units_by_property_async(db, property_id, None, 20)
+        return {"units_count": property.units_count, "page": len(units)}
+
+    return app
+
+def seed(database_url: str) -> int:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.models import Base, Property, User
+    from app.models.user import UserRole
+    from app.schemas.unit import UnitCreate
+    from app.services.property_service import rebuild_property_stats
+    from app.models.unit import Unit
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    landlord = User(
+        first_name="Bench", last_name="Landlord", email="bench@example.com", phone_number="0700000000",
+        id_number="00000000", hashed_password="x", role=UserRole.LANDLORD
+    )
+    db.add(landlord)
+    db.flush()
+    property = Property(name="Bench Court", address="Ngong Road", city="Nairobi", county="Nairobi", landlord_id=landlord.id)
+    db.add(property)
+    db.flush()
+    db.add_all([
+        Unit(**UnitCreate(unit_number=f"A{i}", bedrooms=2, bathrooms=1, monthly_rent=25000).dict(), property_id=property.id)
+        for i in range(100)
+    ])
+    db.flush()
+    rebuild_property_stats(db, property.id)
+    db.commit()
+    property_id = property.id
+    db.close()
+    engine.dispose()
+    return property_id
+
+async def drive(app, path: str, requests: int, concurrency: int) -> dict:
+    import httpx
+
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=600)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-bench-")
+    database_url = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault("DATABASE_URL", database_url)
+
+    property_id = seed(database_url)
+    app = build_app(database_url, args.latency_ms / 1000)
+
+    results = {"latency_ms": args.latency_ms, "concurrency": args.concurrency}
+    for mode in ("sync", "async"):
+        results[mode] = asyncio.run(drive(app, f"/{mode}/properties/{property_id}", args.requests, args.concurrency))
+    results["speedup"] = round(results["async"]["throughput_rps"] / results["sync"]["throughput_rps"], 2)
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# benchmarks/billing_period.py
+"""Compare billing-period range queries with the old for_month string filter.
+
+Bulk-loads ``--leases`` leases and invoices every month they run (the
+default 28,000 leases over 36 months is about a million payments), then
+answers three range questions both ways for a sample of tenants, leases
+and landlords: a tenant's quarter, a lease's last twelve months and a
+landlord's quarter. The string way compares ``for_month`` text, which no
+index covers; the typed way seeks the (tenant_id, billing_period) and
+(assignment_id, billing_period) indexes. Both must return the same rows.
+Exits non-zero if they differ or the typed way is not faster overall.
+
+    python -m benchmarks.billing_period --leases 28000 --sample 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.invoice_generation import seed
+
+# The leases seeded by invoice_generation run from 2025-01 to 2027-12
+MONTHS = [f"{year}-{month:02d}" for year in (2025, 2026, 2027) for month in range(1, 13)]
+
+def questions(sample: int, leases: int, landlords: int, seed_value: int) -> dict:
+    """(scope, id, from_month, to_month) cases for each question."""
+    rng = random.Random(seed_value)
+    quarter = lambda: rng.choice(["2025-01", "2025-04", "2026-07", "2027-10"])
+    shift = lambda month, months: MONTHS[MONTHS.index(month) + months]
+    cases = {"tenant_quarter": [], "lease_last_12_months": [], "landlord_quarter": []}
+    for _ in range(sample):
+        start = quarter()
+        cases["tenant_quarter"].append(("tenant", landlords + 1 + rng.randrange(leases), start, shift(start, 2)))
+        end = rng.choice(MONTHS[11:])
+        cases["lease_last_12_months"].append(("assignment", rng.randrange(leases) + 1, shift(end, -11), end))
+    for landlord in range(1, min(sample, landlords) + 1):
+        start = quarter()
+        cases["landlord_quarter"].append(("landlord", landlord, start, shift(start, 2)))
+    return cases
+
+def statement(scope: str, scope_id: int, from_month: str, to_month: str, typed: bool):
+    from sqlalchemy import select
+    from app.models import Assignment, Payment, Property, Unit
+    from app.services.billing_service import period_bounds
+
+    query = select(Payment.id)
+    if scope == "tenant":
+        query = query.where(Payment.tenant_id == scope_id)
+    elif scope == "assignment":
+        query = query.where(Payment.assignment_id == scope_id)
+    else:
+        query = query.join(Assignment, Assignment.id == Payment.assignment_id).join(
+            Unit, Unit.id == Assignment.unit_id
+        ).join(Property, Property.id == Unit.property_id).where(Property.landlord_id == scope_id)
+
+    if typed:
+        start, end = period_bounds(from_month, to_month)
+        return query.where(Payment.billing_period >= start, Payment.billing_period < end)
+    return query.where(Payment.for_month >= from_month, Payment.for_month <= to_month)
+
+def plan(db, query) -> list:
+    from sqlalchemy import text
+
+    compiled = query.compile(db.bind, compile_kwargs={"literal_binds": True})
+    return [row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))]
+
+def timed(db, cases, typed: bool):
+    started = time.perf_counter()
+    results = [sorted(db.scalars(statement(*case, typed=typed))) for case in cases]
+    return time.perf_counter() - started, results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leases", type=int, default=28_000)
+    parser.add_argument("--landlords", type=int, default=50)
+    parser.add_argument("--sample", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-periods-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'periods.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from sqlalchemy import func
+    from app.cli import main as cli
+    from app.core.database import SessionLocal
+    from app.models import Payment
+    from app.services.billing_service import generate_monthly_invoices
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        seed(db, args.leases, args.landlords)
+        for month in MONTHS:
+            generate_monthly_invoices(db, month)
+        # Planner statistics, as a long-running database would have them
+        db.connection().exec_driver_sql("ANALYZE")
+
+        report = {"payments": db.scalar(func.count(Payment.id)), "sample": args.sample}
+        identical, totals = True, [0.0, 0.0]
+        for name, cases in questions(args.sample, args.leases, args.landlords, args.seed).items():
+            # Warm the page cache once so neither side pays for the first read
+            timed(db, cases, typed=False)
+            string_seconds, string_rows = timed(db, cases, typed=False)
+            typed_seconds, typed_rows = timed(db, cases, typed=True)
+            report[name] = {
+                "queries": len(cases),
+                "rows": sum(len(rows) for rows in typed_rows),
+                "string_ms": round(string_seconds * 1000, 1),
+                "typed_ms": round(typed_seconds * 1000, 1),
+                "speedup": round(string_seconds / typed_seconds, 1),
+                "identical": string_rows == typed_rows,
+                "string_plan": plan(db, statement(*cases[0], typed=False)),
+                "typed_plan": plan(db, statement(*cases[0], typed=True)),
+            }
+            identical = identical and string_rows == typed_rows
+            totals[0] += string_seconds
+            totals[1] += typed_seconds
+        report["speedup"] = round(totals[0] / totals[1], 1)
+    finally:
+        db.close()
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if identical and totals[1] < totals[0] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
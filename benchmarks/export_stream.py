@@ -0,0 +1,85 @@
+# benchmarks/export_stream.py
+"""Check that payment exports stream in constant memory.
+
+Bulk-loads ``--leases`` leases, invoices them for ``--months`` months and
+streams the payments export for the first month and for the whole period,
+in CSV and NDJSON. Each export is timed, then run again under tracemalloc
+for its peak memory. Exits non-zero if the whole period peaks at more than
+``--max-growth`` times the single month.
+
+    python -m benchmarks.export_stream --leases 20000 --months 12
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.invoice_generation import seed
+
+def months(count: int) -> list:
+    return [f"2026-{month:02d}" if month <= 12 else f"2027-{month - 12:02d}" for month in range(1, count + 1)]
+
+def export(format: str, from_month: str, to_month: str, measure_memory: bool = False) -> dict:
+    from app.core.export import stream_export
+    from app.services.export_service import payments_export_query
+
+    if measure_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    lines = size = 0
+    for chunk in stream_export(payments_export_query(None, None, from_month, to_month), format):
+        lines += chunk.count(b"\n")
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    result = {"rows": lines - (format == "csv"), "megabytes": round(size / 2**20, 1), "seconds": round(elapsed, 2)}
+    if measure_memory:
+        result["peak_megabytes"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+        tracemalloc.stop()
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leases", type=int, default=20_000)
+    parser.add_argument("--landlords", type=int, default=50)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--max-growth", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-export-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'export.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app.cli import main as cli
+    from app.core.database import SessionLocal
+    from app.services.billing_service import generate_monthly_invoices
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        seed(db, args.leases, args.landlords)
+        for month in months(args.months):
+            generate_monthly_invoices(db, month)
+    finally:
+        db.close()
+
+    period = months(args.months)
+    report, ok = {"leases": args.leases, "months": args.months}, True
+    for format in ("csv", "ndjson"):
+        one_month = export(format, period[0], period[0])
+        whole = export(format, period[0], period[-1])
+        one_month["peak_megabytes"] = export(format, period[0], period[0], measure_memory=True)["peak_megabytes"]
+        whole["peak_megabytes"] = export(format, period[0], period[-1], measure_memory=True)["peak_megabytes"]
+        whole["rows_per_second"] = round(whole["rows"] / whole["seconds"]) if whole["seconds"] else None
+        report[format] = {"one_month": one_month, "whole_period": whole}
+        ok = ok and one_month["rows"] == args.leases and whole["rows"] == args.leases * args.months
+        ok = ok and whole["peak_megabytes"] <= one_month["peak_megabytes"] * args.max_growth
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# benchmarks/invoice_generation.py
+"""Time the monthly invoice run over a large synthetic portfolio.
+
+Bulk-loads ``--leases`` active leases spread over ``--landlords`` landlords,
+runs ``generate_monthly_invoices`` for one month (optionally split into
+shards) and then reruns it, which must create nothing. Exits non-zero if
+the counts are off or the first run exceeds ``--max-seconds``.
+
+    python -m benchmarks.invoice_generation --leases 100000 --shards 4
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+def seed(db, leases: int, landlords: int):
+    from app.models import Assignment, Property, Unit, User
+    from app.models.unit import UnitStatus
+    from app.models.user import UserRole
+
+    now = datetime.utcnow()
+    stamps = {"created_at": now, "updated_at": now}
+    person = {"first_name": "User", "phone_number": "0700000000", "hashed_password": "x", "is_active": True}
+
+    db.execute(User.__table__.insert(), [
+        dict(person, id=l + 1, last_name=f"L{l}", email=f"landlord{l}@example.com", id_number=f"L{l:07d}", role=UserRole.LANDLORD, **stamps)
+        for l in range(landlords)
+    ])
+    db.execute(Property.__table__.insert(), [
+        dict(id=l + 1, name=f"Court {l}", address="Ngong Road", city="Nairobi", county="Nairobi", landlord_id=l + 1, **stamps)
+        for l in range(landlords)
+    ])
+    first_tenant = landlords + 1
+    db.execute(User.__table__.insert(), [
+        dict(person, id=first_tenant + i, last_name=f"T{i}", email=f"tenant{i}@example.com", id_number=f"T{i:07d}", role=UserRole.TENANT, **stamps)
+        for i in range(leases)
+    ])
+    db.execute(Unit.__table__.insert(), [
+        dict(id=i + 1, unit_number=f"A{i}", bedrooms=1, bathrooms=1, monthly_rent=15000, status=UnitStatus.OCCUPIED, property_id=i % landlords + 1, **stamps)
+        for i in range(leases)
+    ])
+    db.execute(Assignment.__table__.insert(), [
+        dict(
+            id=i + 1, unit_id=i + 1, tenant_id=first_tenant + i, start_date=date(2025, 1, 1), end_date=date(2027, 12, 31),
+            monthly_rent=15000 + i % 7 * 500, security_deposit=15000, payment_due_day=i % 31 + 1, is_active=True, **stamps
+        )
+        for i in range(leases)
+    ])
+    db.commit()
+
+def run(db, for_month: str, shards: int) -> tuple:
+    from app.services.billing_service import generate_monthly_invoices
+
+    started = time.perf_counter()
+    created = sum(generate_monthly_invoices(db, for_month, shard, shards) for shard in range(shards))
+    return created, time.perf_counter() - started
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leases", type=int, default=100_000)
+    parser.add_argument("--landlords", type=int, default=200)
+    parser.add_argument("--shards", type=int, default=1)
+    parser.add_argument("--month", default="2026-02")
+    parser.add_argument("--max-seconds", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-invoices-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'invoices.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app.cli import main as cli
+    from app.core.database import SessionLocal
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        seed(db, args.leases, args.landlords)
+        created, elapsed = run(db, args.month, args.shards)
+        rerun_created, rerun_elapsed = run(db, args.month, args.shards)
+    finally:
+        db.close()
+
+    report = {
+        "leases": args.leases,
+        "shards": args.shards,
+        "created": created,
+        "seconds": round(elapsed, 2),
+        "rerun_created": rerun_created,
+        "rerun_seconds": round(rerun_elapsed, 2),
+    }
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if created == args.leases and rerun_created == 0 and elapsed <= args.max_seconds else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# benchmarks/list_serialization.py
+"""Compare the projected/orjson list path with ORM objects through Pydantic.
+
+Bulk-loads one landlord with ``--rows`` leases and one rent charge each,
+then builds the landlord's payments and assignments listings for each
+size in ``--sizes`` two ways. The legacy way loads ORM objects through
+joinedload chains, attaches the display names in Python, validates them
+with the response models and encodes them as FastAPI's default response
+does. The fast path is what the list endpoints now do. Both bodies must
+decode to the same JSON. Exits non-zero if they differ or if the fast path
+is not faster.
+
+    python -m benchmarks.list_serialization --sizes 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from benchmarks.invoice_generation import seed
+
+def legacy_payments(db, landlord_id: int, size: int):
+    from sqlalchemy.orm import joinedload
+    from app.models import Assignment, Payment, Property, Unit
+
+    payments = db.query(Payment).join(Assignment).join(Unit).join(Property).filter(
+        Property.landlord_id == landlord_id
+    ).options(
+        joinedload(Payment.assignment).joinedload(Assignment.unit).joinedload(Unit.property),
+        joinedload(Payment.tenant)
+    ).order_by(Payment.created_at.desc(), Payment.id.desc()).limit(size).all()
+    for payment in payments:
+        payment.tenant_name = f"{payment.tenant.first_name} {payment.tenant.last_name}"
+        payment.unit_info = f"{payment.assignment.unit.unit_number}"
+    return payments
+
+def legacy_assignments(db, landlord_id: int, size: int):
+    from sqlalchemy.orm import joinedload
+    from app.models import Assignment, Property, Unit
+
+    assignments = db.query(Assignment).join(Unit).join(Property).filter(
+        Property.landlord_id == landlord_id
+    ).options(
+        joinedload(Assignment.unit).joinedload(Unit.property),
+        joinedload(Assignment.tenant)
+    ).order_by(Assignment.created_at.desc(), Assignment.id.desc()).limit(size).all()
+    for assignment in assignments:
+        assignment.tenant_name = f"{assignment.tenant.first_name} {assignment.tenant.last_name}"
+        assignment.unit_info = f"{assignment.unit.unit_number}"
+        assignment.property_name = assignment.unit.property.name
+    return assignments
+
+def fast_payments(db, landlord_id: int, size: int):
+    from app.models import Payment, Property, Unit
+    from app.services.payment_service import _payment_rows
+
+    rows = _payment_rows(db).join(Property, Property.id == Unit.property_id).filter(
+        Property.landlord_id == landlord_id
+    ).order_by(Payment.created_at.desc(), Payment.id.desc()).limit(size)
+    return [row._asdict() for row in rows]
+
+def fast_assignments(db, landlord_id: int, size: int):
+    from app.models import Assignment, Property
+    from app.services.assignment_service import _assignment_rows
+
+    rows = _assignment_rows(db).filter(
+        Property.landlord_id == landlord_id
+    ).order_by(Assignment.created_at.desc(), Assignment.id.desc()).limit(size)
+    return [row._asdict() for row in rows]
+
+def legacy_body(items, schema) -> bytes:
+    # What FastAPI does with a response_model: validate, dump to JSON-able
+    # Python, then json.dumps in JSONResponse
+    from fastapi.responses import JSONResponse
+    from pydantic import TypeAdapter
+    from app.schemas.pagination import Page
+
+    adapter = TypeAdapter(Page[schema])
+    page = adapter.validate_python({"items": items, "next_cursor": None}, from_attributes=True)
+    return JSONResponse(adapter.dump_python(page, mode="json")).body
+
+def fast_body(items) -> bytes:
+    from app.core.responses import page_response
+
+    return page_response(items, None).body
+
+def timed(session_factory, build, encode, landlord_id: int, size: int, repeat: int):
+    best, body = None, None
+    for _ in range(repeat):
+        db = session_factory()
+        try:
+            started = time.perf_counter()
+            body = encode(build(db, landlord_id, size))
+            elapsed = time.perf_counter() - started
+        finally:
+            db.close()
+        best = elapsed if best is None else min(best, elapsed)
+    return best, body
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-lists-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'lists.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app.cli import main as cli
+    from app.core.database import SessionLocal
+    from app.schemas.assignment import AssignmentResponse
+    from app.schemas.payment import PaymentResponse
+    from app.services.billing_service import generate_monthly_invoices
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        seed(db, max(args.sizes), 1)
+        generate_monthly_invoices(db, "2026-02")
+    finally:
+        db.close()
+
+    listings = {
+        "payments": (legacy_payments, fast_payments, PaymentResponse),
+        "assignments": (legacy_assignments, fast_assignments, AssignmentResponse),
+    }
+    report, ok = {}, True
+    for name, (legacy, fast, schema) in listings.items():
+        for size in args.sizes:
+            legacy_seconds, legacy_json = timed(
+                SessionLocal, legacy, lambda items: legacy_body(items, schema), 1, size, args.repeat
+            )
+            fast_seconds, fast_json = timed(SessionLocal, fast, fast_body, 1, size, args.repeat)
+            same = json.loads(legacy_json) == json.loads(fast_json)
+            report[f"{name}_{size}"] = {
+                "rows": len(json.loads(fast_json)["items"]),
+                "legacy_ms": round(legacy_seconds * 1000, 1),
+                "fast_ms": round(fast_seconds * 1000, 1),
+                "speedup": round(legacy_seconds / fast_seconds, 1),
+                "identical": same,
+            }
+            ok = ok and same and fast_seconds < legacy_seconds
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
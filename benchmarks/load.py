@@ -0,0 +1,473 @@
+# benchmarks/load.py
+"""Drive every /api/v1 route concurrently against a generated portfolio and report latency per route.
+
+Samples landlords, tenants, leases, vacant units, receipts and open
+maintenance requests from the database by random id probes, signs tokens
+for them, and sends each route ``--requests`` requests built from the
+sample: listings, lookups, exports, searches and writes (registrations,
+new properties and units, leases on vacant units, receipts, statement
+imports, status changes and claims). Requests go through the ASGI app
+in-process with httpx, or to ``--base-url`` for a running server.
+
+Two phases, each after ``--warmup`` unrecorded requests per route: every
+route on its own at ``--concurrency`` (isolated), then all of them
+shuffled together at the same concurrency (mixed). Each reports requests
+per second and p50/p95/p99 latency per route as JSON, with the commit,
+database and dataset size, so runs can be compared; ``--baseline`` adds
+the change against an earlier report. Exits non-zero if a route has no
+request here, a request fails, or with ``--max-regression`` a route's
+p99 grew by more than that fraction.
+
+    python -m benchmarks.portfolio --database-url sqlite:////tmp/portfolio.db
+    python -m benchmarks.load --database-url sqlite:////tmp/portfolio.db --requests 200 > before.json
+    python -m benchmarks.load --database-url sqlite:////tmp/portfolio.db --baseline before.json --max-regression 0.2
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from .portfolio import ISSUES, PASSWORD, mpesa_reference
+from .search import FIRST_NAMES
+from .vacancy_search import workload as vacancy_filters
+
+# Rows per batch request and per imported statement
+BATCH_SIZE = 10
+# Ids remembered per sampled landlord for lookups, imports and status changes
+PER_LANDLORD = 20
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summarize(latencies, elapsed: float = None) -> dict:
+    if not latencies:
+        return {"count": 0}
+    summary = {"count": len(latencies)}
+    if elapsed:
+        summary["requests_per_second"] = round(len(latencies) / elapsed, 1)
+    return {
+        **summary,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+    }
+
+def sample(db, statement, model, count: int, rng) -> list:
+    """Up to ``count`` rows of ``statement``, found by probing random ids of ``model``.
+
+    Probing stays cheap on millions of rows, where ORDER BY random() sorts
+    the whole table; sparse matches are probed again with more ids.
+    """
+    from sqlalchemy import func, select
+
+    top = db.scalar(select(func.max(model.id))) or 0
+    rows, probes = {}, count * 4
+    for _ in range(6):
+        if len(rows) >= count or not top:
+            break
+        ids = rng.sample(range(1, top + 1), min(top, probes))
+        for row in db.execute(statement.where(model.id.in_(ids))):
+            rows.setdefault(row[0], row)
+        probes *= 4
+    found = list(rows.values())
+    rng.shuffle(found)
+    return found[:count]
+
+class Workload:
+    """Principals and ids drawn from the database, and the requests built from them."""
+
+    def __init__(self, db, actors: int, writes: int, seed_value: int):
+        from sqlalchemy import select
+        from app.models import Assignment, MaintenanceRequest, Payment, Property, Unit, User
+        from app.models.maintenance import MaintenanceStatus
+        from app.models.payment import PaymentKind
+        from app.models.unit import UnitStatus
+
+        self.rng = random.Random(seed_value)
+        # Unique emails, id numbers and receipt numbers across runs on one database
+        self.run = int(time.time())
+        self.sequence = 0
+        self.tokens = {}
+        self.vacancy_filters = vacancy_filters(10 ** 9, seed_value)
+
+        self.leases = sample(db, select(
+            Assignment.id, Assignment.unit_id, Assignment.tenant_id, Unit.property_id, Property.landlord_id,
+            User.email, Assignment.monthly_rent
+        ).join(Unit, Unit.id == Assignment.unit_id).join(Property, Property.id == Unit.property_id).join(
+            User, User.id == Assignment.tenant_id
+        ).where(Assignment.is_active == True), Assignment, actors, self.rng)
+        if not self.leases:
+            raise ValueError("The database has no active leases; generate a portfolio first")
+        self.landlords = sorted({lease.landlord_id for lease in self.leases})
+
+        # Each write that consumes a row gets its own
+        self.vacant = sample(db, select(Unit.id, Property.landlord_id).join(
+            Property, Property.id == Unit.property_id
+        ).where(Unit.status == UnitStatus.VACANT), Unit, writes, self.rng)
+        self.open_requests = sample(db, select(MaintenanceRequest.id, Property.landlord_id).join(
+            Unit, Unit.id == MaintenanceRequest.unit_id
+        ).join(Property, Property.id == Unit.property_id).where(
+            MaintenanceRequest.status == MaintenanceStatus.PENDING
+        ), MaintenanceRequest, writes, self.rng)
+
+        self.owned = {}
+        for landlord_id in self.landlords:
+            mine = (Property.landlord_id == landlord_id,)
+            self.owned[landlord_id] = {
+                "properties": db.scalars(select(Property.id).where(*mine).limit(PER_LANDLORD)).all(),
+                "units": db.scalars(select(Unit.id).join(Property, Property.id == Unit.property_id).where(
+                    *mine
+                ).limit(PER_LANDLORD)).all(),
+                "leases": db.scalars(select(Assignment.id).join(Unit, Unit.id == Assignment.unit_id).join(
+                    Property, Property.id == Unit.property_id
+                ).where(*mine, Assignment.is_active == True).limit(PER_LANDLORD)).all(),
+                "receipts": db.scalars(select(Payment.id).join(
+                    Assignment, Assignment.id == Payment.assignment_id
+                ).join(Unit, Unit.id == Assignment.unit_id).join(Property, Property.id == Unit.property_id).where(
+                    *mine, Payment.kind == PaymentKind.RECEIPT
+                ).limit(PER_LANDLORD)).all(),
+            }
+
+    def headers(self, user_id: int) -> dict:
+        from app.core.security import create_access_token
+
+        if user_id not in self.tokens:
+            self.tokens[user_id] = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+        return self.tokens[user_id]
+
+    def next(self) -> int:
+        self.sequence += 1
+        return self.sequence
+
+    def lease(self):
+        return self.rng.choice(self.leases)
+
+    def landlord(self):
+        landlord_id = self.rng.choice(self.landlords)
+        return self.headers(landlord_id), self.owned[landlord_id]
+
+    def receipt(self, lease, amount: float) -> dict:
+        # Sequences far above the generator's keep the references unique
+        sequence = 10 ** 10 + (self.run % 10 ** 5) * 10 ** 5 + self.next()
+        today = date.today()
+        return dict(
+            amount=amount, for_month=today.strftime("%Y-%m"), for_year=today.year, assignment_id=lease.id,
+            mpesa_reference=mpesa_reference(sequence, datetime.utcnow())
+        )
+
+    def statement(self, owned: dict) -> bytes:
+        header = "Receipt No.,Completion Time,Details,Transaction Status,Paid In,Withdrawn,Balance,Account No.\n"
+        now = datetime.utcnow()
+        rows = []
+        for lease_id in self.rng.sample(owned["leases"], min(BATCH_SIZE, len(owned["leases"]))):
+            sequence = 10 ** 10 + (self.run % 10 ** 5) * 10 ** 5 + self.next()
+            rows.append(
+                f"{mpesa_reference(sequence, now)},{now:%Y-%m-%d %H:%M:%S},Pay Bill,Completed,"
+                f"{self.rng.choice([2500, 5000, 10000])},,,{lease_id}\n"
+            )
+        return (header + "".join(rows)).encode()
+
+    def unit(self, prefix: str) -> dict:
+        return dict(
+            unit_number=f"{prefix}{self.run % 10 ** 5}-{self.next()}", bedrooms=self.rng.choice([0, 1, 2, 3]),
+            bathrooms=1, monthly_rent=self.rng.choice([12000, 18000, 25000, 40000])
+        )
+
+    def maintenance(self, lease) -> dict:
+        issue = self.rng.choice(list(ISSUES))
+        return dict(issue_type=issue, description=self.rng.choice(ISSUES[issue]), unit_id=lease.unit_id)
+
+    def requests(self) -> dict:
+        """(method, route) -> builder returning (headers, path, request keyword arguments)."""
+        rng = self.rng
+
+        def tenant(build):
+            def request():
+                lease = self.lease()
+                return (self.headers(lease.tenant_id),) + build(lease)
+            return request
+
+        def landlord(build):
+            def request():
+                headers, owned = self.landlord()
+                return (headers,) + build(owned)
+            return request
+
+        def register():
+            n = self.next()
+            return {}, "/auth/register", {"json": dict(
+                first_name=rng.choice(FIRST_NAMES), last_name="Load", email=f"load{self.run}-{n}@example.com",
+                phone_number="0712345678", role="tenant", password=PASSWORD, id_number=f"LD{self.run}-{n}"
+            )}
+
+        def login():
+            return {}, "/auth/login", {"data": {"username": self.lease().email, "password": PASSWORD}}
+
+        def assign():
+            unit_id, landlord_id = self.vacant.pop()
+            today = date.today()
+            return self.headers(landlord_id), f"/assignments/units/{unit_id}/assign", {"json": dict(
+                tenant_id=self.lease().tenant_id, start_date=today.isoformat(),
+                end_date=(today + timedelta(days=365)).isoformat(), monthly_rent=20000, security_deposit=20000,
+                payment_due_day=5
+            )}
+
+        def close_request():
+            request_id, landlord_id = self.open_requests.pop()
+            return self.headers(landlord_id), f"/maintenance/{request_id}/status", {
+                "params": {"status": rng.choice(["in_progress", "completed"])}
+            }
+
+        return {
+            ("POST", "/auth/register"): register,
+            ("POST", "/auth/login"): login,
+            ("GET", "/auth/me"): tenant(lambda lease: ("/auth/me", {})),
+            ("POST", "/properties/"): landlord(lambda owned: ("/properties/", {"json": dict(
+                name="Load Court", address="Ngong Road", city="Karen", county="Nairobi"
+            )})),
+            ("GET", "/properties/"): landlord(lambda owned: ("/properties/", {})),
+            ("GET", "/properties/{property_id}"): landlord(
+                lambda owned: (f"/properties/{rng.choice(owned['properties'])}", {})
+            ),
+            ("POST", "/properties/{property_id}/units/"): landlord(lambda owned: (
+                f"/properties/{rng.choice(owned['properties'])}/units/", {"json": self.unit("L")}
+            )),
+            ("POST", "/properties/{property_id}/units/batch"): landlord(lambda owned: (
+                f"/properties/{rng.choice(owned['properties'])}/units/batch",
+                {"json": [self.unit("B") for _ in range(BATCH_SIZE)]}
+            )),
+            ("GET", "/units/"): landlord(lambda owned: ("/units/", {"params": {"ids": owned["units"]}})),
+            ("GET", "/units/vacant"): tenant(lambda lease: ("/units/vacant", {"params": next(self.vacancy_filters)})),
+            ("GET", "/properties/{property_id}/units/"): landlord(
+                lambda owned: (f"/properties/{rng.choice(owned['properties'])}/units/", {})
+            ),
+            ("GET", "/units/{unit_id}"): landlord(lambda owned: (f"/units/{rng.choice(owned['units'])}", {})),
+            ("POST", "/assignments/units/{unit_id}/assign"): assign,
+            ("GET", "/assignments/tenant/assignments"): tenant(lambda lease: ("/assignments/tenant/assignments", {})),
+            ("GET", "/assignments/landlord/assignments"): landlord(
+                lambda owned: ("/assignments/landlord/assignments", {})
+            ),
+            ("GET", "/assignments/{assignment_id}/balance"): tenant(
+                lambda lease: (f"/assignments/{lease.id}/balance", {})
+            ),
+            ("GET", "/assignments/landlord/arrears"): landlord(lambda owned: ("/assignments/landlord/arrears", {})),
+            ("GET", "/assignments/landlord/export"): landlord(lambda owned: ("/assignments/landlord/export", {})),
+            ("POST", "/payments/"): tenant(lambda lease: ("/payments/", {"json": self.receipt(lease, lease.monthly_rent)})),
+            ("POST", "/payments/batch"): tenant(lambda lease: ("/payments/batch", {"json": [
+                self.receipt(lease, lease.monthly_rent / BATCH_SIZE) for _ in range(BATCH_SIZE)
+            ]})),
+            ("POST", "/payments/import"): landlord(lambda owned: ("/payments/import", {"files": {
+                "statement": ("statement.csv", self.statement(owned), "text/csv")
+            }})),
+            ("GET", "/payments/"): landlord(lambda owned: ("/payments/", {"params": {"ids": owned["receipts"]}})),
+            ("GET", "/payments/tenant/payments"): tenant(lambda lease: ("/payments/tenant/payments", {})),
+            ("GET", "/payments/landlord/payments"): landlord(lambda owned: ("/payments/landlord/payments", {})),
+            ("GET", "/payments/landlord/export"): landlord(lambda owned: ("/payments/landlord/export", {})),
+            ("PUT", "/payments/{payment_id}/status"): landlord(lambda owned: (
+                f"/payments/{rng.choice(owned['receipts'])}/status", {"params": {"status": "paid"}}
+            )),
+            ("POST", "/maintenance/"): tenant(lambda lease: ("/maintenance/", {"json": self.maintenance(lease)})),
+            ("POST", "/maintenance/batch"): tenant(lambda lease: ("/maintenance/batch", {"json": [
+                self.maintenance(lease) for _ in range(BATCH_SIZE)
+            ]})),
+            ("GET", "/maintenance/tenant/requests"): tenant(lambda lease: ("/maintenance/tenant/requests", {})),
+            ("GET", "/maintenance/landlord/requests"): landlord(lambda owned: ("/maintenance/landlord/requests", {})),
+            ("GET", "/maintenance/landlord/export"): landlord(lambda owned: ("/maintenance/landlord/export", {})),
+            ("GET", "/maintenance/queue"): landlord(lambda owned: ("/maintenance/queue", {})),
+            ("POST", "/maintenance/queue/claim"): landlord(lambda owned: ("/maintenance/queue/claim", {})),
+            ("PUT", "/maintenance/{request_id}/status"): close_request,
+            ("GET", "/landlord/dashboard"): landlord(lambda owned: ("/landlord/dashboard", {})),
+            ("GET", "/search"): landlord(lambda owned: ("/search", {"params": {"q": rng.choice(FIRST_NAMES)[:4]}})),
+        }
+
+async def run_phase(client, prefix: str, builders: dict, plan: list, concurrency: int) -> tuple:
+    """Send the requests of ``plan`` (route keys) with ``concurrency`` in flight."""
+    latencies, errors = defaultdict(list), defaultdict(list)
+    queue = iter(plan)
+
+    async def worker():
+        for key in queue:
+            headers, path, kwargs = builders[key]()
+            started = time.perf_counter()
+            response = await client.request(key[0], prefix + path, headers=headers, **kwargs)
+            elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                errors[key].append(f"{response.status_code} {response.text[:200]}")
+            else:
+                latencies[key].append(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+def report_route(latencies: list, errors: list, elapsed: float = None) -> dict:
+    entry = summarize(latencies, elapsed)
+    if errors:
+        entry["errors"] = len(errors)
+        entry["first_error"] = errors[0]
+    return entry
+
+async def drive(args, workload: Workload, routes: list) -> dict:
+    import httpx
+    from app.core.config import settings
+    from app.main import app
+
+    builders = workload.requests()
+    prefix = settings.API_V1_STR
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=300)
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://load", timeout=300)
+
+    phases = {}
+    async with client:
+        # Warm-up: compiled statements, principal cache and pools
+        await run_phase(client, prefix, builders, [key for key in routes for _ in range(args.warmup)], 1)
+
+        if "isolated" in args.phases:
+            isolated, started = {}, time.perf_counter()
+            for key in routes:
+                latencies, errors, elapsed = await run_phase(
+                    client, prefix, builders, [key] * args.requests, args.concurrency
+                )
+                isolated[f"{key[0]} {prefix}{key[1]}"] = report_route(latencies[key], errors[key], elapsed)
+            phases["isolated"] = {"seconds": round(time.perf_counter() - started, 1), "routes": isolated}
+
+        if "mixed" in args.phases:
+            plan = [key for key in routes for _ in range(args.requests)]
+            workload.rng.shuffle(plan)
+            latencies, errors, elapsed = await run_phase(client, prefix, builders, plan, args.concurrency)
+            everything = [latency for samples in latencies.values() for latency in samples]
+            phases["mixed"] = {
+                "seconds": round(elapsed, 1),
+                "total": summarize(everything, elapsed),
+                # A route's share of a mixed run says nothing of its throughput
+                "routes": {
+                    f"{key[0]} {prefix}{key[1]}": report_route(latencies[key], errors[key]) for key in routes
+                },
+            }
+    return phases
+
+def compare(phases: dict, baseline: dict) -> dict:
+    """Per route, the fractional change in p50, p99 and throughput since ``baseline``."""
+    changes = {}
+    for phase, result in phases.items():
+        before = baseline.get("phases", {}).get(phase, {}).get("routes", {})
+        for route, entry in result["routes"].items():
+            old = before.get(route)
+            if not old or not old.get("count") or not entry.get("count"):
+                continue
+            changes.setdefault(phase, {})[route] = {
+                name: round(entry[name] / old[name] - 1, 3) if old.get(name) else None
+                for name in ("p50_ms", "p99_ms", "requests_per_second") if name in entry
+            }
+    return changes
+
+def commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="portfolio from benchmarks.portfolio (default: generate a small one)")
+    parser.add_argument("--base-url", help="send requests to this running server instead of in-process")
+    parser.add_argument("--requests", type=int, default=100, help="recorded requests per route and phase")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=3, help="unrecorded requests per route first")
+    parser.add_argument("--phases", default="isolated,mixed")
+    parser.add_argument("--actors", type=int, default=200, help="leases sampled for tenants and their landlords")
+    parser.add_argument("--no-response-cache", action="store_true", help="send every read to the database")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--max-regression", type=float, help="fail if a route's p99 grew by more than this fraction")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args(argv)
+    args.phases = set(args.phases.split(","))
+
+    generated = args.database_url is None
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='rentezi-load-'), 'load.db')}"
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    if args.no_response_cache:
+        os.environ["RESPONSE_CACHE_URL"] = ""
+
+    from fastapi.routing import APIRoute
+    from sqlalchemy import func, select
+    from app.cli import main as cli
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.main import app
+    from app.models import MaintenanceRequest, Payment, Unit, User
+    from .portfolio import build_read_models, generate
+
+    cli(["migrate"])
+    db = SessionLocal()
+    if generated:
+        generate(db, landlords=50, units=5000, months=3, vacant=0.08, maintenance=0.6, seed_value=args.seed)
+        build_read_models(db)
+    # Every request that consumes a vacant unit or an open request gets its own
+    writes = (args.requests + args.warmup) * len(args.phases)
+    workload = Workload(db, args.actors, writes, args.seed)
+    dataset = {
+        model.__tablename__: db.scalar(select(func.count()).select_from(model))
+        for model in (User, Unit, Payment, MaintenanceRequest)
+    }
+    db.close()
+
+    prefix = settings.API_V1_STR
+    routes, missing = [], []
+    builders = workload.requests()
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path.startswith(prefix):
+            for method in sorted(route.methods):
+                key = (method, route.path[len(prefix):])
+                (routes if key in builders else missing).append(key)
+    if len(workload.vacant) < writes or len(workload.open_requests) < writes:
+        print(f"warning: the portfolio has too few vacant units or open requests for {writes} writes", file=sys.stderr)
+
+    phases = asyncio.run(drive(args, workload, routes))
+    report = {
+        "commit": commit(),
+        "database": database_url.split(":", 1)[0],
+        "dataset": dataset,
+        "requests_per_route": args.requests,
+        "concurrency": args.concurrency,
+        "response_cache": bool(settings.RESPONSE_CACHE_URL) and not args.base_url,
+        "target": args.base_url or "in-process",
+        "missing_routes": [f"{method} {prefix}{path}" for method, path in missing],
+        "phases": phases,
+    }
+    failed = bool(missing) or any(
+        entry.get("errors") for result in phases.values() for entry in result["routes"].values()
+    )
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            report["changes"] = compare(phases, json.load(baseline))
+        if args.max_regression is not None:
+            report["regressions"] = [
+                f"{phase} {route}" for phase, routes_changed in report["changes"].items()
+                for route, change in routes_changed.items()
+                if change["p99_ms"] is not None and change["p99_ms"] > args.max_regression
+            ]
+            failed = failed or bool(report["regressions"])
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+# benchmarks/login_throughput.py
+"""Measure login throughput and the read latency other endpoints see during a login burst.
+
+bcrypt runs on the password worker pool, so a burst of logins should leave
+authenticated reads (``GET /auth/me``) close to their idle latency, with
+logins beyond the admission limit rejected quickly with 503.
+
+    python -m benchmarks.login_throughput --logins 200 --reads 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summarize(latencies):
+    if not latencies:
+        return {"count": 0}
+    return {
+        "count": len(latencies),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+    }
+
+def seed(users: int) -> None:
+    from app.core.database import SessionLocal, get_engine
+    from app.core.security import get_password_hash
+    from app.models import Base, User
+    from app.models.user import UserRole
+
+    Base.metadata.create_all(bind=get_engine())
+    hashed_password = get_password_hash("benchmark-password")
+    db = SessionLocal()
+    db.add_all([
+        User(
+            first_name="Tenant", last_name=str(i), email=f"tenant{i}@example.com", phone_number="0700000000",
+            id_number=f"ID{i:08d}", hashed_password=hashed_password, role=UserRole.TENANT, is_verified=True
+        )
+        for i in range(users)
+    ])
+    db.commit()
+    db.close()
+
+async def run(args) -> dict:
+    import httpx
+    from app.core.config import settings
+    from app.main import app
+
+    prefix = settings.API_V1_STR
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        async def login(i):
+            started = time.perf_counter()
+            response = await client.post(f"{prefix}/auth/login", data={
+                "username": f"tenant{i % args.users}@example.com",
+                "password": "benchmark-password",
+            })
+            return response, time.perf_counter() - started
+
+        response, _ = await login(0)
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        async def read_loop(count, latencies):
+            for _ in range(count):
+                started = time.perf_counter()
+                (await client.get(f"{prefix}/auth/me", headers=headers)).raise_for_status()
+                latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.001)
+
+        idle_reads = []
+        await asyncio.gather(*(read_loop(args.reads // args.readers, idle_reads) for _ in range(args.readers)))
+
+        burst_reads = []
+        started = time.perf_counter()
+        outcomes, _ = await asyncio.gather(
+            asyncio.gather(*(login(i) for i in range(args.logins))),
+            asyncio.gather(*(read_loop(args.reads // args.readers, burst_reads) for _ in range(args.readers))),
+        )
+        elapsed = time.perf_counter() - started
+
+    accepted = [latency for response, latency in outcomes if response.status_code == 200]
+    rejected = [latency for response, latency in outcomes if response.status_code == 503]
+    return {
+        "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+        "hash_workers": settings.PASSWORD_HASH_WORKERS,
+        "hash_queue": settings.PASSWORD_HASH_QUEUE_SIZE,
+        "burst_seconds": round(elapsed, 3),
+        "logins_per_second": round(len(accepted) / elapsed, 1),
+        "logins_accepted": summarize(accepted),
+        "logins_rejected_503": summarize(rejected),
+        "reads_idle": summarize(idle_reads),
+        "reads_during_burst": summarize(burst_reads),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--reads", type=int, default=400)
+    parser.add_argument("--readers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-bench-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+
+    seed(args.users)
+    results = asyncio.run(run(args))
+
+    from app.core.security import shutdown_hash_pool
+    shutdown_hash_pool()
+
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+# benchmarks/maintenance_queue.py
+"""Check that concurrent caretakers drain the maintenance work queue exactly once.
+
+Bulk-loads ``--requests`` pending requests of mixed priority over
+``--leases`` leases, then:
+
+* times reading the next ``--batch`` jobs from the queue against the old
+  way, pulling the landlord's whole request list and sorting it;
+* runs ``--workers`` threads, each with its own session, claiming
+  ``--batch`` requests at a time until the queue is empty.
+
+Every request must be claimed exactly once, each claim must come back in
+queue order, and no claimer may fail on a lock. Exits non-zero otherwise.
+Point DATABASE_URL at PostgreSQL to exercise SKIP LOCKED; the default is
+a temporary SQLite file.
+
+    python -m benchmarks.maintenance_queue --requests 20000 --workers 8 --batch 5
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.invoice_generation import seed
+
+def seed_requests(db, count: int, leases: int, landlords: int) -> None:
+    from app.models import MaintenanceRequest
+    from app.models.maintenance import MaintenancePriority, MaintenanceStatus
+
+    rng = random.Random(1)
+    started = datetime.utcnow() - timedelta(days=90)
+    rows = []
+    for i in range(count):
+        lease = rng.randrange(leases)
+        created = started + timedelta(seconds=rng.randrange(90 * 86400))
+        rows.append(dict(
+            unit_id=lease + 1, tenant_id=landlords + 1 + lease, issue_type="plumbing", description="Leaking tap",
+            status=MaintenanceStatus.PENDING, priority=rng.choice(list(MaintenancePriority)),
+            created_at=created, updated_at=created
+        ))
+    db.execute(MaintenanceRequest.__table__.insert(), rows)
+    db.commit()
+
+def queue_order(row: dict) -> tuple:
+    from app.services.maintenance_service import QUEUE_PRIORITIES
+
+    return QUEUE_PRIORITIES.index(row["priority"]), row["created_at"], row["id"]
+
+def read_next(session_factory, landlord_id: int, batch: int, repeat: int) -> dict:
+    from app.services.maintenance_service import _maintenance_rows, get_maintenance_queue
+    from app.models import Property
+
+    def whole_list(db):
+        # What a caretaker had to do before: fetch everything, filter, sort
+        rows = [row._asdict() for row in _maintenance_rows(db).filter(Property.landlord_id == landlord_id)]
+        return sorted((row for row in rows if row["status"].name == "PENDING"), key=queue_order)[:batch]
+
+    timings = {}
+    for name, read in (("whole_list", whole_list), ("queue", lambda db: get_maintenance_queue(db, landlord_id, batch))):
+        best, result = None, None
+        for _ in range(repeat):
+            db = session_factory()
+            try:
+                started = time.perf_counter()
+                result = read(db)
+                elapsed = time.perf_counter() - started
+            finally:
+                db.close()
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = (best, [row["id"] for row in result])
+    return {
+        "whole_list_ms": round(timings["whole_list"][0] * 1000, 2),
+        "queue_ms": round(timings["queue"][0] * 1000, 2),
+        "identical": timings["whole_list"][1] == timings["queue"][1],
+    }
+
+def drain(session_factory, workers: int, batch: int) -> dict:
+    from app.services.maintenance_service import claim_maintenance_requests
+
+    claims = [[] for _ in range(workers)]
+    failures, out_of_order = [], []
+
+    def caretaker(index: int):
+        db = session_factory()
+        try:
+            while True:
+                try:
+                    claimed = claim_maintenance_requests(db, claimed_by=index + 1, limit=batch)
+                except Exception as exc:  # Lock timeouts and the like
+                    db.rollback()
+                    failures.append(repr(exc))
+                    continue
+                if not claimed:
+                    return
+                if [row["id"] for row in claimed] != [row["id"] for row in sorted(claimed, key=queue_order)]:
+                    out_of_order.append([row["id"] for row in claimed])
+                claims[index].extend(row["id"] for row in claimed)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=caretaker, args=(index,)) for index in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    claimed = [request_id for worker in claims for request_id in worker]
+    return {
+        "claimed": len(claimed),
+        "duplicates": len(claimed) - len(set(claimed)),
+        "per_worker": [len(worker) for worker in claims],
+        "claims_per_second": round(len(claimed) / elapsed),
+        "seconds": round(elapsed, 2),
+        "lock_failures": len(failures),
+        "failure_examples": failures[:3],
+        "out_of_order_batches": len(out_of_order),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--leases", type=int, default=2_000)
+    parser.add_argument("--landlords", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--busy-timeout-ms", type=int, default=60_000)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-queue-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'queue.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from sqlalchemy import event, func
+    from app.cli import main as cli
+    from app.core.database import SessionLocal, get_engine
+    from app.models import MaintenanceRequest
+    from app.models.maintenance import MaintenanceStatus
+
+    engine = get_engine()
+    if engine.dialect.name == "sqlite":
+        # SQLite serializes writers and its busy handler is not fair, so with
+        # many claimers one can starve past the default five seconds
+        @event.listens_for(engine, "connect")
+        def _busy_timeout(connection, _):
+            connection.execute(f"PRAGMA busy_timeout = {args.busy_timeout_ms}")
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        seed(db, args.leases, args.landlords)
+        seed_requests(db, args.requests, args.leases, args.landlords)
+    finally:
+        db.close()
+
+    report = {"requests": args.requests, "workers": args.workers, "batch": args.batch}
+    report["next_jobs"] = read_next(SessionLocal, 1, args.batch, args.repeat)
+    report["drain"] = drain(SessionLocal, args.workers, args.batch)
+
+    db = SessionLocal()
+    try:
+        pending = db.query(func.count(MaintenanceRequest.id)).filter(
+            MaintenanceRequest.status == MaintenanceStatus.PENDING
+        ).scalar()
+    finally:
+        db.close()
+    report["drain"]["left_pending"] = pending
+
+    drained = report["drain"]
+    ok = report["next_jobs"]["identical"] and drained["claimed"] == args.requests and not drained["duplicates"]
+    ok = ok and not drained["lock_failures"] and not drained["out_of_order_batches"] and not pending
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+# benchmarks/mpesa_import.py
+"""Measure M-Pesa statement import throughput on SQLite.
+
+Writes a synthetic statement CSV for a seeded portfolio (including failed
+transactions, unknown accounts and repeated receipts), imports it twice
+through ``import_mpesa_statement`` and reports rows per minute and the
+peak memory of the second pass. The second pass must find every receipt already recorded. Exits
+non-zero below ``--min-rows-per-minute``.
+
+    python -m benchmarks.mpesa_import --rows 200000
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+def seed(db, units: int) -> list:
+    from app.models import Assignment, Property, Unit, User
+    from app.models.unit import UnitStatus
+    from app.models.user import UserRole
+
+    landlord = User(
+        first_name="Land", last_name="Lord", email="landlord@example.com", phone_number="0700000000",
+        id_number="L0000001", hashed_password="x", role=UserRole.LANDLORD
+    )
+    db.add(landlord)
+    db.flush()
+    property = Property(name="Court", address="Ngong Road", city="Nairobi", county="Nairobi", landlord_id=landlord.id)
+    db.add(property)
+    db.flush()
+
+    accounts = []
+    for u in range(units):
+        tenant = User(
+            first_name="Tenant", last_name=str(u), email=f"tenant{u}@example.com", phone_number="0700000000",
+            id_number=f"T{u:07d}", hashed_password="x", role=UserRole.TENANT
+        )
+        unit = Unit(unit_number=f"A{u}", bedrooms=1, bathrooms=1, monthly_rent=15000, status=UnitStatus.OCCUPIED, property_id=property.id)
+        db.add_all([tenant, unit])
+        db.flush()
+        assignment = Assignment(
+            unit_id=unit.id, tenant_id=tenant.id, start_date=date(2024, 1, 1), end_date=date(2026, 12, 31),
+            monthly_rent=15000, security_deposit=15000, payment_due_day=5
+        )
+        db.add(assignment)
+        db.flush()
+        # Half the tenants pay with the lease id, half with the unit number
+        accounts.append(str(assignment.id) if u % 2 else unit.unit_number)
+    db.commit()
+    return accounts
+
+def row_kind(i: int) -> str:
+    if i % 50 == 49:
+        return "failed"
+    if i % 97 == 96:
+        return "unknown_account"
+    # Repeats the previous receipt, when that one was recorded
+    if i % 101 == 100 and row_kind(i - 1) == "inserted":
+        return "duplicate"
+    return "inserted"
+
+def write_statement(path: str, rows: int, accounts: list) -> dict:
+    expected = {"inserted": 0, "duplicates": 0, "rejected": 0}
+    started = datetime(2026, 1, 1)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Receipt No.", "Completion Time", "Details", "Transaction Status", "Paid In", "Withdrawn", "Balance", "Account No."])
+        for i in range(rows):
+            completed = (started + timedelta(seconds=i * 13)).strftime("%Y-%m-%d %H:%M:%S")
+            reference, account, state = f"R{i:09d}", accounts[i % len(accounts)], "Completed"
+            kind = row_kind(i)
+            if kind == "failed":
+                state = "Failed"
+            elif kind == "unknown_account":
+                account = "UNKNOWN"
+            elif kind == "duplicate":
+                reference = f"R{i - 1:09d}"
+            expected["inserted" if kind == "inserted" else "duplicates" if kind == "duplicate" else "rejected"] += 1
+            writer.writerow([reference, completed, "Pay Bill from 2547XXXXXXXX", state, "15,000.00", "", "", account])
+    return expected
+
+def run_import(path: str, trace_memory: bool = False) -> tuple:
+    from app.core.database import SessionLocal
+    from app.services.mpesa_service import import_mpesa_statement
+
+    db = SessionLocal()
+    try:
+        if trace_memory:
+            tracemalloc.start()
+        started = time.perf_counter()
+        with open(path, encoding="utf-8-sig", newline="") as lines:
+            result = import_mpesa_statement(db, lines)
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        tracemalloc.stop()
+    finally:
+        db.close()
+    return result, elapsed, peak
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--units", type=int, default=500)
+    parser.add_argument("--min-rows-per-minute", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-import-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'import.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from app.cli import main as cli
+    from app.core.database import SessionLocal
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        accounts = seed(db, args.units)
+    finally:
+        db.close()
+
+    path = os.path.join(workdir, "statement.csv")
+    expected = write_statement(path, args.rows, accounts)
+
+    # Timed without tracemalloc, which slows allocation-heavy code severalfold;
+    # the re-import (all duplicates) measures peak memory instead
+    first, elapsed, _ = run_import(path)
+    second, _, peak = run_import(path, trace_memory=True)
+
+    rows_per_minute = args.rows / elapsed * 60
+    report = {
+        "rows": args.rows,
+        "seconds": round(elapsed, 2),
+        "rows_per_minute": int(rows_per_minute),
+        "peak_memory_mb": round(peak / 2**20, 1),
+        "first_pass": {key: first[key] for key in expected},
+        "expected": expected,
+        "second_pass": {key: second[key] for key in expected},
+    }
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+    ok = (
+        report["first_pass"] == expected
+        and second["inserted"] == 0
+        and second["duplicates"] == expected["inserted"] + expected["duplicates"]
+        and rows_per_minute >= args.min_rows_per_minute
+    )
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
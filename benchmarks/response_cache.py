@@ -0,0 +1,266 @@
+# benchmarks/response_cache.py
+"""Check the list response cache for staleness and measure its hit ratio.
+
+Bulk-loads ``--leases`` leases over ``--landlords`` landlords, invoices a
+month, then runs the same seeded mix of list reads and writes (receipts,
+payment status changes, maintenance requests and their status, renamed
+properties, unit status changes, tenant renames) through the app three
+times: with caching disabled, with the in-process LRU and with the shared
+backend on ``LocalRedis``, an in-memory stand-in for a Redis server. Every
+cached read is checked against the same read with the cache bypassed.
+Exits non-zero on any stale or differing read.
+
+    python -m benchmarks.response_cache --requests 5000 --write-ratio 0.05
+"""
+import argparse
+import fnmatch
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.invoice_generation import seed
+
+class LocalRedis:
+    """The redis-py commands RedisBackend uses, over plain dicts."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.lock = threading.RLock()
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value if isinstance(value, bytes) else str(value).encode()
+        return True
+
+    def incr(self, key):
+        with self.lock:
+            value = int(self.values.get(key, b"0")) + 1
+            self.values[key] = str(value).encode()
+            return value
+
+    def sadd(self, key, *members):
+        members = {member.encode() if isinstance(member, str) else member for member in members}
+        added = members - self.sets.setdefault(key, set())
+        self.sets[key] |= members
+        return len(added)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, ()))
+
+    def expire(self, key, seconds):
+        return key in self.values or key in self.sets
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            removed += (self.values.pop(key, None) is not None) + (self.sets.pop(key, None) is not None)
+        return removed
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.values) + list(self.sets) if fnmatch.fnmatchcase(key, match)]
+
+    def register_script(self, script):
+        # Only RedisBackend's store script runs here; as in Redis, nothing
+        # else interleaves with it
+        from app.core.response_cache import RedisBackend
+        assert script == RedisBackend.STORE_SCRIPT
+
+        def store(keys, args):
+            generation_key, entry_key, *tag_keys = keys
+            generation, value, ttl, key = args
+            with self.lock:
+                if int(self.values.get(generation_key, b"0")) != int(generation):
+                    return 0
+                self.set(entry_key, value, ex=ttl)
+                for tag_key in tag_keys:
+                    self.sadd(tag_key, key)
+                    self.expire(tag_key, ttl)
+                return 1
+        return store
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def principals(leases: int, landlords: int) -> tuple:
+    from app.core.security import create_access_token
+
+    def headers(user_id):
+        return {"Authorization": f"Bearer {create_access_token(user_id)}"}
+
+    # Ids as laid out by invoice_generation.seed: landlords first, then one
+    # tenant per lease; lease i is unit i + 1 of property i % landlords + 1
+    landlord_headers = [headers(l + 1) for l in range(landlords)]
+    tenants = [(headers(landlords + 1 + i), i + 1, i + 1) for i in range(leases)]
+    return landlord_headers, tenants
+
+WRITE_WEIGHTS = {
+    "receipt": 8, "payment_status": 4, "maintenance": 4, "maintenance_status": 2, "unit": 2, "property": 1, "tenant": 1,
+}
+
+def workload(seed_value: int, requests: int, write_ratio: float, leases: int, landlords: int):
+    """The same sequence of ("read"|"write", ...) operations for every run."""
+    rng = random.Random(seed_value)
+    for _ in range(requests):
+        if rng.random() < write_ratio:
+            # Renames flush whole namespaces and are rare next to payments
+            kind = rng.choices(tuple(WRITE_WEIGHTS), weights=tuple(WRITE_WEIGHTS.values()))[0]
+            yield ("write", kind, rng.randrange(leases))
+        elif rng.random() < 0.5:
+            yield ("read", rng.choice((
+                "/properties/", "/properties/{property}/units/", "/assignments/landlord/assignments",
+                "/payments/landlord/payments", "/maintenance/landlord/requests"
+            )), rng.randrange(landlords), rng.choice((10, 50)))
+        else:
+            yield ("read", rng.choice((
+                "/assignments/tenant/assignments", "/payments/tenant/payments", "/maintenance/tenant/requests"
+            )), rng.randrange(leases), rng.choice((10, 50)))
+
+def write(client, prefix, kind, lease, landlord_headers, tenants, landlords, state):
+    from app.core.database import SessionLocal
+    from app.models.unit import UnitStatus
+    from app.services.property_service import update_property
+    from app.services.unit_service import update_unit_status
+    from app.services.user_service import update_user
+
+    headers, assignment_id, unit_id = tenants[lease]
+    owner = landlord_headers[lease % landlords]
+    if kind == "receipt":
+        response = client.post(f"{prefix}/payments/", json={
+            "amount": 500, "for_month": "2026-02", "for_year": 2026, "assignment_id": assignment_id
+        }, headers=headers)
+        state["payments"].append(response.json()["id"])
+    elif kind == "payment_status" and state["payments"]:
+        payment_id = random.Random(lease).choice(state["payments"])
+        response = client.put(f"{prefix}/payments/{payment_id}/status", params={
+            "status": random.Random(lease).choice(("pending", "paid"))
+        }, headers=owner)
+    elif kind == "maintenance":
+        response = client.post(f"{prefix}/maintenance/", json={
+            "issue_type": "plumbing", "description": "Leaking tap", "unit_id": unit_id
+        }, headers=headers)
+        state["requests"].append(response.json()["id"])
+    elif kind == "maintenance_status" and state["requests"]:
+        response = client.put(f"{prefix}/maintenance/{state['requests'][-1]}/status", params={
+            "status": "in_progress"
+        }, headers=owner)
+    else:
+        # Writes without an endpoint go through the services directly
+        db = SessionLocal()
+        try:
+            state["renames"] += 1
+            if kind == "property":
+                update_property(db, lease % landlords + 1, {"name": f"Court {state['renames']}"})
+            elif kind == "unit":
+                update_unit_status(db, unit_id, UnitStatus.MAINTENANCE if state["renames"] % 2 else UnitStatus.OCCUPIED)
+            elif kind == "tenant":
+                update_user(db, landlords + 1 + lease, {"first_name": f"Renamed{state['renames']}"})
+        finally:
+            db.close()
+        return
+    assert response.status_code == 200, (kind, response.status_code, response.text)
+
+def run(client, backend, args, landlord_headers, tenants) -> dict:
+    from app.core.config import settings
+    from app.core.response_cache import NullBackend, response_cache
+
+    prefix = settings.API_V1_STR
+    response_cache.backend = backend
+    response_cache.hits = response_cache.misses = response_cache.invalidations = 0
+    uncached = NullBackend()
+    state = {"payments": [], "requests": [], "renames": 0}
+    latencies, stale = [], []
+
+    for operation in workload(args.seed, args.requests, args.write_ratio, args.leases, args.landlords):
+        if operation[0] == "write":
+            write(client, prefix, operation[1], operation[2], landlord_headers, tenants, args.landlords, state)
+            continue
+
+        _, path, who, limit = operation
+        headers = landlord_headers[who] if "tenant" not in path else tenants[who][0]
+        url = prefix + path.format(property=who + 1) + f"?limit={limit}"
+        started = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - started)
+        assert response.status_code == 200, (url, response.status_code, response.text)
+
+        if not isinstance(backend, NullBackend):
+            # The same read with the cache out of the way, counters untouched
+            counters = response_cache.hits, response_cache.misses
+            response_cache.backend = uncached
+            expected = client.get(url, headers=headers)
+            response_cache.backend = backend
+            response_cache.hits, response_cache.misses = counters
+            if response.json() != expected.json():
+                stale.append(url)
+
+    stats = response_cache.stats()
+    return {
+        "reads": len(latencies),
+        "read_ms_mean": round(statistics.mean(latencies) * 1000, 3),
+        "read_ms_p50": round(percentile(latencies, 50) * 1000, 3),
+        "read_ms_p95": round(percentile(latencies, 95) * 1000, 3),
+        "hit_ratio": stats["hit_ratio"],
+        "invalidations": stats["invalidations"],
+        "evictions": stats["evictions"],
+        "stale_reads": len(stale),
+        "stale_examples": stale[:5],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leases", type=int, default=50)
+    parser.add_argument("--landlords", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--write-ratio", type=float, default=0.05)
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-cache-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'cache.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from fastapi.testclient import TestClient
+    from app.cli import main as cli
+    from app.core.config import settings
+    from app.core.database import SessionLocal
+    from app.core.response_cache import MemoryBackend, NullBackend, RedisBackend
+    from app.main import app
+    from app.services.billing_service import generate_monthly_invoices
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        seed(db, args.leases, args.landlords)
+        generate_monthly_invoices(db, "2026-02")
+    finally:
+        db.close()
+
+    landlord_headers, tenants = principals(args.leases, args.landlords)
+    ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+    backends = {
+        "disabled": NullBackend(),
+        "memory": MemoryBackend(args.cache_size, ttl),
+        "redis_stand_in": RedisBackend(LocalRedis(), ttl),
+    }
+    report, ok = {"requests": args.requests, "write_ratio": args.write_ratio}, True
+    with TestClient(app) as client:
+        for name, backend in backends.items():
+            report[name] = run(client, backend, args, landlord_headers, tenants)
+            ok = ok and report[name]["stale_reads"] == 0
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+# benchmarks/search.py
+"""Measure full-text search latency over about a million indexed documents.
+
+Bulk-loads ``--landlords`` landlords, each with ``--properties`` properties
+of ``--units`` let units (the defaults give 10,000 properties, 500,000
+units and 500,000 tenants), builds the index with ``rebuild_search_index``
+and then runs a seeded mix of landlord-scoped searches through the
+service: name prefixes, full names, phone numbers in the other format,
+ID numbers, unit numbers with the property and towns. Every result must
+belong to the searching landlord and every exact lookup must find its
+target. Unscoped (admin) searches are timed separately. Exits non-zero
+on a wrong result or if the scoped p99 is over ``--p99-ms``.
+
+    python -m benchmarks.search --landlords 500 --queries 5000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+
+FIRST_NAMES = [
+    "Wanjiku", "Achieng", "Njeri", "Akinyi", "Wambui", "Atieno", "Nyambura", "Chebet", "Mumbua", "Kerubo",
+    "Kamau", "Otieno", "Mwangi", "Odhiambo", "Kiprop", "Mutua", "Kariuki", "Ochieng", "Wafula", "Njoroge",
+    "Grace", "Mercy", "Faith", "Joy", "Esther", "Brian", "Kevin", "Dennis", "Collins", "Victor",
+]
+LAST_NAMES = [
+    "Kamau", "Otieno", "Mwangi", "Odhiambo", "Kiprotich", "Mutua", "Kariuki", "Ochieng", "Wafula", "Njoroge",
+    "Wanyama", "Chege", "Onyango", "Kimani", "Muthoni", "Barasa", "Koech", "Omondi", "Macharia", "Rotich",
+]
+ESTATES = [
+    "Kilimani", "Lavington", "Kileleshwa", "Westlands", "Parklands", "Runda", "Karen", "Langata", "Embakasi",
+    "Kasarani", "Ruaka", "Syokimau", "Ngong", "Rongai", "Kitengela", "Nyali", "Bamburi", "Milimani",
+]
+BUILDINGS = ["Court", "Heights", "Gardens", "Apartments", "Towers", "Residence", "Villas", "Place"]
+TOWNS = [("Nairobi", "Nairobi"), ("Kiambu", "Kiambu"), ("Mombasa", "Mombasa"), ("Kisumu", "Kisumu"), ("Nakuru", "Nakuru")]
+
+def phone(rng) -> str:
+    digits = f"7{rng.randrange(10**8):08d}"
+    # Stored as people type them: local, or international with separators
+    if rng.random() < 0.5:
+        return "0" + digits
+    return f"+254 {digits[:3]}-{digits[3:6]} {digits[6:]}"
+
+def seed(db, landlords: int, properties: int, units: int, seed_value: int) -> dict:
+    """Insert the portfolio with known ids and return what the queries draw on."""
+    from app.models import Assignment, Property, Unit, User
+    from app.models.unit import UnitStatus
+    from app.models.user import UserRole
+
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    stamps = {"created_at": now, "updated_at": now}
+    account = {"hashed_password": "x", "is_active": True}
+
+    db.execute(User.__table__.insert(), [
+        dict(account, id=l + 1, first_name="Landlord", last_name=f"L{l}", email=f"landlord{l}@example.com",
+             phone_number="0700000000", id_number=f"L{l:07d}", role=UserRole.LANDLORD, **stamps)
+        for l in range(landlords)
+    ])
+
+    portfolio = {"landlords": [], "property_landlord": {}, "unit_landlord": {}, "tenant_landlord": {}}
+    property_rows, unit_rows, tenant_rows, lease_rows = [], [], [], []
+    for l in range(landlords):
+        owned = {"properties": [], "units": [], "tenants": []}
+        for _ in range(properties):
+            property_id = len(property_rows) + 1
+            town, county = rng.choice(TOWNS)
+            name = f"{rng.choice(ESTATES)} {rng.choice(BUILDINGS)}"
+            property_rows.append(dict(
+                id=property_id, name=name, address=f"{rng.randrange(1, 400)} {rng.choice(ESTATES)} Road",
+                city=town, county=county, landlord_id=l + 1, **stamps
+            ))
+            owned["properties"].append((property_id, name, town))
+            portfolio["property_landlord"][property_id] = l + 1
+            for u in range(units):
+                unit_id = len(unit_rows) + 1
+                tenant_id = landlords + unit_id
+                unit_number = f"{'ABCDEFGH'[u % 8]}{u // 8 + 1}"
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                number = phone(rng)
+                unit_rows.append(dict(
+                    id=unit_id, unit_number=unit_number, bedrooms=2, bathrooms=1, monthly_rent=20000,
+                    status=UnitStatus.OCCUPIED, property_id=property_id, **stamps
+                ))
+                tenant_rows.append(dict(
+                    account, id=tenant_id, first_name=first, last_name=last, email=f"tenant{unit_id}@example.com",
+                    phone_number=number, id_number=f"{20_000_000 + unit_id}", role=UserRole.TENANT, **stamps
+                ))
+                lease_rows.append(dict(
+                    id=unit_id, unit_id=unit_id, tenant_id=tenant_id, start_date=date(2026, 1, 1),
+                    end_date=date(2026, 12, 31), monthly_rent=20000, security_deposit=20000, payment_due_day=5,
+                    is_active=True, **stamps
+                ))
+                owned["units"].append((unit_id, unit_number, name))
+                owned["tenants"].append((tenant_id, first, last, number, f"{20_000_000 + unit_id}"))
+                portfolio["unit_landlord"][unit_id] = l + 1
+                portfolio["tenant_landlord"][tenant_id] = l + 1
+        portfolio["landlords"].append(owned)
+
+    chunk = 50_000
+    for table, rows in (
+        (Property.__table__, property_rows), (User.__table__, tenant_rows),
+        (Unit.__table__, unit_rows), (Assignment.__table__, lease_rows)
+    ):
+        for start in range(0, len(rows), chunk):
+            db.execute(table.insert(), rows[start:start + chunk])
+    db.commit()
+    return portfolio
+
+def other_format(number: str) -> str:
+    digits = "".join(ch for ch in number if ch.isdigit())
+    return "+254 " + digits[1:] if digits.startswith("0") else "0" + digits[3:]
+
+def workload(portfolio: dict, queries: int, seed_value: int):
+    """(name, landlord_id, q, expected (kind, id) or None) for each search."""
+    rng = random.Random(seed_value)
+    for _ in range(queries):
+        landlord = rng.randrange(len(portfolio["landlords"]))
+        owned = portfolio["landlords"][landlord]
+        tenant_id, first, last, number, id_number = rng.choice(owned["tenants"])
+        unit_id, unit_number, property_name = rng.choice(owned["units"])
+        property_id, name, town = rng.choice(owned["properties"])
+        name_, q, expected = rng.choice([
+            ("name_prefix", first[:3], None),
+            ("full_name", f"{first} {last}", None),
+            ("phone", other_format(number), ("tenant", tenant_id)),
+            ("id_number", id_number, ("tenant", tenant_id)),
+            ("unit", f"{unit_number} {property_name}", ("unit", unit_id)),
+            ("property", name.split()[0], None),
+            ("town", town, None),
+        ])
+        yield name_, landlord + 1, q, expected
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summary(latencies) -> dict:
+    return {
+        "queries": len(latencies),
+        "ms_p50": round(percentile(latencies, 50) * 1000, 2),
+        "ms_p95": round(percentile(latencies, 95) * 1000, 2),
+        "ms_p99": round(percentile(latencies, 99) * 1000, 2),
+        "ms_max": round(max(latencies) * 1000, 2),
+        "ms_mean": round(statistics.mean(latencies) * 1000, 2),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--landlords", type=int, default=500)
+    parser.add_argument("--properties", type=int, default=20, help="per landlord")
+    parser.add_argument("--units", type=int, default=50, help="per property, each let to its own tenant")
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--admin-queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--p99-ms", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-search-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'search.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from sqlalchemy import func
+    from app.cli import main as cli
+    from app.core.database import SessionLocal
+    from app.models import SearchDocument
+    from app.services.search_service import rebuild_search_index, search
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        portfolio = seed(db, args.landlords, args.properties, args.units, args.seed)
+        started = time.perf_counter()
+        indexed = rebuild_search_index(db)
+        report = {
+            "documents": db.scalar(func.count(SearchDocument.id)),
+            "indexed": indexed,
+            "index_build_seconds": round(time.perf_counter() - started, 1),
+        }
+        # Planner statistics, as a long-running database would have them
+        db.connection().exec_driver_sql("ANALYZE")
+        db.commit()
+
+        owners = {"property": portfolio["property_landlord"], "unit": portfolio["unit_landlord"],
+                  "tenant": portfolio["tenant_landlord"]}
+        operations = list(workload(portfolio, args.queries, args.seed))
+        # Warm the page cache with a pass over a slice of the mix
+        for _, landlord_id, q, _ in operations[:200]:
+            search(db, q, landlord_id, limit=args.limit)
+
+        by_kind, latencies, leaked, missed, empty = {}, [], [], [], 0
+        for name, landlord_id, q, expected in operations:
+            started = time.perf_counter()
+            results = search(db, q, landlord_id, limit=args.limit)
+            elapsed = time.perf_counter() - started
+            latencies.append(elapsed)
+            by_kind.setdefault(name, []).append(elapsed)
+            empty += not results
+            leaked += [(q, r["kind"], r["id"]) for r in results if owners[r["kind"]][r["id"]] != landlord_id]
+            if expected and expected not in [(r["kind"], r["id"]) for r in results]:
+                missed.append((name, landlord_id, q))
+
+        admin = []
+        for _, _, q, _ in operations[:args.admin_queries]:
+            started = time.perf_counter()
+            search(db, q, None, limit=args.limit)
+            admin.append(time.perf_counter() - started)
+    finally:
+        db.close()
+
+    report["scoped"] = summary(latencies)
+    report["scoped"].update({"empty_results": empty, "out_of_scope_results": len(leaked), "missed_lookups": len(missed)})
+    report["scoped"]["examples"] = {"leaked": leaked[:3], "missed": missed[:3]}
+    report["by_query"] = {name: summary(samples) for name, samples in sorted(by_kind.items())}
+    report["unscoped_admin"] = summary(admin)
+    ok = not leaked and not missed and report["scoped"]["ms_p99"] <= args.p99_ms
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# benchmarks/startup.py
+"""Measure cold import time of ``app.main:app`` and its first-request latency.
+
+Each sample runs in a fresh interpreter so nothing is cached between runs.
+The database is migrated once up front; importing the app must not touch
+it, so the first request that needs the database pays for engine creation.
+
+    python -m benchmarks.startup --runs 10
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = r"""
+import json, time
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+import asyncio, httpx
+from app.core.config import settings
+
+async def first_requests():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        t0 = time.perf_counter()
+        await client.get("/health")
+        t1 = time.perf_counter()
+        # Unknown user: one indexed lookup, no bcrypt
+        await client.post(f"{settings.API_V1_STR}/auth/login", data={"username": "nobody@example.com", "password": "x"})
+        t2 = time.perf_counter()
+    return t1 - t0, t2 - t1
+
+health, database = asyncio.run(first_requests())
+print(json.dumps({"import": imported - started, "first_health": health, "first_db_request": database}))
+"""
+
+def summarize(samples):
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 1),
+        "min_ms": round(min(samples) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-startup-")
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'startup.db')}")
+    env.setdefault("SECRET_KEY", "benchmark")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    subprocess.run([sys.executable, "-m", "app.cli", "migrate"], cwd=root, env=env, check=True, capture_output=True)
+
+    samples = {"import": [], "first_health": [], "first_db_request": []}
+    for _ in range(args.runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=root, env=env, check=True, capture_output=True, text=True
+        ).stdout
+        for key, value in json.loads(output.strip().splitlines()[-1]).items():
+            samples[key].append(value)
+
+    json.dump({"runs": args.runs, **{key: summarize(values) for key, values in samples.items()}}, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+# benchmarks/vacancy_search.py
+"""Time faceted vacancy search over a synthetic portfolio of 500,000 units.
+
+Bulk-loads ``--properties`` properties of ``--units`` units each across
+Kenyan counties and towns, with realistic layouts and rents and about
+``--vacant`` of them vacant, builds ``vacancy_facets`` and then runs
+``--queries`` seeded searches mixing county, town, bedroom, bathroom and
+rent filters. Each search reads the first page and the next one through
+the cursor plus the facet counts, as the endpoint does.
+
+Facet counts from the maintained table are compared with the same counts
+taken from the units table, one grouped query per facet, and timed against
+both that and one COUNT per facet value. Every listed unit must be vacant
+and pass the filters, and a page's size must agree with the total. A mix of
+status flips, new units and property moves through the services must leave
+the table equal to a rebuild. Exits non-zero on any mismatch or if the
+p99 of a search is over ``--p99-ms``.
+
+    python -m benchmarks.vacancy_search --properties 10000 --units 50 --queries 1000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+# County -> towns listed in it
+TOWNS = {
+    "Nairobi": ["Nairobi", "Karen", "Westlands", "Embakasi", "Kasarani"],
+    "Kiambu": ["Ruaka", "Thika", "Kikuyu", "Juja"],
+    "Kajiado": ["Kitengela", "Ngong", "Rongai"],
+    "Machakos": ["Syokimau", "Athi River", "Machakos"],
+    "Mombasa": ["Nyali", "Bamburi", "Mombasa"],
+    "Kisumu": ["Kisumu", "Milimani"],
+    "Nakuru": ["Nakuru", "Naivasha"],
+    "Uasin Gishu": ["Eldoret"],
+    "Kilifi": ["Malindi", "Kilifi"],
+    "Nyeri": ["Nyeri"],
+}
+# Prime towns command higher rents
+TOWN_FACTOR = {"Karen": 2.2, "Westlands": 2.0, "Nyali": 1.8, "Nairobi": 1.5, "Ruaka": 1.2, "Kilimani": 1.6}
+# Bedrooms (0 for bedsitters) -> (share of units, typical rent, bathroom choices)
+LAYOUTS = {
+    0: (0.20, 9_000, [1.0]),
+    1: (0.30, 16_000, [1.0]),
+    2: (0.28, 28_000, [1.0, 1.5, 2.0]),
+    3: (0.16, 45_000, [2.0, 2.5, 3.0]),
+    4: (0.06, 75_000, [3.0, 3.5, 4.0]),
+}
+
+def seed(db, properties: int, units: int, vacant: float, seed_value: int) -> None:
+    from app.models import Property, Unit, User
+    from app.models.unit import UnitStatus
+    from app.models.user import UserRole
+
+    rng = random.Random(seed_value)
+    now = datetime.utcnow()
+    stamps = {"created_at": now, "updated_at": now}
+    landlords = max(1, properties // 20)
+    db.execute(User.__table__.insert(), [
+        dict(id=l + 1, first_name="Landlord", last_name=f"L{l}", email=f"landlord{l}@example.com",
+             phone_number="0700000000", id_number=f"L{l:07d}", role=UserRole.LANDLORD, hashed_password="x",
+             is_active=True, **stamps)
+        for l in range(landlords)
+    ])
+
+    counties = list(TOWNS)
+    bedrooms = list(LAYOUTS)
+    property_rows, unit_rows = [], []
+    for p in range(properties):
+        # Skewed towards the big counties, as listings are
+        county = counties[min(int(rng.expovariate(0.35)), len(counties) - 1)]
+        town = rng.choice(TOWNS[county])
+        property_rows.append(dict(
+            id=p + 1, name=f"Court {p}", address=f"{rng.randrange(1, 400)} Road", city=town, county=county,
+            landlord_id=p % landlords + 1, **stamps
+        ))
+        # A block has one or two layouts
+        layouts = rng.choices(bedrooms, weights=[LAYOUTS[b][0] for b in bedrooms], k=2)
+        for u in range(units):
+            beds = layouts[u % 2]
+            share, typical, baths = LAYOUTS[beds]
+            rent = round(typical * TOWN_FACTOR.get(town, 1.0) * rng.uniform(0.8, 1.3) / 500) * 500
+            created = now - timedelta(seconds=rng.randrange(3 * 365 * 86400))
+            status = UnitStatus.VACANT if rng.random() < vacant else (
+                UnitStatus.MAINTENANCE if rng.random() < 0.03 else UnitStatus.OCCUPIED
+            )
+            unit_rows.append(dict(
+                id=len(unit_rows) + 1, unit_number=f"{'ABCD'[u % 4]}{u // 4 + 1}", bedrooms=beds,
+                bathrooms=rng.choice(baths), monthly_rent=rent, status=status, property_id=p + 1,
+                created_at=created, updated_at=created
+            ))
+
+    chunk = 50_000
+    for table, rows in ((Property.__table__, property_rows), (Unit.__table__, unit_rows)):
+        for start in range(0, len(rows), chunk):
+            db.execute(table.insert(), rows[start:start + chunk])
+    db.commit()
+
+def workload(queries: int, seed_value: int):
+    """Filter sets as a listings site sends them; some are empty."""
+    rng = random.Random(seed_value)
+    for _ in range(queries):
+        filters = {}
+        county = rng.choice(list(TOWNS))
+        if rng.random() < 0.7:
+            filters["county"] = [county] if rng.random() < 0.85 else rng.sample(list(TOWNS), 2)
+        if rng.random() < 0.3:
+            filters["city"] = [rng.choice(TOWNS[county])]
+        if rng.random() < 0.6:
+            filters["bedrooms"] = rng.sample(list(LAYOUTS), rng.choice([1, 1, 2]))
+        if rng.random() < 0.2:
+            filters["bathrooms"] = [rng.choice([1.0, 1.5, 2.0, 3.0])]
+        if rng.random() < 0.5:
+            low = rng.choice([None, 5_000, 10_000, 20_000, 30_000])
+            high = rng.choice([None, 15_000, 25_000, 40_000, 60_000, 100_000])
+            if low is not None:
+                filters["min_rent"] = low
+            if high is not None:
+                filters["max_rent"] = high
+        yield filters
+
+def reference_facets(db, filters: dict) -> dict:
+    """The facets counted from the units table: one grouped query per facet."""
+    from sqlalchemy import func
+    from app.models import Property, Unit
+    from app.models.unit import UnitStatus
+    from app.services.vacancy_service import FACETS, LISTING_COLUMNS, _conditions, _facet_values, _rent_band
+
+    conditions = _conditions(LISTING_COLUMNS, **filters)
+    base = db.query(Unit.id).join(Property, Property.id == Unit.property_id).filter(Unit.status == UnitStatus.VACANT)
+    total = base.filter(*conditions.values()).count()
+    facets = {}
+    for name in FACETS:
+        value = _rent_band(Unit.monthly_rent) if name == "rent" else LISTING_COLUMNS[name]
+        others = [condition for other, condition in conditions.items() if other != name]
+        rows = db.query(value, func.count(Unit.id)).join(Property, Property.id == Unit.property_id).filter(
+            Unit.status == UnitStatus.VACANT, *others
+        ).group_by(value)
+        facets[name] = _facet_values(name, Counter(dict(rows.all())))
+    return {"total": total, "facets": facets}
+
+def per_value_counts(db, filters: dict, facets: dict) -> None:
+    """What the maintained table replaces: one COUNT per facet value."""
+    from app.models import Property, Unit
+    from app.models.unit import UnitStatus
+    from app.services.vacancy_service import LISTING_COLUMNS, _conditions
+
+    conditions = _conditions(LISTING_COLUMNS, **filters)
+    for name, values in facets.items():
+        others = [condition for other, condition in conditions.items() if other != name]
+        for value in values:
+            if name == "rent":
+                column = Unit.monthly_rent
+                match = [column >= value["min_rent"]] + ([column < value["max_rent"]] if value["max_rent"] else [])
+            else:
+                match = [LISTING_COLUMNS[name] == value["value"]]
+            db.query(Unit.id).join(Property, Property.id == Unit.property_id).filter(
+                Unit.status == UnitStatus.VACANT, *others, *match
+            ).count()
+
+def listed_correctly(page: list, filters: dict, vacant: set) -> bool:
+    for unit in page:
+        if unit["id"] not in vacant:
+            return False
+        checks = [
+            ("county", unit["county"]), ("city", unit["city"]),
+            ("bedrooms", unit["bedrooms"]), ("bathrooms", unit["bathrooms"]),
+        ]
+        if any(filters.get(name) and value not in filters[name] for name, value in checks):
+            return False
+        if unit["monthly_rent"] < filters.get("min_rent", 0) or unit["monthly_rent"] > filters.get("max_rent", 1e12):
+            return False
+    return True
+
+def churn(db, operations: int, seed_value: int) -> dict:
+    """Random vacancy changes through the services, then compare with a rebuild."""
+    from sqlalchemy import func, select
+    from app.models import Property, Unit, VacancyFacet
+    from app.models.unit import UnitStatus
+    from app.schemas.unit import UnitCreate
+    from app.services.property_service import update_property
+    from app.services.unit_service import create_units, update_unit_status
+    from app.services.vacancy_service import rebuild_vacancy_facets
+
+    rng = random.Random(seed_value)
+    units = db.scalar(func.max(Unit.id))
+    properties = db.scalar(func.max(Property.id))
+    done = Counter()
+    for _ in range(operations):
+        roll = rng.random()
+        if roll < 0.85:
+            update_unit_status(db, rng.randrange(1, units + 1), rng.choice(list(UnitStatus)))
+            done["status_changes"] += 1
+        elif roll < 0.95:
+            beds = rng.choice(list(LAYOUTS))
+            create_units(db, [
+                UnitCreate(unit_number=f"N{i}", bedrooms=beds, bathrooms=LAYOUTS[beds][2][0],
+                           monthly_rent=rng.choice([7_500, 12_345, 28_000]))
+                for i in range(rng.randrange(1, 5))
+            ], rng.randrange(1, properties + 1))
+            done["units_created"] += 1
+        else:
+            county = rng.choice(list(TOWNS))
+            update_property(db, rng.randrange(1, properties + 1), {"county": county, "city": rng.choice(TOWNS[county])})
+            done["properties_moved"] += 1
+
+    columns = [VacancyFacet.county, VacancyFacet.city, VacancyFacet.bedrooms, VacancyFacet.bathrooms,
+               VacancyFacet.rent_band, VacancyFacet.vacant_units]
+    maintained = {tuple(row[:5]): row[5] for row in db.execute(select(*columns)) if row[5]}
+    rebuild_vacancy_facets(db)
+    rebuilt = {tuple(row[:5]): row[5] for row in db.execute(select(*columns))}
+    db.rollback()
+    return dict(done, identical_to_rebuild=maintained == rebuilt)
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+def summary(latencies) -> dict:
+    return {
+        "ms_p50": round(percentile(latencies, 50) * 1000, 2),
+        "ms_p95": round(percentile(latencies, 95) * 1000, 2),
+        "ms_p99": round(percentile(latencies, 99) * 1000, 2),
+        "ms_mean": round(statistics.mean(latencies) * 1000, 2),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--properties", type=int, default=10_000)
+    parser.add_argument("--units", type=int, default=50, help="per property")
+    parser.add_argument("--vacant", type=float, default=0.12, help="share of units vacant")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--compare", type=int, default=50, help="searches also counted from the units table")
+    parser.add_argument("--churn", type=int, default=2000, help="write operations before the rebuild check")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--p99-ms", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="rentezi-vacancy-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'vacancy.db')}")
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+
+    from sqlalchemy import func
+    from app.cli import main as cli
+    from app.core.database import SessionLocal
+    from app.models import Unit, VacancyFacet
+    from app.models.unit import UnitStatus
+    from app.services.vacancy_service import get_vacancy_facets, rebuild_vacancy_facets, search_vacant_units
+
+    cli(["migrate"])
+    db = SessionLocal()
+    try:
+        seed(db, args.properties, args.units, args.vacant, args.seed)
+        rebuild_vacancy_facets(db)
+        db.commit()
+        # Planner statistics, as a long-running database would have them
+        db.connection().exec_driver_sql("ANALYZE")
+        db.commit()
+
+        vacant = set(db.scalars(db.query(Unit.id).filter(Unit.status == UnitStatus.VACANT).statement))
+        report = {
+            "units": db.scalar(func.count(Unit.id)),
+            "vacant_units": len(vacant),
+            "facet_rows": db.scalar(func.count(VacancyFacet.county)),
+        }
+
+        searches = list(workload(args.queries, args.seed))
+        for filters in searches[:100]:
+            search_vacant_units(db, limit=args.limit, **filters)
+            get_vacancy_facets(db, **filters)
+
+        latencies, parts, wrong = [], {"first_page": [], "next_page": [], "facets": []}, []
+        for filters in searches:
+            started = time.perf_counter()
+            page, cursor = search_vacant_units(db, limit=args.limit, **filters)
+            first = time.perf_counter()
+            following = search_vacant_units(db, cursor, args.limit, **filters)[0] if cursor else []
+            second = time.perf_counter()
+            facets = get_vacancy_facets(db, **filters)
+            done = time.perf_counter()
+            latencies.append(done - started)
+            parts["first_page"].append(first - started)
+            parts["next_page"].append(second - first)
+            parts["facets"].append(done - second)
+            expected = min(facets["total"], args.limit)
+            if len(page) != expected or not listed_correctly(page + following, filters, vacant):
+                wrong.append(filters)
+
+        compared = {"searches": 0, "mismatched": [], "table_ms": [], "grouped_units_ms": [], "per_value_ms": []}
+        for filters in searches[:args.compare]:
+            started = time.perf_counter()
+            facets = get_vacancy_facets(db, **filters)
+            table = time.perf_counter()
+            reference = reference_facets(db, filters)
+            grouped = time.perf_counter()
+            per_value_counts(db, filters, reference["facets"])
+            counted = time.perf_counter()
+            compared["searches"] += 1
+            compared["table_ms"].append(table - started)
+            compared["grouped_units_ms"].append(grouped - table)
+            compared["per_value_ms"].append(counted - grouped)
+            if facets != reference:
+                compared["mismatched"].append(filters)
+
+        report["churn"] = churn(db, args.churn, args.seed)
+    finally:
+        db.close()
+
+    report["searches"] = dict(summary(latencies), queries=len(latencies), wrong_pages=len(wrong), examples=wrong[:3])
+    report["by_part"] = {name: summary(samples) for name, samples in parts.items()}
+    report["facets_vs_units_table"] = {
+        "searches": compared["searches"],
+        "mismatched": len(compared["mismatched"]),
+        "examples": compared["mismatched"][:3],
+        "facet_table_ms_mean": round(statistics.mean(compared["table_ms"]) * 1000, 2),
+        "grouped_units_ms_mean": round(statistics.mean(compared["grouped_units_ms"]) * 1000, 2),
+        "count_per_value_ms_mean": round(statistics.mean(compared["per_value_ms"]) * 1000, 2),
+    }
+    ok = not wrong and not compared["mismatched"] and report["churn"]["identical_to_rebuild"]
+    ok = ok and report["searches"]["ms_p99"] <= args.p99_ms
+
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
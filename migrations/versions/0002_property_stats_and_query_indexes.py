@@ -0,0 +1,87 @@
+"""property stats and query indexes
+
+Adds the property_stats read model (backfilled from units) and the indexes
+behind the list endpoints, including one active assignment per unit.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('property_stats',
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('units_count', sa.Integer(), nullable=False),
+    sa.Column('occupied_units', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('property_id')
+    )
+    op.execute("""
+        INSERT INTO property_stats (property_id, units_count, occupied_units, updated_at)
+        SELECT properties.id,
+               COUNT(units.id),
+               COALESCE(SUM(CASE WHEN units.status = 'OCCUPIED' THEN 1 ELSE 0 END), 0),
+               CURRENT_TIMESTAMP
+        FROM properties LEFT OUTER JOIN units ON units.property_id = properties.id
+        GROUP BY properties.id
+    """)
+
+    # Keep only the newest active lease per unit before enforcing uniqueness
+    op.execute("""
+        UPDATE assignments SET is_active = false
+        WHERE is_active AND EXISTS (
+            SELECT 1 FROM assignments AS newer
+            WHERE newer.unit_id = assignments.unit_id AND newer.is_active AND newer.id > assignments.id
+        )
+    """)
+
+    with op.batch_alter_table('assignments', schema=None) as batch_op:
+        batch_op.create_index('ix_assignments_tenant_created', ['tenant_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_assignments_unit_active', ['unit_id', 'is_active'], unique=False)
+        batch_op.create_index('uq_assignments_active_unit', ['unit_id'], unique=True, sqlite_where=sa.text('is_active'), postgresql_where=sa.text('is_active'))
+
+    with op.batch_alter_table('maintenance_requests', schema=None) as batch_op:
+        batch_op.create_index('ix_maintenance_tenant_created', ['tenant_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_maintenance_unit_created', ['unit_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.create_index('ix_payments_assignment_created', ['assignment_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_payments_tenant_created', ['tenant_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.create_index('ix_properties_landlord_created', ['landlord_id', 'created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('units', schema=None) as batch_op:
+        batch_op.create_index('ix_units_property_created', ['property_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_units_property_status', ['property_id', 'status'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('units', schema=None) as batch_op:
+        batch_op.drop_index('ix_units_property_status')
+        batch_op.drop_index('ix_units_property_created')
+
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.drop_index('ix_properties_landlord_created')
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_tenant_created')
+        batch_op.drop_index('ix_payments_assignment_created')
+
+    with op.batch_alter_table('maintenance_requests', schema=None) as batch_op:
+        batch_op.drop_index('ix_maintenance_unit_created')
+        batch_op.drop_index('ix_maintenance_tenant_created')
+
+    with op.batch_alter_table('assignments', schema=None) as batch_op:
+        batch_op.drop_index('uq_assignments_active_unit')
+        batch_op.drop_index('ix_assignments_unit_active')
+        batch_op.drop_index('ix_assignments_tenant_created')
+
+    op.drop_table('property_stats')
@@ -0,0 +1,36 @@
+"""unique mpesa reference
+
+Makes Payment.mpesa_reference unique so statement imports can skip receipts
+that are already recorded.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 15:59:24
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Blank references are "no reference", not a shared value
+    op.execute("UPDATE payments SET mpesa_reference = NULL WHERE TRIM(mpesa_reference) = ''")
+
+    # A receipt recorded twice keeps its reference on the first payment only
+    op.execute("""
+        UPDATE payments SET mpesa_reference = NULL
+        WHERE mpesa_reference IS NOT NULL AND EXISTS (
+            SELECT 1 FROM payments AS earlier
+            WHERE earlier.mpesa_reference = payments.mpesa_reference AND earlier.id < payments.id
+        )
+    """)
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.create_index('uq_payments_mpesa_reference', ['mpesa_reference'], unique=True)
+
+def downgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('uq_payments_mpesa_reference')
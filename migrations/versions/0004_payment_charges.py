@@ -0,0 +1,36 @@
+"""payment charges
+
+Distinguishes rent and late-fee charges from receipts on payments, with a
+due date and one charge of each kind per lease and month.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 16:08:48
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+payment_kind = sa.Enum('RECEIPT', 'RENT', 'LATE_FEE', name='paymentkind')
+
+def upgrade():
+    # add_column doesn't emit CREATE TYPE for native enums
+    payment_kind.create(op.get_bind(), checkfirst=True)
+
+    # Every existing row was recorded money, so they all default to receipts
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('kind', payment_kind, server_default='RECEIPT', nullable=False))
+        batch_op.add_column(sa.Column('due_date', sa.Date(), nullable=True))
+        batch_op.create_index('uq_payments_charge_month', ['assignment_id', 'kind', 'for_month'], unique=True, sqlite_where=sa.text("kind != 'RECEIPT'"), postgresql_where=sa.text("kind != 'RECEIPT'"))
+
+def downgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('uq_payments_charge_month', sqlite_where=sa.text("kind != 'RECEIPT'"), postgresql_where=sa.text("kind != 'RECEIPT'"))
+        batch_op.drop_column('due_date')
+        batch_op.drop_column('kind')
+
+    payment_kind.drop(op.get_bind(), checkfirst=True)
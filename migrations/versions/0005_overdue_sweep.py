@@ -0,0 +1,32 @@
+"""overdue sweep
+
+Adds the watermarks periodic jobs resume from and the due-date index the
+overdue sweep scans.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 16:10:29
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('job_watermarks',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('watermark', sa.Date(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.create_index('ix_payments_due_status', ['due_date', 'status'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_due_status')
+
+    op.drop_table('job_watermarks')
@@ -0,0 +1,38 @@
+"""assignment ledger
+
+Adds per-lease running totals (charges and paid receipts), backfilled from
+the payments recorded so far.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:12:33
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('assignment_balances',
+    sa.Column('assignment_id', sa.Integer(), nullable=False),
+    sa.Column('charged_total', sa.Float(), nullable=False),
+    sa.Column('paid_total', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['assignment_id'], ['assignments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('assignment_id')
+    )
+    op.execute("""
+        INSERT INTO assignment_balances (assignment_id, charged_total, paid_total, updated_at)
+        SELECT assignments.id,
+               COALESCE(SUM(CASE WHEN payments.kind != 'RECEIPT' THEN payments.amount ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN payments.kind = 'RECEIPT' AND payments.status = 'PAID' THEN payments.amount ELSE 0 END), 0),
+               CURRENT_TIMESTAMP
+        FROM assignments LEFT OUTER JOIN payments ON payments.assignment_id = assignments.id
+        GROUP BY assignments.id
+    """)
+
+def downgrade():
+    op.drop_table('assignment_balances')
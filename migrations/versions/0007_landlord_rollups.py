@@ -0,0 +1,68 @@
+"""landlord rollups
+
+Adds the per-landlord rollups behind the dashboard: open maintenance
+requests by priority and expected/collected rent per month, backfilled
+from existing requests and payments.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 16:15:55
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table('landlord_monthly_stats',
+    sa.Column('landlord_id', sa.Integer(), nullable=False),
+    sa.Column('for_month', sa.String(), nullable=False),
+    sa.Column('expected_rent', sa.Float(), nullable=False),
+    sa.Column('collected_rent', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['landlord_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('landlord_id', 'for_month')
+    )
+    op.create_table('landlord_stats',
+    sa.Column('landlord_id', sa.Integer(), nullable=False),
+    sa.Column('open_requests_high', sa.Integer(), nullable=False),
+    sa.Column('open_requests_medium', sa.Integer(), nullable=False),
+    sa.Column('open_requests_low', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['landlord_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('landlord_id')
+    )
+    op.execute("""
+        INSERT INTO landlord_monthly_stats (landlord_id, for_month, expected_rent, collected_rent, updated_at)
+        SELECT properties.landlord_id,
+               payments.for_month,
+               SUM(CASE WHEN payments.kind = 'RENT' THEN payments.amount ELSE 0 END),
+               SUM(CASE WHEN payments.kind = 'RECEIPT' AND payments.status = 'PAID' THEN payments.amount ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM payments
+        JOIN assignments ON assignments.id = payments.assignment_id
+        JOIN units ON units.id = assignments.unit_id
+        JOIN properties ON properties.id = units.property_id
+        GROUP BY properties.landlord_id, payments.for_month
+    """)
+    # Requests without a priority count as MEDIUM, the column default
+    op.execute("""
+        INSERT INTO landlord_stats (landlord_id, open_requests_high, open_requests_medium, open_requests_low, updated_at)
+        SELECT properties.landlord_id,
+               SUM(CASE WHEN maintenance_requests.priority = 'HIGH' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN maintenance_requests.priority = 'MEDIUM' OR maintenance_requests.priority IS NULL THEN 1 ELSE 0 END),
+               SUM(CASE WHEN maintenance_requests.priority = 'LOW' THEN 1 ELSE 0 END),
+               CURRENT_TIMESTAMP
+        FROM maintenance_requests
+        JOIN units ON units.id = maintenance_requests.unit_id
+        JOIN properties ON properties.id = units.property_id
+        WHERE maintenance_requests.status IN ('PENDING', 'IN_PROGRESS')
+        GROUP BY properties.landlord_id
+    """)
+
+def downgrade():
+    op.drop_table('landlord_stats')
+    op.drop_table('landlord_monthly_stats')
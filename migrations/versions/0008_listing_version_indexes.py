@@ -0,0 +1,44 @@
+"""listing version indexes
+
+Adds (scope, updated_at) indexes so the count and latest change behind a
+listing's ETag are read from indexes alone.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:29:47
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.create_index('ix_payments_assignment_updated', ['assignment_id', 'updated_at'], unique=False)
+        batch_op.create_index('ix_payments_tenant_updated', ['tenant_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.create_index('ix_properties_landlord_updated', ['landlord_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('property_stats', schema=None) as batch_op:
+        batch_op.create_index('ix_property_stats_property_updated', ['property_id', 'updated_at'], unique=False)
+
+    with op.batch_alter_table('units', schema=None) as batch_op:
+        batch_op.create_index('ix_units_property_updated', ['property_id', 'updated_at'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('units', schema=None) as batch_op:
+        batch_op.drop_index('ix_units_property_updated')
+
+    with op.batch_alter_table('property_stats', schema=None) as batch_op:
+        batch_op.drop_index('ix_property_stats_property_updated')
+
+    with op.batch_alter_table('properties', schema=None) as batch_op:
+        batch_op.drop_index('ix_properties_landlord_updated')
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_tenant_updated')
+        batch_op.drop_index('ix_payments_assignment_updated')
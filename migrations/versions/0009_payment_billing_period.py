@@ -0,0 +1,53 @@
+"""payment billing period
+
+Adds a typed billing_period (first day of for_month) to payments, with
+indexes on (tenant_id, billing_period) and (assignment_id, billing_period)
+for month-range queries. Existing rows are backfilled from for_month; a
+malformed legacy for_month falls back to January of for_year.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 16:43:30
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+BACKFILL = {
+    'sqlite': """
+        UPDATE payments
+        SET billing_period = COALESCE(
+            CASE WHEN for_month GLOB '[0-9][0-9][0-9][0-9]-[0-1][0-9]' THEN date(for_month || '-01') END,
+            printf('%04d-01-01', for_year)
+        )
+    """,
+    'postgresql': """
+        UPDATE payments
+        SET billing_period = CASE
+            WHEN for_month ~ '^[0-9]{4}-(0[1-9]|1[0-2])$' THEN to_date(for_month, 'YYYY-MM')
+            ELSE make_date(for_year, 1, 1)
+        END
+    """,
+}
+
+def upgrade():
+    # Added nullable, filled in, then tightened
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('billing_period', sa.Date(), nullable=True))
+
+    op.execute(BACKFILL[op.get_bind().dialect.name])
+
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.alter_column('billing_period', existing_type=sa.Date(), nullable=False)
+        batch_op.create_index('ix_payments_assignment_period', ['assignment_id', 'billing_period'], unique=False)
+        batch_op.create_index('ix_payments_tenant_period', ['tenant_id', 'billing_period'], unique=False)
+
+def downgrade():
+    with op.batch_alter_table('payments', schema=None) as batch_op:
+        batch_op.drop_index('ix_payments_tenant_period')
+        batch_op.drop_index('ix_payments_assignment_period')
+        batch_op.drop_column('billing_period')
@@ -0,0 +1,33 @@
+"""maintenance work queue
+
+Records who claimed a maintenance request off the work queue and when,
+and indexes pending requests by priority and age. Requests without a
+priority are set to MEDIUM, the column default, so the queue sees them.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 16:48:56
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute("UPDATE maintenance_requests SET priority = 'MEDIUM' WHERE priority IS NULL")
+
+    with op.batch_alter_table('maintenance_requests', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('claimed_by', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('claimed_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_maintenance_queue', ['status', 'priority', 'created_at', 'id'], unique=False)
+        batch_op.create_foreign_key('fk_maintenance_requests_claimed_by', 'users', ['claimed_by'], ['id'])
+
+def downgrade():
+    with op.batch_alter_table('maintenance_requests', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_maintenance_requests_claimed_by', type_='foreignkey')
+        batch_op.drop_index('ix_maintenance_queue')
+        batch_op.drop_column('claimed_at')
+        batch_op.drop_column('claimed_by')
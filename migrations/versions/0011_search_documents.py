@@ -0,0 +1,167 @@
+"""search documents
+
+Adds search_documents, one row per property, unit and (tenant, landlord)
+pair, and its full-text index: on SQLite a contentless FTS5 table kept in
+step by triggers, with every word also indexed under its landlord; on
+PostgreSQL a GIN index over a weighted tsvector of title and terms.
+Backfilled from the existing rows.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 16:57:21
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+# One-row scratch index the triggers run a document through, so the
+# landlord-scoped words are exactly the tokens FTS5 itself finds: an email
+# or a hyphenated name splits on every non-word character, as the query does
+WORDS_TABLE = "search_documents_words"
+TOKENIZER = "unicode61 remove_diacritics 2"
+
+def fts5_values(row):
+    """The FTS5 row for a search_documents row: each column holds its plain
+    words, for admins, and the same words prefixed with the landlord
+    (``o7xkamau``), so a landlord's query only ever reads their own doclists."""
+    def scoped(column):
+        owner = f"'o' || {row}.landlord_id || 'x'"
+        words = f"SELECT group_concat({owner} || term, ' ') FROM {WORDS_TABLE}_instances WHERE col = '{column}'"
+        return f"{row}.{column} || ' ' || coalesce(({words}), '')"
+    return ", ".join([
+        f"{row}.id",
+        f"{row}.kind || ' o' || {row}.landlord_id || 'k' || {row}.kind",
+        scoped("title"),
+        scoped("terms"),
+    ])
+
+def fts5_write(row, command=""):
+    """Statements writing ``row`` to the FTS5 table; ``command`` 'delete' removes it."""
+    columns = f"search_documents_fts, {FTS5_COLUMNS}" if command else FTS5_COLUMNS
+    values = f"'{command}', {fts5_values(row)}" if command else fts5_values(row)
+    return f"""
+            INSERT INTO {WORDS_TABLE} (rowid, title, terms) VALUES ({row}.id, {row}.title, {row}.terms);
+            INSERT INTO search_documents_fts ({columns}) VALUES ({values});
+            INSERT INTO {WORDS_TABLE} ({WORDS_TABLE}) VALUES ('delete-all');"""
+
+FTS5_COLUMNS = "rowid, kind, title, terms"
+
+FULL_TEXT_INDEX = {
+    'sqlite': [
+        f"""
+        CREATE VIRTUAL TABLE search_documents_fts USING fts5(
+            kind, title, terms, content='', tokenize='{TOKENIZER}'
+        )
+        """,
+        f"CREATE VIRTUAL TABLE {WORDS_TABLE} USING fts5(title, terms, content='', tokenize='{TOKENIZER}')",
+        f"CREATE VIRTUAL TABLE {WORDS_TABLE}_instances USING fts5vocab({WORDS_TABLE}, instance)",
+        f"""
+        CREATE TRIGGER search_documents_fts_insert AFTER INSERT ON search_documents BEGIN{fts5_write('new')}
+        END
+        """,
+        f"""
+        CREATE TRIGGER search_documents_fts_delete AFTER DELETE ON search_documents BEGIN{fts5_write('old', 'delete')}
+        END
+        """,
+        f"""
+        CREATE TRIGGER search_documents_fts_update AFTER UPDATE ON search_documents BEGIN{fts5_write('old', 'delete')}{fts5_write('new')}
+        END
+        """,
+    ],
+    'postgresql': [
+        # search_service._tsvector() builds the same expression to use it
+        """
+        CREATE INDEX ix_search_documents_fts ON search_documents
+        USING gin ((
+            setweight(to_tsvector('simple', regexp_replace(title, '[^[:alnum:]]+', ' ', 'g')), 'A')
+            || to_tsvector('simple', regexp_replace(terms, '[^[:alnum:]]+', ' ', 'g'))
+        ))
+        """,
+    ],
+}
+
+DROP_FULL_TEXT_INDEX = {
+    'sqlite': [
+        "DROP TRIGGER search_documents_fts_update",
+        "DROP TRIGGER search_documents_fts_delete",
+        "DROP TRIGGER search_documents_fts_insert",
+        f"DROP TABLE {WORDS_TABLE}_instances",
+        f"DROP TABLE {WORDS_TABLE}",
+        "DROP TABLE search_documents_fts",
+    ],
+    'postgresql': ["DROP INDEX ix_search_documents_fts"],
+}
+
+# Same documents as search_service builds; tenants once per landlord they leased from
+BACKFILL = [
+    """
+    INSERT INTO search_documents (kind, object_id, landlord_id, property_id, title, subtitle, terms, created_at, updated_at)
+    SELECT 'property', id, landlord_id, id, name, address || ', ' || city,
+           name || ' ' || address || ' ' || city || ' ' || county,
+           CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM properties
+    """,
+    """
+    INSERT INTO search_documents (kind, object_id, landlord_id, property_id, title, subtitle, terms, created_at, updated_at)
+    SELECT 'unit', units.id, properties.landlord_id, units.property_id, units.unit_number, properties.name,
+           units.unit_number || ' ' || properties.name,
+           CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM units
+    JOIN properties ON properties.id = units.property_id
+    """,
+    """
+    INSERT INTO search_documents (kind, object_id, landlord_id, property_id, title, subtitle, terms, created_at, updated_at)
+    SELECT DISTINCT 'tenant', users.id, properties.landlord_id, NULL,
+           users.first_name || ' ' || users.last_name, users.phone_number,
+           users.first_name || ' ' || users.last_name || ' ' || users.email || ' ' || users.phone_number || ' '
+           || replace(replace(replace(replace(replace(replace(replace(
+                  users.phone_number, '+', ''), ' ', ''), '-', ''), '(', ''), ')', ''), '.', ''), '/', '')
+           || ' ' || users.id_number,
+           CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+    FROM assignments
+    JOIN units ON units.id = assignments.unit_id
+    JOIN properties ON properties.id = units.property_id
+    JOIN users ON users.id = assignments.tenant_id
+    """,
+]
+
+def upgrade():
+    op.create_table('search_documents',
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('object_id', sa.Integer(), nullable=False),
+    sa.Column('landlord_id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=True),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('subtitle', sa.String(), nullable=True),
+    sa.Column('terms', sa.Text(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['landlord_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('search_documents', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_search_documents_id'), ['id'], unique=False)
+        batch_op.create_index('ix_search_documents_landlord', ['landlord_id'], unique=False)
+        batch_op.create_index('ix_search_documents_object', ['kind', 'object_id', 'landlord_id'], unique=True)
+        batch_op.create_index('ix_search_documents_property', ['property_id'], unique=False)
+
+    for statement in FULL_TEXT_INDEX[op.get_bind().dialect.name]:
+        op.execute(statement)
+    for statement in BACKFILL:
+        op.execute(statement)
+
+def downgrade():
+    for statement in DROP_FULL_TEXT_INDEX[op.get_bind().dialect.name]:
+        op.execute(statement)
+    with op.batch_alter_table('search_documents', schema=None) as batch_op:
+        batch_op.drop_index('ix_search_documents_property')
+        batch_op.drop_index('ix_search_documents_object')
+        batch_op.drop_index('ix_search_documents_landlord')
+        batch_op.drop_index(batch_op.f('ix_search_documents_id'))
+
+    op.drop_table('search_documents')
@@ -0,0 +1,56 @@
+"""vacancy facets
+
+Adds vacancy_facets, the vacant unit counts per county, town, layout and
+rent band behind the vacancy search facets, backfilled from existing
+units, the index the vacancy listing walks and the one rent filters
+count partial bands from.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 17:16:27
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+# vacancy_service.RENT_BANDS when this revision was written
+RENT_BANDS = (10_000, 20_000, 30_000, 50_000, 75_000, 100_000, 150_000)
+
+def upgrade():
+    op.create_table('vacancy_facets',
+    sa.Column('county', sa.String(), nullable=False),
+    sa.Column('city', sa.String(), nullable=False),
+    sa.Column('bedrooms', sa.Integer(), nullable=False),
+    sa.Column('bathrooms', sa.Float(), nullable=False),
+    sa.Column('rent_band', sa.Integer(), nullable=False),
+    sa.Column('vacant_units', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('county', 'city', 'bedrooms', 'bathrooms', 'rent_band')
+    )
+    with op.batch_alter_table('units', schema=None) as batch_op:
+        batch_op.create_index('ix_units_vacancy', ['status', 'created_at', 'id', 'bedrooms', 'bathrooms', 'monthly_rent', 'property_id'], unique=False)
+        batch_op.create_index('ix_units_vacant_rent', ['status', 'monthly_rent', 'bedrooms', 'bathrooms', 'property_id'], unique=False)
+
+    band = "CASE " + " ".join(
+        f"WHEN units.monthly_rent < {bound} THEN {band}" for band, bound in enumerate(RENT_BANDS)
+    ) + f" ELSE {len(RENT_BANDS)} END"
+    op.execute(f"""
+        INSERT INTO vacancy_facets (county, city, bedrooms, bathrooms, rent_band, vacant_units, updated_at)
+        SELECT properties.county, properties.city, units.bedrooms, units.bathrooms, {band},
+               COUNT(units.id), CURRENT_TIMESTAMP
+        FROM units
+        JOIN properties ON properties.id = units.property_id
+        WHERE units.status = 'VACANT'
+        GROUP BY properties.county, properties.city, units.bedrooms, units.bathrooms, {band}
+    """)
+
+def downgrade():
+    with op.batch_alter_table('units', schema=None) as batch_op:
+        batch_op.drop_index('ix_units_vacant_rent')
+        batch_op.drop_index('ix_units_vacancy')
+
+    op.drop_table('vacancy_facets')
@@ -0,0 +1,50 @@
+# tests/conftest.py
+import os
+import shutil
+import tempfile
+
+# Settings are read once at import, so point them at a scratch database first
+WORKDIR = tempfile.mkdtemp(prefix="rentezi-tests-")
+DATABASE_PATH = os.path.join(WORKDIR, "app.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DATABASE_PATH}"
+os.environ.setdefault("SECRET_KEY", "tests")
+os.environ["RESPONSE_CACHE_URL"] = ""
+# Registration and login hash passwords; the lowest cost keeps tests quick
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+@pytest.fixture(scope="session")
+def template_database(tmp_path_factory) -> str:
+    """A database migrated to head, copied before any test writes to the app's own."""
+    from app.cli import main as cli
+
+    cli(["migrate"])
+    template = tmp_path_factory.mktemp("template") / "template.db"
+    shutil.copyfile(DATABASE_PATH, template)
+    return str(template)
+
+@pytest.fixture
+def engine(template_database, tmp_path):
+    """A fresh migrated database of the test's own."""
+    path = tmp_path / "test.db"
+    shutil.copyfile(template_database, path)
+    engine = create_engine(f"sqlite:///{path}")
+    yield engine
+    engine.dispose()
+
+@pytest.fixture
+def db(engine):
+    with sessionmaker(bind=engine, autocommit=False, autoflush=False)() as session:
+        yield session
+
+@pytest.fixture
+def client(template_database):
+    """The API against the app's database, shared by every test using it."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
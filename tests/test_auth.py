@@ -0,0 +1,49 @@
+# tests/test_auth.py
+from app.core.principal_cache import Principal
+from app.core.security import principal_cache
+
+def register(client, email: str) -> dict:
+    response = client.post("/api/v1/auth/register", json=dict(
+        first_name="Grace", last_name="Wanjiku", email=email, phone_number="0700000000",
+        role="tenant", password="secret123", id_number=email
+    ))
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_principal_cache_holds_a_snapshot_not_the_user(client):
+    body = register(client, "snapshot@example.com")
+    token = body["access_token"]
+    principal_cache.clear()
+
+    response = client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "snapshot@example.com"
+    assert principal_cache.get(token) == Principal(body["user"]["id"], "tenant", True)
+
+def test_deactivated_user_is_dropped_from_this_workers_cache(client):
+    from app.core.database import SessionLocal
+    from app.services.user_service import deactivate_user
+
+    body = register(client, "deactivated@example.com")
+    headers = {"Authorization": f"Bearer {body['access_token']}"}
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+
+    db = SessionLocal()
+    try:
+        deactivate_user(db, body["user"]["id"])
+    finally:
+        db.close()
+
+    assert client.get("/api/v1/auth/me", headers=headers).status_code == 401
+
+def test_password_workers_are_not_forked_and_stop_with_the_app():
+    from fastapi.testclient import TestClient
+    from app.core import security
+    from app.main import app
+
+    with TestClient(app) as client:
+        register(client, "workers@example.com")
+        assert security._hash_pool._mp_context.get_start_method() in ("forkserver", "spawn")
+
+    assert security._hash_pool is None
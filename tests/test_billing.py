@@ -0,0 +1,153 @@
+# tests/test_billing.py
+from datetime import date
+
+import pytest
+
+from app.models import Payment
+from app.models.payment import PaymentKind, PaymentStatus
+from app.schemas.payment import PaymentCreate
+from app.services import billing_service, mpesa_service, payment_service
+from . import factories
+
+# Not yet due, so an unsettled charge stays PENDING
+MONTH = "2030-10"
+PAST_MONTH = "2026-01"
+
+@pytest.fixture
+def lease(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    return factories.lease(db, unit.id, factories.user(db).id, monthly_rent=20000)
+
+def pay(db, lease, amount: float, for_month: str = MONTH, reference=None) -> Payment:
+    return payment_service.create_payment(db, PaymentCreate(
+        amount=amount, for_month=for_month, for_year=int(for_month[:4]), assignment_id=lease.id,
+        mpesa_reference=reference
+    ), lease.tenant_id)
+
+def charges(db, lease) -> dict:
+    db.expire_all()
+    rows = db.query(Payment).filter(Payment.assignment_id == lease.id, Payment.kind != PaymentKind.RECEIPT)
+    return {(row.kind, row.for_month): row.status for row in rows}
+
+def test_invoicing_is_idempotent_and_clamps_the_due_day(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    lease = factories.lease(db, unit.id, factories.user(db).id, payment_due_day=31)
+
+    assert billing_service.generate_monthly_invoices(db, "2030-02") == 1
+    assert billing_service.generate_monthly_invoices(db, "2030-02") == 0
+
+    charge, = db.query(Payment).filter(Payment.assignment_id == lease.id, Payment.kind == PaymentKind.RENT)
+    assert (charge.status, charge.amount, charge.due_date) == (PaymentStatus.PENDING, 20000, date(2030, 2, 28))
+
+def test_receipt_settles_the_charge(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+
+    pay(db, lease, 20000)
+
+    assert charges(db, lease) == {(PaymentKind.RENT, MONTH): PaymentStatus.PAID}
+
+def test_short_receipt_part_pays_the_charge(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+
+    pay(db, lease, 5000)
+
+    assert charges(db, lease) == {(PaymentKind.RENT, MONTH): PaymentStatus.PARTIALLY_PAID}
+
+def test_receipts_settle_the_oldest_charge_first(db, lease):
+    billing_service.generate_monthly_invoices(db, "2030-09")
+    billing_service.generate_monthly_invoices(db, MONTH)
+
+    pay(db, lease, 30000, for_month=MONTH)
+
+    assert charges(db, lease) == {
+        (PaymentKind.RENT, "2030-09"): PaymentStatus.PAID,
+        (PaymentKind.RENT, MONTH): PaymentStatus.PARTIALLY_PAID,
+    }
+
+def test_credit_settles_a_new_invoice(db, lease):
+    pay(db, lease, 20000)
+
+    billing_service.generate_monthly_invoices(db, MONTH)
+
+    assert charges(db, lease) == {(PaymentKind.RENT, MONTH): PaymentStatus.PAID}
+    charge, = db.query(Payment).filter(Payment.assignment_id == lease.id, Payment.kind == PaymentKind.RENT)
+    # Settled in the same run, under the run's timestamp
+    assert charge.updated_at == charge.created_at
+
+def test_reversed_receipt_unsettles_the_charge(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+    receipt = pay(db, lease, 20000)
+
+    payment_service.update_payment_status(db, receipt.id, PaymentStatus.PENDING)
+
+    assert charges(db, lease) == {(PaymentKind.RENT, MONTH): PaymentStatus.PENDING}
+
+def test_reversed_receipt_leaves_a_past_due_charge_overdue(db, lease):
+    billing_service.generate_monthly_invoices(db, PAST_MONTH)
+    receipt = pay(db, lease, 20000, for_month=PAST_MONTH)
+
+    payment_service.update_payment_status(db, receipt.id, PaymentStatus.PENDING)
+
+    assert charges(db, lease) == {(PaymentKind.RENT, PAST_MONTH): PaymentStatus.OVERDUE}
+
+def test_statement_import_settles_charges(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+    statement = [
+        "Receipt No.,Completion Time,Details,Transaction Status,Paid In,Account No.\n",
+        f"SJA1B2C3D4,2030-10-03 10:00:00,Pay Bill,Completed,20000,{lease.id}\n",
+    ]
+
+    result = mpesa_service.import_mpesa_statement(db, statement)
+
+    assert result["inserted"] == 1
+    assert charges(db, lease) == {(PaymentKind.RENT, MONTH): PaymentStatus.PAID}
+
+@pytest.fixture
+def late_fees(monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "LATE_FEE_FLAT", 500.0)
+    monkeypatch.setattr(settings, "LATE_FEE_GRACE_DAYS", 5)
+
+# PAST_MONTH's rent falls due on the 5th; fees are raised from the 11th
+SWEEP_DAY = date(2026, 1, 20)
+
+def test_sweep_charges_no_fee_to_a_tenant_who_paid(db, lease, late_fees):
+    billing_service.generate_monthly_invoices(db, PAST_MONTH)
+    pay(db, lease, 20000, for_month=PAST_MONTH)
+
+    result = billing_service.sweep_overdue_payments(db, SWEEP_DAY)
+
+    assert result == {"overdue": 0, "late_fees": 0}
+    assert charges(db, lease) == {(PaymentKind.RENT, PAST_MONTH): PaymentStatus.PAID}
+
+def test_sweep_settles_receipts_recorded_before_settlement(db, lease, late_fees):
+    billing_service.generate_monthly_invoices(db, PAST_MONTH)
+    pay(db, lease, 20000, for_month=PAST_MONTH)
+    # As left by receipts recorded before charges were settled
+    db.query(Payment).filter(Payment.kind == PaymentKind.RENT).update({Payment.status: PaymentStatus.PENDING})
+    db.commit()
+
+    result = billing_service.sweep_overdue_payments(db, SWEEP_DAY)
+
+    assert result == {"overdue": 0, "late_fees": 0}
+
+def test_sweep_charges_a_fee_on_unpaid_rent(db, lease, late_fees):
+    billing_service.generate_monthly_invoices(db, PAST_MONTH)
+    pay(db, lease, 5000, for_month=PAST_MONTH)
+
+    result = billing_service.sweep_overdue_payments(db, SWEEP_DAY)
+
+    assert result == {"overdue": 1, "late_fees": 1}
+    assert charges(db, lease) == {
+        (PaymentKind.RENT, PAST_MONTH): PaymentStatus.OVERDUE,
+        (PaymentKind.LATE_FEE, PAST_MONTH): PaymentStatus.PENDING,
+    }
+
+def test_sweep_only_looks_at_charges_due_since_the_last_run(db, lease, late_fees):
+    billing_service.generate_monthly_invoices(db, PAST_MONTH)
+    billing_service.sweep_overdue_payments(db, SWEEP_DAY)
+
+    assert billing_service.sweep_overdue_payments(db, SWEEP_DAY) == {"overdue": 0, "late_fees": 0}
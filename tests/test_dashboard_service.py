@@ -0,0 +1,80 @@
+# tests/test_dashboard_service.py
+from datetime import date
+
+import pytest
+
+from app.models import LandlordMonthlyStats, LandlordStats
+from app.models.maintenance import MaintenancePriority, MaintenanceStatus
+from app.models.payment import PaymentStatus
+from app.schemas.maintenance import MaintenanceRequestCreate
+from app.schemas.payment import PaymentCreate
+from app.services import billing_service, dashboard_service, maintenance_service, payment_service
+from . import factories
+
+# Within EXPIRING_WITHIN_DAYS of the factory leases' end
+TODAY = date(2030, 11, 15)
+MONTH = "2030-11"
+
+@pytest.fixture
+def portfolio(db):
+    landlord = factories.landlord(db)
+    property = factories.property(db, landlord.id)
+    let, vacant = factories.units(db, property.id, 2)
+    lease = factories.lease(db, let.id, factories.user(db).id)
+    return landlord, lease
+
+def dashboard(db, landlord):
+    db.expire_all()
+    return dashboard_service.get_landlord_dashboard(db, landlord.id, TODAY)
+
+def request(db, lease, priority: MaintenancePriority):
+    return maintenance_service.create_maintenance_request(db, MaintenanceRequestCreate(
+        unit_id=lease.unit_id, issue_type="plumbing", description="Leaking tap", priority=priority
+    ), lease.tenant_id)
+
+def test_occupancy_and_expiring_leases(db, portfolio):
+    landlord, lease = portfolio
+
+    result = dashboard(db, landlord)
+
+    assert result["occupancy"] == {"properties": 1, "units": 2, "occupied_units": 1, "occupancy_rate": 0.5}
+    assert [item["assignment_id"] for item in result["expiring_leases"]["items"]] == [lease.id]
+
+def test_open_requests_follow_status_changes(db, portfolio):
+    landlord, lease = portfolio
+    urgent = request(db, lease, MaintenancePriority.HIGH)
+    request(db, lease, MaintenancePriority.MEDIUM)
+    assert dashboard(db, landlord)["open_maintenance"] == {"high": 1, "medium": 1, "low": 0}
+
+    maintenance_service.update_maintenance_status(db, urgent.id, MaintenanceStatus.COMPLETED)
+
+    assert dashboard(db, landlord)["open_maintenance"] == {"high": 0, "medium": 1, "low": 0}
+
+def test_rent_collected_follows_receipt_status_changes(db, portfolio):
+    landlord, lease = portfolio
+    billing_service.generate_monthly_invoices(db, MONTH)
+    receipt = payment_service.create_payment(db, PaymentCreate(
+        amount=5000, for_month=MONTH, for_year=2030, assignment_id=lease.id
+    ), lease.tenant_id)
+    assert dashboard(db, landlord)["rent"][0] == {"for_month": MONTH, "expected": 20000, "collected": 5000, "outstanding": 15000}
+
+    payment_service.update_payment_status(db, receipt.id, PaymentStatus.PENDING)
+
+    assert dashboard(db, landlord)["rent"][0] == {"for_month": MONTH, "expected": 20000, "collected": 0, "outstanding": 20000}
+
+def test_stored_rollups_match_a_rebuild(db, portfolio):
+    landlord, lease = portfolio
+    billing_service.generate_monthly_invoices(db, MONTH)
+    payment_service.create_payments(db, [(PaymentCreate(
+        amount=20000, for_month=MONTH, for_year=2030, assignment_id=lease.id
+    ), lease.tenant_id)])
+    request(db, lease, MaintenancePriority.LOW)
+    stored = dashboard(db, landlord)
+
+    db.query(LandlordMonthlyStats).delete()
+    db.query(LandlordStats).delete()
+    dashboard_service.rebuild_monthly_stats(db, landlord.id)
+    dashboard_service.rebuild_landlord_stats(db, landlord.id)
+    db.commit()
+
+    assert dashboard(db, landlord) == stored
@@ -0,0 +1,53 @@
+# tests/test_export_service.py
+import csv
+import io
+import json
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.export import stream_export
+from app.schemas.payment import PaymentCreate
+from app.services import export_service, payment_service
+from . import factories
+
+@pytest.fixture
+def lease(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    lease = factories.lease(db, unit.id, factories.user(db).id)
+    for for_month in ("2030-09", "2030-10", "2030-11"):
+        payment_service.create_payment(db, PaymentCreate(
+            amount=20000, for_month=for_month, for_year=2030, assignment_id=lease.id
+        ), lease.tenant_id)
+    return lease
+
+def export(engine, statement, format: str) -> str:
+    chunks = stream_export(statement, format, chunk_size=2, session_factory=sessionmaker(bind=engine))
+    return b"".join(chunks).decode("utf-8")
+
+def test_payments_export_covers_the_period_as_csv(engine, lease):
+    landlord_id = lease.unit.property.landlord_id
+    statement = export_service.payments_export_query(landlord_id, None, "2030-10", "2030-11")
+
+    rows = list(csv.DictReader(io.StringIO(export(engine, statement, "csv"))))
+
+    assert [row["for_month"] for row in rows] == ["2030-10", "2030-11"]
+    assert rows[0]["kind"] == "receipt" and rows[0]["tenant_name"] == "Test User"
+
+def test_export_of_another_landlord_is_empty_but_well_formed(db, engine, lease):
+    statement = export_service.payments_export_query(factories.landlord(db).id)
+
+    assert export(engine, statement, "csv").splitlines()[0].startswith("id,for_month,")
+    assert export(engine, statement, "ndjson") == ""
+
+def test_assignments_export_as_ndjson(engine, lease):
+    statement = export_service.assignments_export_query(lease.unit.property.landlord_id)
+
+    rows = [json.loads(line) for line in export(engine, statement, "ndjson").splitlines()]
+
+    assert [row["id"] for row in rows] == [lease.id]
+
+def test_reversed_period_is_rejected():
+    with pytest.raises(ValueError, match="from_month"):
+        export_service.payments_export_query(None, None, "2030-11", "2030-10")
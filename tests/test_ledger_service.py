@@ -0,0 +1,80 @@
+# tests/test_ledger_service.py
+import pytest
+
+from app.models import AssignmentBalance
+from app.models.payment import PaymentStatus
+from app.schemas.payment import PaymentCreate
+from app.services import billing_service, ledger_service, payment_service
+from . import factories
+
+MONTH = "2030-10"
+
+@pytest.fixture
+def lease(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    return factories.lease(db, unit.id, factories.user(db).id, monthly_rent=20000)
+
+def pay(db, lease, amount: float):
+    return payment_service.create_payment(db, PaymentCreate(
+        amount=amount, for_month=MONTH, for_year=2030, assignment_id=lease.id
+    ), lease.tenant_id)
+
+def totals(db, lease) -> tuple:
+    db.expire_all()
+    ledger = ledger_service.get_balance(db, lease.id)
+    return ledger.charged_total, ledger.paid_total, ledger.balance
+
+def test_balance_follows_charges_and_receipts(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+    pay(db, lease, 5000)
+    payment_service.create_payments(db, [(PaymentCreate(
+        amount=3000, for_month=MONTH, for_year=2030, assignment_id=lease.id
+    ), lease.tenant_id)])
+
+    assert totals(db, lease) == (20000, 8000, 12000)
+
+def test_batch_seeds_a_missing_ledger_without_counting_it_twice(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+    db.query(AssignmentBalance).delete()
+    db.commit()
+
+    payment_service.create_payments(db, [(PaymentCreate(
+        amount=3000, for_month=MONTH, for_year=2030, assignment_id=lease.id
+    ), lease.tenant_id)])
+
+    assert totals(db, lease) == (20000, 3000, 17000)
+
+def test_reversed_receipt_leaves_the_balance_owing(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+    receipt = pay(db, lease, 20000)
+    assert totals(db, lease) == (20000, 20000, 0)
+
+    payment_service.update_payment_status(db, receipt.id, PaymentStatus.PENDING)
+
+    assert totals(db, lease) == (20000, 0, 20000)
+
+def test_stored_totals_match_a_rebuild_from_history(db, lease):
+    billing_service.generate_monthly_invoices(db, MONTH)
+    receipt = pay(db, lease, 7000)
+    payment_service.update_payment_status(db, receipt.id, PaymentStatus.PENDING)
+    pay(db, lease, 4000)
+    stored = totals(db, lease)
+
+    db.query(AssignmentBalance).delete()
+    db.commit()
+
+    assert totals(db, lease) == stored
+
+def test_arrears_lists_only_leases_owing_largest_first(db):
+    landlord = factories.landlord(db)
+    property = factories.property(db, landlord.id)
+    leases = [factories.lease(db, unit.id, factories.user(db).id) for unit in factories.units(db, property.id, 3)]
+    billing_service.generate_monthly_invoices(db, MONTH)
+    pay(db, leases[0], 20000)
+    pay(db, leases[1], 15000)
+
+    report = ledger_service.get_arrears_report(db, landlord.id, 10)
+
+    assert (report["leases_in_arrears"], report["total_arrears"]) == (2, 25000)
+    assert [item["assignment_id"] for item in report["items"]] == [leases[2].id, leases[1].id]
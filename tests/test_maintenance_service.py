@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.models.maintenance import MaintenancePriority, MaintenanceRequest, MaintenanceStatus
+from app.schemas.maintenance import MaintenanceRequestCreate
+from app.services import maintenance_service
+from . import factories
+
+@pytest.fixture
+def unit(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    return unit
+
+def report(db, unit, priority: MaintenancePriority) -> int:
+    request = MaintenanceRequestCreate(issue_type="plumbing", description="Leaking tap", priority=priority, unit_id=unit.id)
+    return maintenance_service.create_maintenance_request(db, request, factories.user(db).id).id
+
+def test_queue_takes_high_then_medium_then_low_oldest_first(db, unit):
+    low = report(db, unit, MaintenancePriority.LOW)
+    medium = [report(db, unit, MaintenancePriority.MEDIUM) for _ in range(2)]
+    high = report(db, unit, MaintenancePriority.HIGH)
+    landlord_id = unit.property.landlord_id
+
+    queue = maintenance_service.get_maintenance_queue(db, landlord_id, limit=3)
+    claimed = maintenance_service.claim_maintenance_requests(db, factories.landlord(db).id, landlord_id, limit=4)
+
+    assert [request["id"] for request in queue] == [high, *medium]
+    assert [request["id"] for request in claimed] == [high, *medium, low]
+    assert {request["status"] for request in claimed} == {MaintenanceStatus.IN_PROGRESS}
+
+def test_two_sessions_claim_disjoint_requests(engine, db, unit):
+    reported = {report(db, unit, MaintenancePriority.MEDIUM) for _ in range(6)}
+    claimer = factories.landlord(db).id
+    Session = sessionmaker(bind=engine)
+
+    def claim(_):
+        with Session() as session:
+            return [request["id"] for request in maintenance_service.claim_maintenance_requests(session, claimer, limit=2)]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        batches = list(pool.map(claim, range(4)))
+
+    claimed = [request_id for batch in batches for request_id in batch]
+    assert len(claimed) == len(set(claimed)) == len(reported)
+    assert set(claimed) == reported
+    assert sorted(len(batch) for batch in batches) == [0, 2, 2, 2]
+
+def test_only_pending_requests_are_claimed_from_a_stale_queue_head(db, unit, monkeypatch):
+    taken, waiting = (report(db, unit, MaintenancePriority.HIGH) for _ in range(2))
+    maintenance_service.update_maintenance_status(db, taken, MaintenanceStatus.IN_PROGRESS)
+
+    def stale_head(priority, landlord_id):
+        # What a claimer racing another one can read: a request already taken still at the head
+        return select(MaintenanceRequest.id).where(MaintenanceRequest.priority == priority).order_by(MaintenanceRequest.id)
+
+    monkeypatch.setattr(maintenance_service, "_queued", stale_head)
+    claimed = maintenance_service.claim_maintenance_requests(db, factories.landlord(db).id, limit=2)
+
+    assert [request["id"] for request in claimed] == [waiting]
+    assert maintenance_service.get_maintenance_request_by_id(db, taken).claimed_by is None
+
+def test_a_request_set_back_to_pending_returns_to_the_queue(db, unit):
+    request_id = report(db, unit, MaintenancePriority.LOW)
+    maintenance_service.claim_maintenance_requests(db, factories.landlord(db).id)
+
+    request = maintenance_service.update_maintenance_status(db, request_id, MaintenanceStatus.PENDING)
+
+    assert (request.claimed_by, request.claimed_at) == (None, None)
+    assert [row["id"] for row in maintenance_service.get_maintenance_queue(db)] == [request_id]
@@ -0,0 +1,170 @@
+# tests/test_payment_service.py
+import io
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.schemas.payment import PaymentCreate
+from app.services import mpesa_service, payment_service
+from . import factories
+
+@pytest.fixture
+def lease(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    return factories.lease(db, unit.id, factories.user(db).id)
+
+def receipt(lease, **fields) -> PaymentCreate:
+    values = dict(amount=20000, for_month="2026-10", for_year=2026, assignment_id=lease.id)
+    values.update(fields)
+    return PaymentCreate(**values)
+
+def test_create_payments_records_each_receipt_against_its_tenant(db, lease):
+    payments = payment_service.create_payments(db, [
+        (receipt(lease, mpesa_reference="SJA0000001"), lease.tenant_id),
+        (receipt(lease, mpesa_reference="SJA0000002", for_month="2026-11"), lease.tenant_id),
+    ])
+
+    assert [payment.mpesa_reference for payment in payments] == ["SJA0000001", "SJA0000002"]
+    assert {payment.tenant_id for payment in payments} == {lease.tenant_id}
+
+def test_payments_by_ids_are_scoped_to_the_landlord(db, lease):
+    payment = payment_service.create_payment(db, receipt(lease), lease.tenant_id)
+    landlord_id = lease.unit.property.landlord_id
+
+    assert [p["id"] for p in payment_service.get_payments_by_ids(db, [payment.id, 10 ** 6], landlord_id=landlord_id)] == [payment.id]
+    assert payment_service.get_payments_by_ids(db, [payment.id], landlord_id=factories.landlord(db).id) == []
+
+def test_repeated_mpesa_reference_is_reported_as_a_duplicate(db, lease):
+    payment_service.create_payment(db, receipt(lease, mpesa_reference="SJA1B2C3D4"), lease.tenant_id)
+
+    with pytest.raises(ValueError, match="already recorded"):
+        payment_service.create_payment(db, receipt(lease, mpesa_reference="SJA1B2C3D4"), lease.tenant_id)
+
+def test_other_integrity_errors_are_not_reported_as_duplicates(db, lease):
+    # Skips validation, as a caller bug would
+    payment = PaymentCreate.model_construct(**receipt(lease).model_dump(exclude={"for_year"}), for_year=None)
+
+    with pytest.raises(IntegrityError, match="for_year"):
+        payment_service.create_payment(db, payment, lease.tenant_id)
+
+def test_create_payments_skips_a_reference_recorded_since_the_check(db, lease):
+    # Recorded by another request between the batch's check and its insert
+    payment_service.create_payment(db, receipt(lease, mpesa_reference="SJA0000001"), lease.tenant_id)
+
+    payments = payment_service.create_payments(db, [
+        (receipt(lease, mpesa_reference="SJA0000001"), lease.tenant_id),
+        (receipt(lease), lease.tenant_id),
+        (receipt(lease, mpesa_reference="SJA0000002"), lease.tenant_id),
+    ])
+
+    assert payments[0] is None
+    assert payments[1].mpesa_reference is None
+    assert payments[2].mpesa_reference == "SJA0000002"
+
+def test_batch_reports_a_concurrently_recorded_reference_per_item(client, monkeypatch):
+    from app.api.v1 import payments as payments_api
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+
+    with SessionLocal() as db:
+        property = factories.property(db, factories.landlord(db).id)
+        unit, = factories.units(db, property.id, 1)
+        lease = factories.lease(db, unit.id, factories.user(db).id)
+        payment_service.create_payment(db, receipt(lease, mpesa_reference="SJB0000001"), lease.tenant_id)
+        body = [receipt(lease, mpesa_reference=reference).model_dump() for reference in ("SJB0000002", "SJB0000001")]
+        headers = {"Authorization": f"Bearer {create_access_token(lease.tenant_id)}"}
+
+    async def nothing_recorded_yet(db, references):
+        return set()
+
+    monkeypatch.setattr(payments_api, "get_recorded_mpesa_references_async", nothing_recorded_yet)
+    response = client.post("/api/v1/payments/batch", json=body, headers=headers)
+
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert (result["created"], result["failed"]) == (1, 1)
+    assert [item["ok"] for item in result["results"]] == [True, False]
+    assert "already recorded" in result["results"][1]["error"]
+
+def test_statement_import_skips_receipts_already_on_file(db, lease):
+    statement = (
+        "Receipt No.,Completion Time,Paid In,Account No.,Transaction Status\n"
+        f"SJC0000001,2026-10-02 09:15:00,20000,{lease.id},Completed\n"
+        f"SJC0000002,2026-10-03 09:15:00,5000,{lease.unit.unit_number},Completed\n"
+        f"SJC0000003,2026-10-04 09:15:00,5000,{lease.id},Failed\n"
+    )
+    first = mpesa_service.import_mpesa_statement(db, io.StringIO(statement))
+    again = mpesa_service.import_mpesa_statement(db, io.StringIO(statement))
+
+    assert (first["inserted"], first["duplicates"], first["rejected"]) == (2, 0, 1)
+    assert (again["inserted"], again["duplicates"], again["rejected"]) == (0, 2, 1)
+
+def test_payment_listing_rows_are_the_response_models_fields(db, lease):
+    from app.schemas.payment import PaymentResponse
+
+    payment_service.create_payment(db, receipt(lease), lease.tenant_id)
+    payments, _ = payment_service.get_payments_by_tenant(db, lease.tenant_id)
+
+    assert set(payments[0]) <= set(PaymentResponse.model_fields)
+    assert PaymentResponse(**payments[0]).tenant_name == "Test User"
+
+def test_payment_versions_change_when_the_tenant_is_renamed(db, lease):
+    from app.services import user_service
+
+    payment_service.create_payment(db, receipt(lease), lease.tenant_id)
+    landlord_id = lease.unit.property.landlord_id
+    before = (
+        payment_service.get_payments_version_by_tenant(db, lease.tenant_id),
+        payment_service.get_payments_version_by_landlord(db, landlord_id),
+    )
+
+    user_service.update_user(db, lease.tenant_id, {"first_name": "Renamed"})
+
+    after = (
+        payment_service.get_payments_version_by_tenant(db, lease.tenant_id),
+        payment_service.get_payments_version_by_landlord(db, landlord_id),
+    )
+    assert after[0] != before[0] and after[1] != before[1]
+
+@pytest.mark.parametrize("from_month, to_month, expected", [
+    ("2025-12", "2026-01", ["2025-12", "2026-01"]),
+    ("2026-01", None, ["2026-01", "2026-02"]),
+    (None, "2025-11", ["2025-11"]),
+    ("2026-02", "2026-02", ["2026-02"]),
+])
+def test_payment_lists_keep_billing_months_within_the_bounds(db, lease, from_month, to_month, expected):
+    for for_month in ("2025-11", "2025-12", "2026-01", "2026-02"):
+        payment_service.create_payment(db, receipt(lease, for_month=for_month, for_year=int(for_month[:4])), lease.tenant_id)
+    landlord_id = lease.unit.property.landlord_id
+
+    by_tenant, _ = payment_service.get_payments_by_tenant(db, lease.tenant_id, None, 20, from_month, to_month)
+    by_landlord, _ = payment_service.get_payments_by_landlord(db, landlord_id, None, 20, from_month, to_month)
+
+    assert sorted(p["for_month"] for p in by_tenant) == expected
+    assert sorted(p["for_month"] for p in by_landlord) == expected
+
+@pytest.mark.parametrize("from_month, to_month", [("2026-03", "2026-02"), ("2026-13", None), (None, "March")])
+def test_payment_lists_reject_reversed_or_malformed_bounds(db, lease, from_month, to_month):
+    with pytest.raises(ValueError):
+        payment_service.get_payments_by_tenant(db, lease.tenant_id, None, 20, from_month, to_month)
+
+def test_receipts_need_a_well_formed_billing_month(lease):
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError, match="YYYY-MM"):
+        receipt(lease, for_month="2026-13")
+
+def test_payment_list_answers_a_reversed_range_with_bad_request(client):
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+
+    with SessionLocal() as db:
+        headers = {"Authorization": f"Bearer {create_access_token(factories.user(db).id)}"}
+
+    response = client.get(
+        "/api/v1/payments/tenant/payments", params={"from_month": "2026-03", "to_month": "2026-02"}, headers=headers
+    )
+
+    assert response.status_code == 400
+    assert "from_month" in response.json()["detail"]
@@ -0,0 +1,227 @@
+# tests/test_query_budget.py
+"""No API endpoint's SQL statement count grows with its data or passes its budget.
+
+Two portfolios are seeded through the API, a small and a large one: a
+landlord with ``n`` properties, one of them with ``n`` units all let to one
+tenant, ``n`` rent charges, receipts and maintenance requests, and ``n``
+vacant units in a county of their own. Then every route under /api/v1 is
+called once as each portfolio's landlord or tenant, with lists, id lookups
+and batches sized ``n``, counting the SQL statements each request runs.
+
+Each route must be called here, run no more statements for the large
+portfolio than for the small one (an N+1 would), and stay within the
+budget declared next to it with ``@query_budget``. The response cache is
+off in tests and the principal cache is emptied before every request, so
+each counts its worst case.
+"""
+import threading
+
+import pytest
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import route_query_budget
+from app.main import app
+
+SIZES = (3, 30)
+
+MONTH = "2026-10"
+LEASE = dict(start_date="2026-01-01", end_date="2026-12-31", monthly_rent=20000, security_deposit=20000, payment_due_day=5)
+
+def register(client, email: str, role: str, number: str) -> dict:
+    body = ok(client.post("/api/v1/auth/register", json=dict(
+        first_name=role.title(), last_name=number, email=email, phone_number="0700000000",
+        role=role, password="secret123", id_number=number
+    )))
+    return {"id": body["user"]["id"], "headers": {"Authorization": "Bearer " + body["access_token"]}}
+
+def ok(response, expected: int = 200):
+    assert response.status_code == expected, f"{response.request.url}: {response.status_code} {response.text[:300]}"
+    return response.json() if response.headers.get("content-type", "").startswith("application/json") else None
+
+def seed(client, n: int) -> dict:
+    """A portfolio whose every list holds ``n`` rows, created through the API."""
+    from app.core.database import SessionLocal
+    from app.services.billing_service import generate_monthly_invoices
+
+    v = "/api/v1"
+    landlord = register(client, f"landlord{n}@example.com", "landlord", f"L{n}")
+    tenant = register(client, f"tenant{n}@example.com", "tenant", f"T{n}")
+    other_tenant = register(client, f"other{n}@example.com", "tenant", f"O{n}")
+    L, T = landlord["headers"], tenant["headers"]
+    county = f"County {n}"
+
+    properties = [
+        ok(client.post(v + "/properties/", json=dict(
+            name=f"Court {n}-{i}", address="Ngong Road", city=f"Town {n}", county=county
+        ), headers=L))["id"]
+        for i in range(n)
+    ]
+    let = ok(client.post(v + f"/properties/{properties[0]}/units/batch", json=[
+        dict(unit_number=f"A{i}", bedrooms=2, bathrooms=1, monthly_rent=20000) for i in range(n)
+    ], headers=L))
+    units = [result["item"]["id"] for result in let["results"]]
+    # One vacant unit in each of the other properties, and a spare to let
+    vacant = [
+        ok(client.post(v + f"/properties/{property_id}/units/", json=dict(
+            unit_number="V1", bedrooms=1, bathrooms=1, monthly_rent=15000
+        ), headers=L))["id"]
+        for property_id in properties[1:] + properties[:1]
+    ]
+    assignments = [
+        ok(client.post(v + f"/assignments/units/{unit_id}/assign", json=dict(LEASE, tenant_id=tenant["id"]), headers=L))["id"]
+        for unit_id in units
+    ]
+    db = SessionLocal()
+    try:
+        generate_monthly_invoices(db, MONTH)
+    finally:
+        db.close()
+    paid = ok(client.post(v + "/payments/batch", json=[
+        dict(amount=5000, for_month=MONTH, for_year=2026, assignment_id=assignment_id, mpesa_reference=f"R{n}X{i}")
+        for i, assignment_id in enumerate(assignments)
+    ], headers=T))
+    requests = ok(client.post(v + "/maintenance/batch", json=[
+        dict(issue_type="plumbing", description="Leaking tap", unit_id=unit_id) for unit_id in units
+    ], headers=T))
+    return {
+        "n": n, "landlord": landlord, "tenant": tenant, "other_tenant": other_tenant, "county": county,
+        "properties": properties, "units": units, "vacant": vacant, "assignments": assignments,
+        "payments": [result["item"]["id"] for result in paid["results"]],
+        "requests": [result["item"]["id"] for result in requests["results"]],
+    }
+
+def statement_csv(portfolio: dict, tag: str) -> bytes:
+    header = "Receipt No.,Completion Time,Details,Transaction Status,Paid In,Withdrawn,Balance,Account No.\n"
+    rows = "".join(
+        f"{tag}{portfolio['n']}X{i},2026-10-0{i % 9 + 1} 10:00:00,Pay Bill,Completed,1000,,,{assignment_id}\n"
+        for i, assignment_id in enumerate(portfolio["assignments"])
+    )
+    return (header + rows).encode()
+
+def calls(portfolio: dict) -> dict:
+    """(method, route) -> (headers, path, request keyword arguments), reads before writes."""
+    n = portfolio["n"]
+    L, T = portfolio["landlord"]["headers"], portfolio["tenant"]["headers"]
+    property_id, unit_id, assignment_id = portfolio["properties"][0], portfolio["units"][0], portfolio["assignments"][0]
+    v = "/api/v1"
+    reads = {
+        ("GET", "/auth/me"): (T, "/auth/me", {}),
+        ("GET", "/properties/"): (L, "/properties/", {}),
+        ("GET", "/properties/{property_id}"): (L, f"/properties/{property_id}", {}),
+        ("GET", "/units/"): (L, "/units/", {"params": {"ids": portfolio["units"]}}),
+        ("GET", "/units/vacant"): (T, "/units/vacant", {"params": {"county": portfolio["county"]}}),
+        ("GET", "/properties/{property_id}/units/"): (L, f"/properties/{property_id}/units/", {}),
+        ("GET", "/units/{unit_id}"): (L, f"/units/{unit_id}", {}),
+        ("GET", "/assignments/tenant/assignments"): (T, "/assignments/tenant/assignments", {}),
+        ("GET", "/assignments/landlord/assignments"): (L, "/assignments/landlord/assignments", {}),
+        ("GET", "/assignments/{assignment_id}/balance"): (T, f"/assignments/{assignment_id}/balance", {}),
+        ("GET", "/assignments/landlord/arrears"): (L, "/assignments/landlord/arrears", {}),
+        ("GET", "/assignments/landlord/export"): (L, "/assignments/landlord/export", {}),
+        ("GET", "/payments/"): (L, "/payments/", {"params": {"ids": portfolio["payments"]}}),
+        ("GET", "/payments/tenant/payments"): (T, "/payments/tenant/payments", {}),
+        ("GET", "/payments/landlord/payments"): (L, "/payments/landlord/payments", {}),
+        ("GET", "/payments/landlord/export"): (L, "/payments/landlord/export", {}),
+        ("GET", "/maintenance/tenant/requests"): (T, "/maintenance/tenant/requests", {}),
+        ("GET", "/maintenance/landlord/requests"): (L, "/maintenance/landlord/requests", {}),
+        ("GET", "/maintenance/landlord/export"): (L, "/maintenance/landlord/export", {}),
+        ("GET", "/maintenance/queue"): (L, "/maintenance/queue", {"params": {"limit": n}}),
+        ("GET", "/landlord/dashboard"): (L, "/landlord/dashboard", {}),
+        ("GET", "/search"): (L, "/search", {"params": {"q": "Court"}}),
+    }
+    writes = {
+        ("POST", "/auth/login"): ({}, "/auth/login", {"data": {
+            "username": f"tenant{n}@example.com", "password": "secret123"
+        }}),
+        ("POST", "/auth/register"): ({}, "/auth/register", {"json": dict(
+            first_name="New", last_name="Tenant", email=f"new{n}@example.com", phone_number="0700000000",
+            role="tenant", password="secret123", id_number=f"N{n}"
+        )}),
+        ("POST", "/properties/"): (L, "/properties/", {"json": dict(
+            name="Another Court", address="Ngong Road", city=f"Town {n}", county=portfolio["county"]
+        )}),
+        ("POST", "/properties/{property_id}/units/"): (L, f"/properties/{property_id}/units/", {"json": dict(
+            unit_number="S1", bedrooms=1, bathrooms=1, monthly_rent=15000
+        )}),
+        ("POST", "/properties/{property_id}/units/batch"): (L, f"/properties/{property_id}/units/batch", {"json": [
+            dict(unit_number=f"B{i}", bedrooms=1, bathrooms=1, monthly_rent=15000) for i in range(n)
+        ]}),
+        ("POST", "/assignments/units/{unit_id}/assign"): (L, f"/assignments/units/{portfolio['vacant'][-1]}/assign", {
+            "json": dict(LEASE, tenant_id=portfolio["other_tenant"]["id"])
+        }),
+        ("POST", "/payments/"): (T, "/payments/", {"json": dict(
+            amount=1000, for_month=MONTH, for_year=2026, assignment_id=assignment_id
+        )}),
+        ("POST", "/payments/batch"): (T, "/payments/batch", {"json": [
+            dict(amount=1000, for_month=MONTH, for_year=2026, assignment_id=lease) for lease in portfolio["assignments"]
+        ]}),
+        ("POST", "/payments/import"): (L, "/payments/import", {"files": {
+            "statement": ("statement.csv", statement_csv(portfolio, "M"), "text/csv")
+        }}),
+        ("PUT", "/payments/{payment_id}/status"): (L, f"/payments/{portfolio['payments'][0]}/status", {
+            "params": {"status": "paid"}
+        }),
+        ("POST", "/maintenance/"): (T, "/maintenance/", {"json": dict(
+            issue_type="electrical", description="No power", unit_id=unit_id
+        )}),
+        ("POST", "/maintenance/batch"): (T, "/maintenance/batch", {"json": [
+            dict(issue_type="electrical", description="No power", unit_id=unit) for unit in portfolio["units"]
+        ]}),
+        ("POST", "/maintenance/queue/claim"): (L, "/maintenance/queue/claim", {"params": {"limit": n}}),
+        ("PUT", "/maintenance/{request_id}/status"): (L, f"/maintenance/{portfolio['requests'][-1]}/status", {
+            "params": {"status": "completed"}
+        }),
+    }
+    return {
+        (method, v + route): (headers, v + path, kwargs)
+        for (method, route), (headers, path, kwargs) in list(reads.items()) + list(writes.items())
+    }
+
+def measure(client, portfolio: dict) -> dict:
+    from app.core.security import principal_cache
+
+    counts, lock = {}, threading.Lock()
+    statements = [0]
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        # Sync endpoints run in worker threads
+        with lock:
+            statements[0] += 1
+
+    event.listen(Engine, "after_cursor_execute", count)
+    try:
+        for (method, route), (headers, path, kwargs) in calls(portfolio).items():
+            # Budgets cover a request whose principal isn't cached yet
+            principal_cache.clear()
+            before = statements[0]
+            response = client.request(method, path, headers=headers, **kwargs)
+            assert response.status_code < 300, f"{method} {path}: {response.status_code} {response.text[:300]}"
+            counts[(method, route)] = statements[0] - before
+    finally:
+        event.remove(Engine, "after_cursor_execute", count)
+    return counts
+
+ROUTES = sorted(
+    ((method, route.path), route_query_budget(route))
+    for route in app.routes if isinstance(route, APIRoute) and route.path.startswith("/api/v1")
+    for method in route.methods
+)
+
+@pytest.fixture(scope="module")
+def statement_counts(template_database) -> tuple:
+    """Statements per (method, route), for the small and the large portfolio."""
+    from fastapi.testclient import TestClient
+
+    with TestClient(app) as client:
+        portfolios = [seed(client, n) for n in SIZES]
+        return tuple(measure(client, portfolio) for portfolio in portfolios)
+
+@pytest.mark.parametrize("route, budget", ROUTES, ids=[f"{method} {path}" for (method, path), _ in ROUTES])
+def test_route_stays_within_its_query_budget(statement_counts, route, budget):
+    small, large = (counts.get(route) for counts in statement_counts)
+
+    assert small is not None, "not called here; add it to calls()"
+    assert budget is not None, "no @query_budget declared"
+    assert large <= small, f"grows with rows: {small} -> {large}"
+    assert max(small, large) <= budget, f"over budget: {max(small, large)} > {budget}"
@@ -0,0 +1,205 @@
+# tests/test_query_plans.py
+"""Every read path in app/services is planned without a full table scan.
+
+A seeded, analysed SQLite database runs each service call while its SQL
+is captured, and ``EXPLAIN QUERY PLAN`` of every SELECT must not contain a
+``SCAN <table>`` step that no index drives. A read path added to the
+services gets an entry in ``SERVICE_CALLS``.
+"""
+import re
+import shutil
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import encode_cursor
+from app.services import (
+    assignment_service, dashboard_service, export_service, ledger_service, maintenance_service, payment_service,
+    property_service, search_service, unit_service, user_service, vacancy_service
+)
+
+# Matches full scans of real tables; subqueries (anon_1), index scans and
+# full-text lookups (VIRTUAL TABLE) are fine
+FULL_SCAN = re.compile(r"^SCAN (?!anon_)(\w+)(?!.*(USING (COVERING )?INDEX|VIRTUAL TABLE))")
+# Tables read whole by design, bounded by something other than the rows
+# they summarise: vacancy facets by locations x layouts x rent bands
+SMALL_TABLES = {"vacancy_facets"}
+
+def seed(db, landlords: int = 4, properties: int = 5, units: int = 20) -> dict:
+    from app.models import Assignment, MaintenanceRequest, Payment, Property, Unit, User
+    from app.models.maintenance import MaintenancePriority, MaintenanceStatus
+    from app.models.payment import PaymentStatus
+    from app.models.unit import UnitStatus
+    from app.models.user import UserRole
+
+    ids = {"landlords": [], "tenants": [], "properties": [], "units": [], "assignments": [], "payments": [], "requests": []}
+    created = datetime(2024, 1, 1)
+    counter = 0
+
+    def user(role):
+        nonlocal counter
+        counter += 1
+        return User(
+            first_name="User", last_name=str(counter), email=f"user{counter}@example.com", phone_number="0700000000",
+            id_number=f"ID{counter:08d}", hashed_password="x", role=role
+        )
+
+    for _ in range(landlords):
+        landlord = user(UserRole.LANDLORD)
+        db.add(landlord)
+        db.flush()
+        ids["landlords"].append(landlord.id)
+        for p in range(properties):
+            property = Property(name=f"Court {p}", address="Ngong Road", city="Nairobi", county="Nairobi", landlord_id=landlord.id)
+            db.add(property)
+            db.flush()
+            ids["properties"].append(property.id)
+            for u in range(units):
+                occupied = u % 3 != 0
+                unit = Unit(
+                    unit_number=f"{p}-{u}", bedrooms=1 + u % 3, bathrooms=1, monthly_rent=15000 + 1000 * (u % 5),
+                    status=UnitStatus.OCCUPIED if occupied else UnitStatus.VACANT, property_id=property.id
+                )
+                db.add(unit)
+                db.flush()
+                ids["units"].append(unit.id)
+                if not occupied:
+                    continue
+                tenant = user(UserRole.TENANT)
+                db.add(tenant)
+                db.flush()
+                ids["tenants"].append(tenant.id)
+                assignment = Assignment(
+                    unit_id=unit.id, tenant_id=tenant.id, start_date=date(2024, 1, 1), end_date=date(2025, 12, 31),
+                    monthly_rent=unit.monthly_rent, security_deposit=unit.monthly_rent, payment_due_day=5, is_active=True,
+                    created_at=created
+                )
+                db.add(assignment)
+                db.flush()
+                ids["assignments"].append(assignment.id)
+                for month in range(1, 13):
+                    created += timedelta(minutes=1)
+                    payment = Payment(
+                        assignment_id=assignment.id, tenant_id=tenant.id, amount=assignment.monthly_rent,
+                        payment_date=created, mpesa_reference=f"R{assignment.id:06d}{month:02d}", status=PaymentStatus.PAID,
+                        for_month=f"2024-{month:02d}", for_year=2024, billing_period=date(2024, month, 1),
+                        created_at=created
+                    )
+                    db.add(payment)
+                    db.flush()
+                    ids["payments"].append(payment.id)
+                db.add(MaintenanceRequest(
+                    unit_id=unit.id, tenant_id=tenant.id, issue_type="plumbing", description="Leaking tap",
+                    status=MaintenanceStatus.PENDING, priority=MaintenancePriority.MEDIUM, created_at=created
+                ))
+    db.flush()
+    # Read models the write paths would have kept current
+    property_service.rebuild_property_stats(db)
+    ledger_service.rebuild_balances(db)
+    dashboard_service.rebuild_landlord_stats(db)
+    dashboard_service.rebuild_monthly_stats(db)
+    vacancy_service.rebuild_vacancy_facets(db)
+    search_service.rebuild_search_index(db)
+    db.commit()
+    return ids
+
+def _ids(ids):
+    return {
+        "landlord": ids["landlords"][1],
+        "tenant": ids["tenants"][7],
+        "property": ids["properties"][3],
+        "unit": ids["units"][10],
+        "assignment": ids["assignments"][5],
+    }
+
+# (name, call(db, ids)) for every read path, ids as returned by ``_ids``
+SERVICE_CALLS = [
+    ("user_service.get_user_by_id", lambda db, i: user_service.get_user_by_id(db, i["tenant"])),
+    ("user_service.get_user_by_email", lambda db, i: user_service.get_user_by_email(db, "user3@example.com")),
+    ("user_service.get_user_by_id_number", lambda db, i: user_service.get_user_by_id_number(db, "ID00000003")),
+    ("property_service.get_property_by_id", lambda db, i: property_service.get_property_by_id(db, i["property"])),
+    ("property_service.get_property_with_stats", lambda db, i: property_service.get_property_with_stats(db, i["property"])),
+    ("property_service.get_properties_by_landlord", lambda db, i: property_service.get_properties_by_landlord(db, i["landlord"])),
+    ("property_service.get_properties_version", lambda db, i: property_service.get_properties_version(db, i["landlord"])),
+    ("unit_service.get_unit_by_id", lambda db, i: unit_service.get_unit_by_id(db, i["unit"])),
+    ("unit_service.get_units_by_property", lambda db, i: unit_service.get_units_by_property(db, i["property"])),
+    ("unit_service.get_units_version", lambda db, i: unit_service.get_units_version(db, i["property"])),
+    ("unit_service.get_units_by_ids", lambda db, i: unit_service.get_units_by_ids(db, [i["unit"], i["unit"] + 1], i["landlord"])),
+    ("unit_service.get_unit_landlords", lambda db, i: unit_service.get_unit_landlords(db, [i["unit"], i["unit"] + 1])),
+    ("assignment_service.get_assignment_by_id", lambda db, i: assignment_service.get_assignment_by_id(db, i["assignment"])),
+    ("assignment_service.get_assignments_by_ids", lambda db, i: assignment_service.get_assignments_by_ids(db, [i["assignment"]])),
+    ("assignment_service.get_active_assignments_for_units", lambda db, i: assignment_service.get_active_assignments_for_units(db, [i["unit"]])),
+    ("assignment_service.get_active_assignment_for_unit", lambda db, i: assignment_service.get_active_assignment_for_unit(db, i["unit"])),
+    ("assignment_service.get_assignments_by_tenant", lambda db, i: assignment_service.get_assignments_by_tenant(db, i["tenant"])),
+    ("assignment_service.get_assignments_by_landlord", lambda db, i: assignment_service.get_assignments_by_landlord(db, i["landlord"])),
+    ("ledger_service.get_balance", lambda db, i: ledger_service.get_balance(db, i["assignment"])),
+    ("ledger_service.get_arrears_report", lambda db, i: ledger_service.get_arrears_report(db, i["landlord"], 20)),
+    ("payment_service.get_payments_by_ids", lambda db, i: payment_service.get_payments_by_ids(db, [1, 2, 3], landlord_id=i["landlord"])),
+    ("payment_service.get_recorded_mpesa_references", lambda db, i: payment_service.get_recorded_mpesa_references(db, ["R00000101", "X"])),
+    ("payment_service.get_payments_by_tenant", lambda db, i: payment_service.get_payments_by_tenant(db, i["tenant"])),
+    ("payment_service.get_payments_by_landlord", lambda db, i: payment_service.get_payments_by_landlord(db, i["landlord"])),
+    ("payment_service.get_payments_by_tenant (period)", lambda db, i: payment_service.get_payments_by_tenant(db, i["tenant"], None, 20, "2024-01", "2024-03")),
+    ("payment_service.get_payments_by_landlord (period)", lambda db, i: payment_service.get_payments_by_landlord(db, i["landlord"], None, 20, "2024-10", "2024-12")),
+    ("payment_service.get_payments_version_by_tenant", lambda db, i: payment_service.get_payments_version_by_tenant(db, i["tenant"])),
+    ("payment_service.get_payments_version_by_landlord", lambda db, i: payment_service.get_payments_version_by_landlord(db, i["landlord"])),
+    ("maintenance_service.get_maintenance_requests_by_tenant", lambda db, i: maintenance_service.get_maintenance_requests_by_tenant(db, i["tenant"])),
+    ("maintenance_service.get_maintenance_requests_by_landlord", lambda db, i: maintenance_service.get_maintenance_requests_by_landlord(db, i["landlord"])),
+    ("maintenance_service.get_maintenance_queue", lambda db, i: maintenance_service.get_maintenance_queue(db, i["landlord"])),
+    ("maintenance_service.get_maintenance_queue (all)", lambda db, i: maintenance_service.get_maintenance_queue(db)),
+    ("vacancy_service.search_vacant_units", lambda db, i: vacancy_service.search_vacant_units(db)),
+    ("vacancy_service.search_vacant_units (filtered)", lambda db, i: vacancy_service.search_vacant_units(
+        db, encode_cursor(datetime.utcnow(), 10 ** 9), county=["Nairobi"], bedrooms=[2], min_rent=10000
+    )),
+    ("vacancy_service.get_vacancy_facets", lambda db, i: vacancy_service.get_vacancy_facets(db)),
+    ("vacancy_service.get_vacancy_facets (filtered)", lambda db, i: vacancy_service.get_vacancy_facets(
+        db, county=["Nairobi"], bedrooms=[2], min_rent=15500, max_rent=40000
+    )),
+    ("search_service.search", lambda db, i: search_service.search(db, "court 3", i["landlord"])),
+    ("search_service.search (all)", lambda db, i: search_service.search(db, "user 12")),
+    ("dashboard_service.get_landlord_dashboard", lambda db, i: dashboard_service.get_landlord_dashboard(db, i["landlord"])),
+    ("export_service.payments_export_query", lambda db, i: db.execute(export_service.payments_export_query(i["landlord"], i["property"], "2024-01", "2024-12")).all()),
+    ("export_service.assignments_export_query", lambda db, i: db.execute(export_service.assignments_export_query(i["landlord"])).all()),
+    ("export_service.maintenance_export_query", lambda db, i: db.execute(export_service.maintenance_export_query(i["landlord"], None, "2024-01")).all()),
+]
+
+@pytest.fixture(scope="module")
+def seeded(template_database, tmp_path_factory):
+    """An analysed database of a few landlords' portfolios and the ids the calls use."""
+    path = tmp_path_factory.mktemp("plans") / "plans.db"
+    shutil.copyfile(template_database, path)
+    engine = create_engine(f"sqlite:///{path}")
+    with sessionmaker(bind=engine)() as db:
+        ids = seed(db)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ANALYZE")
+    yield engine, _ids(ids)
+    engine.dispose()
+
+def explain(connection, statement: str, parameters) -> list:
+    cursor = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", tuple(parameters or ()))
+    return [row[-1] for row in cursor]
+
+@pytest.mark.parametrize("call", [call for _, call in SERVICE_CALLS], ids=[name for name, _ in SERVICE_CALLS])
+def test_read_path_uses_indexes(seeded, call):
+    engine, ids = seeded
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with sessionmaker(bind=engine, autoflush=False)() as db:
+            call(db, ids)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert captured
+    with engine.connect() as connection:
+        for statement, parameters in captured:
+            plan = explain(connection, statement, parameters)
+            scans = [step for step in plan if FULL_SCAN.match(step) and FULL_SCAN.match(step)[1] not in SMALL_TABLES]
+            assert not scans, f"full scan in {' '.join(statement.split())}:\n  " + "\n  ".join(plan)
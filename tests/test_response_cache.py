@@ -0,0 +1,97 @@
+import pytest
+
+from app.core.response_cache import MemoryBackend, RedisBackend, invalidate_on_commit, response_cache, tag
+from app.models.unit import UnitStatus
+from app.services import unit_service
+from benchmarks.response_cache import LocalRedis
+from . import factories
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    # The suite runs with caching off; these tests switch the shared cache on
+    backend = MemoryBackend(max_size=100, ttl_seconds=60)
+    monkeypatch.setattr(response_cache, "backend", backend)
+    return backend
+
+def test_unit_listing_is_served_from_the_cache_until_a_write_drops_it(client, memory_cache):
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+
+    with SessionLocal() as db:
+        landlord = factories.landlord(db)
+        property = factories.property(db, landlord.id)
+        unit, = factories.units(db, property.id, 1)
+        property_id, unit_id = property.id, unit.id
+        headers = {"Authorization": f"Bearer {create_access_token(landlord.id)}"}
+    url = f"/api/v1/properties/{property_id}/units/"
+
+    first = client.get(url, headers=headers)
+    hits = response_cache.hits
+    cached = client.get(url, headers=headers)
+    with SessionLocal() as db:
+        unit_service.update_unit_status(db, unit_id, UnitStatus.MAINTENANCE)
+    changed = client.get(url, headers=headers)
+
+    assert response_cache.hits == hits + 1
+    assert cached.content == first.content and cached.headers["ETag"] == first.headers["ETag"]
+    assert changed.json()["items"][0]["status"] == "maintenance"
+
+def test_a_cached_listing_is_not_served_to_another_principal(client, memory_cache):
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+
+    with SessionLocal() as db:
+        owner, other = factories.landlord(db), factories.landlord(db)
+        property_id = factories.property(db, owner.id).id
+        tokens = [create_access_token(user.id) for user in (owner, other)]
+    url = f"/api/v1/properties/{property_id}/units/"
+
+    responses = [client.get(url, headers={"Authorization": f"Bearer {token}"}) for token in tokens]
+
+    assert [response.status_code for response in responses] == [200, 403]
+
+def test_tags_are_dropped_on_commit_and_forgotten_on_rollback(db, memory_cache):
+    generation = memory_cache.generation()
+    memory_cache.set("kept", (b"[]", None), [tag("units", 1)], generation)
+    memory_cache.set("dropped", (b"[]", None), [tag("units", 2)], generation)
+
+    # Queued inside a transaction, as the write paths do
+    db.connection()
+    invalidate_on_commit(db, tag("units", 1))
+    db.rollback()
+    db.connection()
+    invalidate_on_commit(db, tag("units", 2))
+    db.commit()
+
+    assert memory_cache.get("kept") == (b"[]", None)
+    assert memory_cache.get("dropped") is None
+
+def test_a_response_built_across_an_invalidation_is_not_stored(memory_cache):
+    generation = memory_cache.generation()
+    memory_cache.invalidate([tag("units", 1)])
+
+    assert not memory_cache.set("key", (b"old", None), [tag("units", 1)], generation)
+    assert memory_cache.get("key") is None
+
+def test_memory_backend_evicts_the_least_recently_used_entry():
+    backend = MemoryBackend(max_size=2, ttl_seconds=60)
+    for key in ("a", "b"):
+        backend.set(key, (key.encode(), None), [], backend.generation())
+    backend.get("a")
+    backend.set("c", (b"c", None), [], backend.generation())
+
+    assert backend.get("b") is None and backend.get("a") == (b"a", None)
+    assert backend.stats()["evictions"] == 1
+
+def test_redis_store_is_dropped_after_an_invalidation():
+    backend = RedisBackend(LocalRedis(), ttl_seconds=60)
+    generation = backend.generation()
+    backend.invalidate(["units:1"])
+
+    assert not backend.set("key", (b"old", '"v1"'), ["units:1"], generation)
+    assert backend.get("key") is None
+
+    assert backend.set("key", (b"new", '"v2"'), ["units:1"], backend.generation())
+    assert backend.get("key") == (b"new", '"v2"')
+    assert backend.invalidate(["units:1"]) == 1
+    assert backend.get("key") is None
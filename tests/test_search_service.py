@@ -0,0 +1,46 @@
+# tests/test_search_service.py
+import pytest
+
+from app.services import search_service
+from . import factories
+
+def titles(results):
+    return [result["title"] for result in results]
+
+def test_landlord_search_only_returns_their_documents(db):
+    owner, other = factories.landlord(db), factories.landlord(db)
+    factories.property(db, owner.id, "Kamau Court")
+    # Spells the owner's prefixed form of a word in its plain form
+    factories.property(db, other.id, f"o{owner.id}xkamau Gardens")
+    search_service.rebuild_search_index(db)
+
+    assert titles(search_service.search(db, "kamau", owner.id)) == ["Kamau Court"]
+
+@pytest.mark.parametrize("q", ["wanjiru.njeri@example", "example", "co ke", "Otieno", "njeri-otieno", "0712345678", "254712"])
+def test_tenants_are_found_by_every_word_of_punctuated_details(db, q):
+    landlord = factories.landlord(db)
+    unit, = factories.units(db, factories.property(db, landlord.id).id, 1)
+    tenant = factories.user(db, first_name="Wanjiru", last_name="Njeri-Otieno")
+    tenant.email, tenant.phone_number = "wanjiru.njeri@example.co.ke", "+254 (712) 345/678"
+    db.commit()
+    factories.lease(db, unit.id, tenant.id)
+    search_service.rebuild_search_index(db)
+
+    # Admins read the plain words, landlords their own prefixed ones
+    for landlord_id in (None, landlord.id):
+        assert titles(search_service.search(db, q, landlord_id, ["tenant"])) == ["Wanjiru Njeri-Otieno"]
+    assert search_service.search(db, q, factories.landlord(db).id) == []
+
+def test_renamed_tenants_are_found_by_their_new_name_only(db):
+    from app.services import user_service
+
+    landlord = factories.landlord(db)
+    unit, = factories.units(db, factories.property(db, landlord.id).id, 1)
+    tenant = factories.user(db, last_name="Mwangi-Kariuki")
+    factories.lease(db, unit.id, tenant.id)
+    search_service.rebuild_search_index(db)
+
+    user_service.update_user(db, tenant.id, {"last_name": "O'Neil"})
+
+    assert search_service.search(db, "kariuki", landlord.id) == []
+    assert titles(search_service.search(db, "neil", landlord.id)) == ["Test O'Neil"]
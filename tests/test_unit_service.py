@@ -0,0 +1,127 @@
+# tests/test_unit_service.py
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.models.unit import UnitStatus
+from app.schemas.unit import UnitCreate
+from app.services import property_service, unit_service
+from . import factories
+
+@contextmanager
+def count_statements(engine):
+    """Count the statements sent to ``engine`` inside the block."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+def let_property(db, units: int) -> int:
+    """A property of ``units`` units, every other one let to a tenant of its own."""
+    property = factories.property(db, factories.landlord(db).id)
+    for i, unit in enumerate(factories.units(db, property.id, units)):
+        if i % 2 == 0:
+            factories.lease(db, unit.id, factories.user(db, last_name=f"Tenant{i}").id)
+    return property.id
+
+def test_units_by_property_query_count_does_not_grow_with_units(db, engine):
+    small, large = let_property(db, 1), let_property(db, 50)
+
+    counts = {}
+    for property_id in (small, large):
+        db.expire_all()
+        with count_statements(engine) as statements:
+            units, _ = unit_service.get_units_by_property(db, property_id, limit=100)
+        counts[property_id] = len(statements)
+
+    assert len(units) == 50
+    assert counts[small] == counts[large] == 1
+
+def test_units_by_property_names_the_current_tenant(db):
+    property_id = let_property(db, 2)
+
+    units, _ = unit_service.get_units_by_property(db, property_id)
+
+    tenants = sorted(unit["current_tenant"] or "" for unit in units)
+    assert tenants == ["", "Test Tenant0"]
+
+def test_create_units_inserts_the_batch_and_counts_it_in_the_rollup(db):
+    property = factories.property(db, factories.landlord(db).id)
+    batch = [UnitCreate(unit_number=f"B{i}", bedrooms=1, bathrooms=1, monthly_rent=15000) for i in range(3)]
+
+    units = unit_service.create_units(db, batch, property.id)
+
+    assert [unit.unit_number for unit in units] == ["B0", "B1", "B2"]
+    stats = property_service.get_property_with_stats(db, property.id)
+    assert (stats.units_count, stats.occupied_units) == (3, 0)
+
+def test_units_by_ids_keep_the_requested_order_and_the_landlords_scope(db):
+    landlord = factories.landlord(db)
+    own = factories.units(db, factories.property(db, landlord.id).id, 2)
+    other, = factories.units(db, factories.property(db, factories.landlord(db).id).id, 1)
+    ids = [own[1].id, other.id, own[0].id, own[1].id]
+
+    units = unit_service.get_units_by_ids(db, ids, landlord.id)
+
+    assert [unit["id"] for unit in units] == [own[1].id, own[0].id]
+
+def test_unit_listing_rows_are_the_response_models_fields(db):
+    from app.schemas.unit import UnitResponse
+
+    units, _ = unit_service.get_units_by_property(db, let_property(db, 1))
+
+    assert set(units[0]) <= set(UnitResponse.model_fields)
+    assert UnitResponse(**units[0]).current_tenant == "Test Tenant0"
+
+def test_units_version_changes_when_an_occupied_units_lease_is_replaced(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    factories.lease(db, unit.id, factories.user(db).id)
+    before = unit_service.get_units_version(db, property.id)
+
+    # The unit stays OCCUPIED, only its tenant changes
+    factories.lease(db, unit.id, factories.user(db, last_name="Replacement").id)
+
+    assert unit_service.get_units_version(db, property.id) != before
+
+def test_units_version_changes_when_the_tenant_is_renamed(db):
+    from app.services import user_service
+
+    property = factories.property(db, factories.landlord(db).id)
+    unit, = factories.units(db, property.id, 1)
+    tenant = factories.user(db)
+    factories.lease(db, unit.id, tenant.id)
+    before = unit_service.get_units_version(db, property.id)
+
+    user_service.update_user(db, tenant.id, {"last_name": "Renamed"})
+
+    assert unit_service.get_units_version(db, property.id) != before
+
+def test_unit_listing_answers_a_matching_etag_with_not_modified(client):
+    from app.core.database import SessionLocal
+    from app.core.security import create_access_token
+
+    with SessionLocal() as db:
+        landlord = factories.landlord(db)
+        property = factories.property(db, landlord.id)
+        unit, = factories.units(db, property.id, 1)
+        property_id, unit_id = property.id, unit.id
+        headers = {"Authorization": f"Bearer {create_access_token(landlord.id)}"}
+    url = f"/api/v1/properties/{property_id}/units/"
+
+    first = client.get(url, headers=headers)
+    etag = first.headers["ETag"]
+    unchanged = client.get(url, headers={**headers, "If-None-Match": etag})
+    with SessionLocal() as db:
+        unit_service.update_unit_status(db, unit_id, UnitStatus.MAINTENANCE)
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert unchanged.status_code == 304 and unchanged.headers["ETag"] == etag
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
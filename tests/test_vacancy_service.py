@@ -0,0 +1,59 @@
+# tests/test_vacancy_service.py
+from app.models import VacancyFacet
+from app.schemas.unit import UnitCreate
+from app.services import unit_service, vacancy_service
+from . import factories
+
+RENTS = (12000, 15000, 18000, 25000, 20000)
+
+def counts(facet):
+    return {value.get("value", value.get("min_rent")): value["count"] for value in facet}
+
+def test_facets_are_kept_per_rent_band(db):
+    property = factories.property(db, factories.landlord(db).id)
+    unit_service.create_units(db, [
+        UnitCreate(unit_number=f"A{i}", bedrooms=2, bathrooms=1, monthly_rent=rent) for i, rent in enumerate(RENTS)
+    ], property.id)
+
+    rows = {row.rent_band: row.vacant_units for row in db.query(VacancyFacet)}
+    assert rows == {1: 3, 2: 2}
+
+def test_rent_filter_inside_a_band_counts_exactly(db):
+    property = factories.property(db, factories.landlord(db).id)
+    units = unit_service.create_units(db, [
+        UnitCreate(unit_number=f"A{i}", bedrooms=1 + i % 2, bathrooms=1, monthly_rent=rent) for i, rent in enumerate(RENTS)
+    ], property.id)
+
+    facets = vacancy_service.get_vacancy_facets(db, bedrooms=[1], min_rent=14000, max_rent=20000)
+    listed, _ = vacancy_service.search_vacant_units(db, bedrooms=[1], min_rent=14000, max_rent=20000)
+
+    assert facets["total"] == len(listed) == 2
+    # Each facet ignores its own filter: every 14000-20000 unit, and every bedroom-1 unit by band
+    assert counts(facets["facets"]["bedrooms"]) == {1: 2, 2: 1}
+    assert counts(facets["facets"]["rent"]) == {10000: 2, 20000: 1}
+    assert {unit["id"] for unit in listed} == {units[2].id, units[4].id}
+
+def facet_rows(db):
+    return {(row.county, row.city, row.bedrooms, row.bathrooms, row.rent_band): row.vacant_units for row in db.query(VacancyFacet)}
+
+def test_facets_follow_leases_and_status_changes_like_a_rebuild(db):
+    from app.models.unit import UnitStatus
+    from app.services import assignment_service
+
+    property = factories.property(db, factories.landlord(db).id)
+    units = unit_service.create_units(db, [
+        UnitCreate(unit_number=f"A{i}", bedrooms=2, bathrooms=1, monthly_rent=rent) for i, rent in enumerate(RENTS)
+    ], property.id)
+    lease = factories.lease(db, units[0].id, factories.user(db).id)
+    unit_service.update_unit_status(db, units[3].id, UnitStatus.MAINTENANCE)
+
+    assert vacancy_service.get_vacancy_facets(db)["total"] == 3
+    assert {unit["id"] for unit in vacancy_service.search_vacant_units(db)[0]} == {units[1].id, units[2].id, units[4].id}
+
+    assignment_service.end_assignment(db, lease.id)
+    maintained = facet_rows(db)
+    vacancy_service.rebuild_vacancy_facets(db)
+    db.commit()
+
+    assert vacancy_service.get_vacancy_facets(db)["total"] == 4
+    assert maintained == facet_rows(db)